@@ -0,0 +1,289 @@
+"""Benchmark for whole games played through the terminal interface.
+
+Usage
+-----
+To run the benchmark, use:
+    python3 -m benchmarks.endtoend
+
+which plays games through the same menus, game loop and end screen as
+run.py, typing into prompt-toolkit's pipe input and drawing to a dummy
+output, with translations answered in-process in the DeepL API's format.
+It times each full game and each question for every difficulty level and
+input mode, along with how long each stage of the questions took, so the
+game's own overhead can be tracked apart from the network.
+"""
+from argparse import ArgumentParser
+from statistics import median
+from typing import Any, Dict, List
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output import DummyOutput
+from classes.gameui import GameUI, GAME_OPTIONS
+from classes.enums.difficulty import Difficulty
+from classes.enums.inputmode import InputMode
+from classes.services.metricsservice import MetricsService
+from classes.services.requestservice import RequestService
+from classes.services.stubdeeplservice import StubDeepLService
+
+NUM_OF_GAMES = 5
+GAME_TIMEOUT = 60.0
+ENTER = "\r"
+DOWN = "\x1b[B"
+UP = "\x1b[A"
+QUIT = "\x03"
+SENTENCE = "The cat sat."
+PROJECT_DIRECTORY = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))
+SENTENCE_FILE = os.path.join(
+    PROJECT_DIRECTORY, "resources", "testdata", "mixed-level-sentences.txt")
+
+
+class ScriptedPlayer():
+    """Class for playing games through a GameUI by typing into its input.
+
+    The player answers each prompt as soon as it has been drawn, always
+    with the correct language, so the time taken is the game's alone.
+
+    Attributes
+    ----------
+    _ui : GameUI
+        The game's interface.
+    _pipe_input : PipeInput
+        The input the player types into.
+    _file_path : str
+        The file to give when asked for one.
+    _rendered : asyncio.Event
+        Set whenever the application finishes drawing a frame.
+
+    Methods
+    -------
+    configure(input_mode: int, difficulty_level: int):
+        Sets the game options through the game options menu.
+    play_game() -> List[float]:
+        Plays one game from the main menu back to the main menu.
+    """
+
+    def __init__(self, ui: GameUI, pipe_input, file_path: str):
+        """Initialises the object with the passed parameters.
+
+        Parameters
+        ----------
+        ui
+            The game's interface, whose application has been created.
+        pipe_input : PipeInput
+            The input the player types into.
+        file_path
+            The file to give when asked for one.
+        """
+        self._ui = ui
+        self._pipe_input = pipe_input
+        self._file_path = file_path
+        self._rendered = asyncio.Event()
+        ui._app.after_render += lambda _: self._rendered.set()
+
+    async def configure(self, input_mode: int, difficulty_level: int):
+        """Sets the game options through the game options menu.
+
+        Starts and ends on the main menu, with 'PLAY' selected.
+
+        Parameters
+        ----------
+        input_mode
+            The input mode to choose.
+        difficulty_level
+            The difficulty level to choose.
+        """
+        await self._press(DOWN, ENTER)
+        while self._ui._input_mode != input_mode:
+            await self._press(ENTER)
+        await self._press(DOWN)
+        while self._ui._difficulty_level != difficulty_level:
+            await self._press(ENTER)
+        await self._press(*[DOWN] * (len(GAME_OPTIONS) - 2), ENTER, UP)
+
+    async def play_game(self) -> List[float]:
+        """Plays one game from the main menu back to the main menu.
+
+        Returns
+        -------
+        List[float]
+            The number of seconds from the start of the game to the first
+            answer prompt, then between each answer prompt and the next
+            answer prompt or the end of the game.
+        """
+        ui = self._ui
+        question_times = []
+        answered = None
+        started_at = time.perf_counter()
+        await self._press(ENTER)
+        while not ui._viewing_end_screen:
+            pending_input = ui._pending_input
+            if pending_input is None or pending_input is answered:
+                await self._wait_for_frame()
+                continue
+            answered = pending_input
+            prompt = "".join(text for _, text in ui._transcript[-3:])
+            if "name or path of the file" in prompt:
+                self._type(self._file_path)
+            elif "Enter a sentence" in prompt:
+                self._type(SENTENCE)
+            else:
+                now = time.perf_counter()
+                question_times.append(now - started_at)
+                started_at = now
+                self._type(
+                    ui._session.translation.lang.get_user_friendly_name())
+        question_times.append(time.perf_counter() - started_at)
+        await self._press("x")
+        return question_times
+
+    def _type(self, text: str):
+        """Types text and presses enter.
+
+        Parameters
+        ----------
+        text
+            The text to type.
+        """
+        self._pipe_input.send_text(text + ENTER)
+
+    async def _wait_for_frame(self):
+        """Waits for the application to draw its next frame."""
+        await asyncio.wait_for(self._rendered.wait(), GAME_TIMEOUT)
+        self._rendered.clear()
+
+    async def _press(self, *keys: str):
+        """Presses keys, waiting for each one's frame to be drawn.
+
+        Parameters
+        ----------
+        keys
+            The keys, or text, to press.
+        """
+        for key in keys:
+            self._rendered.clear()
+            self._pipe_input.send_text(key)
+            await self._wait_for_frame()
+
+
+async def benchmark_settings(
+        input_mode: int, difficulty_level: int, num_of_games: int,
+        file_path: str) -> Dict[str, Any]:
+    """Plays games with the given settings and times them.
+
+    Parameters
+    ----------
+    input_mode
+        The input mode to play.
+    difficulty_level
+        The difficulty level to play.
+    num_of_games
+        The number of games to time, after one that isn't timed.
+    file_path
+        The file to give when asked for one.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The number of questions, the median time per game and per question
+        in milliseconds, and the summary of each stage of the questions.
+    """
+    pipe_input = create_pipe_input()
+    try:
+        with create_app_session(input=pipe_input, output=DummyOutput()):
+            ui = GameUI()
+            app = ui.create_application()
+            application_task = asyncio.ensure_future(app.run_async())
+            player = ScriptedPlayer(ui, pipe_input, file_path)
+            await player._wait_for_frame()
+            await player.configure(input_mode, difficulty_level)
+
+            # The first game loads everything that's loaded lazily
+            await player.play_game()
+            MetricsService.reset()
+            game_times = []
+            question_times = []
+            for _ in range(num_of_games):
+                times = await player.play_game()
+                game_times.append(sum(times))
+                question_times.extend(times[1:])
+
+            pipe_input.send_text(QUIT)
+            await application_task
+    finally:
+        pipe_input.close()
+
+    return {
+        "questions_per_game": len(question_times) // num_of_games,
+        "game_ms": round(median(game_times) * 1000, 2),
+        "question_ms": round(median(question_times) * 1000, 2),
+        "stages": MetricsService.get_summary()["stages"]
+    }
+
+
+async def run_benchmarks(num_of_games: int) -> Dict[str, Dict[str, Any]]:
+    """Times games for every difficulty level and input mode.
+
+    Parameters
+    ----------
+    num_of_games
+        The number of games to time for each.
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        The results by difficulty level and input mode.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = shutil.copy(SENTENCE_FILE, directory)
+        for difficulty in Difficulty:
+            for input_mode in InputMode:
+                results[f"{difficulty.name} {input_mode.name}"] = (
+                    await benchmark_settings(
+                        input_mode.value, difficulty.value, num_of_games,
+                        file_path))
+    return results
+
+
+def main(args: List[str] = None):
+    """Runs the benchmarks and prints the results.
+
+    Parameters
+    ----------
+    args : List[str]
+        The command line arguments, or None to use sys.argv.
+    """
+    parser = ArgumentParser(description="Benchmark whole games.")
+    parser.add_argument("--games", type=int, default=NUM_OF_GAMES)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--latency", type=float, default=0.0,
+        help="the number of seconds each fake translation request takes")
+    options = parser.parse_args(args)
+
+    random.seed(options.seed)
+    RequestService.set_handler(
+        StubDeepLService(options.latency).handle_request)
+    results = asyncio.run(run_benchmarks(options.games))
+
+    print(f"{'Settings':<12} {'Questions':>9} {'Game (ms)':>10}"
+          f" {'Question (ms)':>13}  Median stage times (ms)")
+    for settings, result in results.items():
+        stages = ", ".join(
+            f"{stage} {summary['p50'] * 1000:.2f}"
+            for stage, summary in result["stages"].items()
+            if stage != "think_time")
+        print(f"{settings:<12} {result['questions_per_game']:>9}"
+              f" {result['game_ms']:>10.1f} {result['question_ms']:>13.2f}"
+              f"  {stages}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark for sentence generation and part of speech lookups.
+
+Usage
+-----
+To run the benchmark, use:
+    python3 -m benchmarks.generation
+
+which times PartOfSpeech.can_follow against the rule chain it replaced,
+the Word.is_* predicates used by the generator, and the number of
+sentences SentenceGenerator can produce per second.
+"""
+import random
+import timeit
+from classes.enums.partofspeech import PartOfSpeech
+from classes.sentencegenerator import SentenceGenerator
+from classes.word import Word
+
+NUM_OF_REPEATS = 5
+CHAR_LIMIT = 30
+PAIRS = [(part, preceding)
+         for part in PartOfSpeech for preceding in PartOfSpeech]
+WORDS = [
+    Word("the", PartOfSpeech.DEFINITE_ARTICLE, "definite"),
+    Word("girl", PartOfSpeech.NOUN, "people"),
+    Word("goes", PartOfSpeech.VERB, "intransitive"),
+    Word("has", PartOfSpeech.VERB, "possessive"),
+    Word("she", PartOfSpeech.PERSONAL_PRONOUN, "personal")
+]
+
+
+def follow_by_table():
+    """Checks every pair of parts of speech using the follow table."""
+    for part, preceding in PAIRS:
+        part.can_follow(preceding)
+
+
+def follow_by_rules():
+    """Checks every pair of parts of speech using the rule chain."""
+    for part, preceding in PAIRS:
+        part._can_follow_by_rules(preceding)
+
+
+def word_predicates():
+    """Calls the Word predicates checked when adding a word to a sentence."""
+    for word in WORDS:
+        (word.is_an_article_or_amount(), word.is_possessive(),
+         word.is_a_place(), word.is_a_name(), word.is_an_irregular_verb(),
+         word.is_an_adverb(), word.is_a_noun(), word.is_a_verb(),
+         word.is_a_being_verb(), word.is_a_person_noun(),
+         word.is_a_personal_pronoun(), word.is_in_the_third_person())
+
+
+def generate_sentence():
+    """Generates a single sentence."""
+    SentenceGenerator.generate_sentence(CHAR_LIMIT)
+
+
+def time_per_call(function, number: int) -> float:
+    """Times a function, returning the best time per call in microseconds.
+
+    Parameters
+    ----------
+    function
+        The function to time.
+    number
+        The number of calls to make per repeat.
+
+    Returns
+    -------
+    float
+        The fastest time per call across all repeats.
+    """
+    times = timeit.repeat(function, number=number, repeat=NUM_OF_REPEATS)
+    return min(times) / number * 1_000_000
+
+
+def main():
+    """Runs each benchmark and prints the results."""
+    random.seed(0)
+    table = time_per_call(follow_by_table, 2_000)
+    rules = time_per_call(follow_by_rules, 2_000)
+    print(f"can_follow (13x13 pairs): table {table:.1f}us,"
+          f" rules {rules:.1f}us ({rules / table:.1f}x)")
+    print(f"Word predicates: {time_per_call(word_predicates, 10_000):.2f}us")
+
+    sentence_time = time_per_call(generate_sentence, 2_000)
+    print(f"generate_sentence: {sentence_time:.1f}us"
+          f" ({1_000_000 / sentence_time:,.0f} sentences/s)")
+    print(f"Generation stats: {SentenceGenerator.get_generation_stats()}")
+
+
+if __name__ == "__main__":
+    main()
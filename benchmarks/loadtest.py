@@ -0,0 +1,1028 @@
+"""Load test for the game server, with simulated players.
+
+Usage
+-----
+To find where a locally started server runs out of capacity, use:
+    python3 -m benchmarks.loadtest --spawn-server --workers 2 \\
+        --players 10 50 100 200 --duration 30
+
+which starts 'classes.gameserver' with its translations answered locally
+instead of by DeepL, then runs each number of players against it in turn.
+To test a deployment, start its server with '--stub-translator' and pass
+its URL instead, e.g.:
+    python3 -m benchmarks.loadtest --url ws://game.example.com:8080/
+
+Each player connects to the websocket endpoint the browser terminal uses,
+reads the screen from the frames it's sent and types into it like a
+person would: it waits a log-normally distributed think time before each
+menu key, sentence and answer, and then plays one or more games with
+randomly chosen settings before quitting. A new session is started as soon
+as one ends, until the step's duration is up.
+
+For each step, the number of sessions played per second, the percentile
+latencies from each answer or sentence to the next question being shown
+and from each menu key to the next frame, the share of sessions that
+failed, and the CPU and memory used by each host are printed. The hosts'
+figures are taken from '/stats', which is polled throughout the step.
+When the server has several workers, each poll is answered by one of
+them, so every worker is reported separately.
+"""
+from argparse import ArgumentParser
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from urllib.request import urlopen
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import signal
+import subprocess
+import sys
+import time
+
+import websockets
+from prompt_toolkit.utils import get_cwidth
+
+from classes.gameserver import DEFAULT_COLUMNS, DEFAULT_ROWS
+from classes.gamesession import GameSession
+from classes.enums.difficulty import Difficulty
+from classes.enums.inputmode import InputMode
+from classes.enums.language import Language
+
+DEFAULT_PORT = 8765
+DEFAULT_URL = f"ws://127.0.0.1:{DEFAULT_PORT}/"
+DEFAULT_DURATION = 30.0
+DEFAULT_SPAWN_RATE = 20.0
+# The median number of seconds and the spread of the log-normal
+# distribution of each kind of think time
+MENU_THINK_TIME = (0.5, 0.5)
+SENTENCE_THINK_TIME = (6.0, 0.5)
+ANSWER_THINK_TIME = (2.5, 0.6)
+# The share of answers that are correct, when the language can be read
+# from the translation
+ANSWER_ACCURACY = 0.7
+# The number of seconds to wait for the server before failing a session
+RESPONSE_TIMEOUT = 30.0
+STATS_INTERVAL = 1.0
+SERVER_START_TIMEOUT = 30.0
+# Sentences short enough for every difficulty level, for user input
+SENTENCES = ["I like cats.", "Where is it?", "The sun is hot.",
+             "We ate bread.", "She runs fast."]
+ENTER = "\r"
+DOWN = "\x1b[B"
+UP = "\x1b[A"
+QUIT = "\x03"
+INPUT_LINE = ">"
+MAIN_MENU_TEXT = "Press the UP and DOWN arrow keys to navigate the menu"
+END_SCREEN_TEXT = "Press any key to return to the main menu"
+ERROR_TEXT = "You will now be returned to the main menu"
+TIMED_TEXT = "Time left to answer"
+SENTENCE_PROMPT = "Enter a sentence"
+FILE_PROMPT = "Enter the name or path of the file"
+# The number of game options before 'Return to main menu'
+NUM_OF_GAME_OPTIONS = 4
+_CONTROL_SEQUENCE = re.compile(
+    r"\x1b\[([?0-9;]*)([@-~])|\x1b\][^\x07]*\x07|\x1b[()#].|\x1b.|"
+    r"([\r\n\b\x07])")
+_TRANSLATED_LANGUAGE = re.compile(
+    r"Translation: \[([A-Z]{2}(?:[-_][A-Z]{2})?)\]")
+
+
+class _Screen():
+    """The screen of a terminal, drawn from what the game sends to it.
+
+    Only understands what prompt-toolkit uses to draw a full screen
+    application: moving the cursor, erasing and writing text. Colours and
+    other attributes are ignored.
+
+    Attributes
+    ----------
+    _rows : int
+        The number of rows on the screen.
+    _columns : int
+        The number of columns on the screen.
+    _cells : List[List[str]]
+        The character in each cell, by row.
+    _row : int
+        The cursor's row.
+    _column : int
+        The cursor's column.
+
+    Methods
+    -------
+    feed(data: str):
+        Draws what the game has sent.
+    get_lines() -> List[str]:
+        Gets the text of each row, without trailing spaces.
+    """
+
+    def __init__(self, rows: int, columns: int):
+        """Initialises the object with an empty screen.
+
+        Parameters
+        ----------
+        rows
+            The number of rows on the screen.
+        columns
+            The number of columns on the screen.
+        """
+        self._rows = rows
+        self._columns = columns
+        self._cells = [[" "] * columns for _ in range(rows)]
+        self._row = 0
+        self._column = 0
+
+    def feed(self, data: str):
+        """Draws what the game has sent.
+
+        Parameters
+        ----------
+        data
+            The text and escape sequences sent by the game.
+        """
+        position = 0
+        for match in _CONTROL_SEQUENCE.finditer(data):
+            self._write(data[position:match.start()])
+            position = match.end()
+            if match.group(2):
+                self._run_command(match.group(1), match.group(2))
+            elif match.group(3) == "\r":
+                self._column = 0
+            elif match.group(3) == "\n":
+                self._row = min(self._row + 1, self._rows - 1)
+            elif match.group(3) == "\b":
+                self._column = max(self._column - 1, 0)
+        self._write(data[position:])
+
+    def get_lines(self) -> List[str]:
+        """Gets the text of each row, without trailing spaces.
+
+        Returns
+        -------
+        List[str]
+            The text of each row, from the top of the screen.
+        """
+        return ["".join(row).rstrip() for row in self._cells]
+
+    def _write(self, text: str):
+        """Writes text at the cursor, moving the cursor past it.
+
+        Parameters
+        ----------
+        text
+            The text to write, without any escape sequences.
+        """
+        for character in text:
+            width = get_cwidth(character)
+            if not width:
+                continue
+            if self._column + width > self._columns:
+                continue
+            self._cells[self._row][self._column] = character
+            for column in range(self._column + 1, self._column + width):
+                self._cells[self._row][column] = ""
+            self._column += width
+
+    def _run_command(self, parameters: str, command: str):
+        """Runs a control sequence that moves the cursor or erases.
+
+        Parameters
+        ----------
+        parameters
+            The sequence's parameters, e.g. '3;1'.
+        command
+            The character that ends the sequence, e.g. 'H'.
+        """
+        if parameters.startswith("?"):
+            return
+        numbers = [int(number) if number else 0
+                   for number in parameters.split(";")]
+        count = max(numbers[0], 1)
+        if command == "A":
+            self._row = max(self._row - count, 0)
+        elif command == "B":
+            self._row = min(self._row + count, self._rows - 1)
+        elif command == "C":
+            self._column = min(self._column + count, self._columns - 1)
+        elif command == "D":
+            self._column = max(self._column - count, 0)
+        elif command in "Hf":
+            row = numbers[0] if numbers else 1
+            column = numbers[1] if len(numbers) > 1 else 1
+            self._row = min(max(row, 1), self._rows) - 1
+            self._column = min(max(column, 1), self._columns) - 1
+        elif command == "J":
+            start_row = 0 if numbers[0] == 2 else self._row + 1
+            if numbers[0] != 2:
+                self._erase_line(self._column)
+            for row in range(start_row, self._rows):
+                self._cells[row] = [" "] * self._columns
+        elif command == "K":
+            self._erase_line(0 if numbers[0] == 2 else self._column)
+
+    def _erase_line(self, start_column: int):
+        """Erases the cursor's row from a column to the end.
+
+        Parameters
+        ----------
+        start_column
+            The first column to erase.
+        """
+        row = self._cells[self._row]
+        row[start_column:] = [" "] * (self._columns - start_column)
+
+
+class SimulatedPlayer():
+    """Class for a player who plays through the browser terminal's
+    websocket.
+
+    Attributes
+    ----------
+    _url : str
+        The websocket URL of the game server.
+    _random : random.Random
+        The source of the player's think times, settings and answers.
+    _think_scale : float
+        The multiplier for every think time.
+    _games_per_session : int
+        The number of games to play before quitting.
+    _settings : List[Tuple[int, int]]
+        The input modes and difficulty levels the player chooses from.
+    _file_path : str
+        The file to give, as a path on the server, when asked for one.
+    _screen : _Screen
+        The player's screen.
+    _num_of_frames : int
+        The number of frames received so far.
+    _frame_received : asyncio.Event
+        Set whenever a frame is received.
+    _last_screen : List[str]
+        The screen above the input line when the player last typed.
+
+    Methods
+    -------
+    play_session() -> Dict[str, Any]:
+        Connects, plays the player's games and quits.
+    """
+
+    def __init__(
+            self, url: str, seed: int, think_scale: float = 1.0,
+            games_per_session: int = 1,
+            settings: List[Tuple[int, int]] = None, file_path: str = None,
+            rows: int = DEFAULT_ROWS, columns: int = DEFAULT_COLUMNS):
+        """Initialises the object with the passed parameters.
+
+        Parameters
+        ----------
+        url
+            The websocket URL of the game server.
+        seed
+            The seed for the player's random choices.
+        think_scale
+            The multiplier for every think time, e.g. 0 to respond as soon
+            as possible.
+        games_per_session
+            The number of games to play before quitting.
+        settings
+            The input modes and difficulty levels the player chooses from,
+            or None for automatic input at every difficulty level.
+        file_path
+            The file to give, as a path on the server, when asked for one.
+        rows
+            The number of rows in the server's terminals.
+        columns
+            The number of columns in the server's terminals.
+        """
+        self._url = url
+        self._random = random.Random(seed)
+        self._think_scale = think_scale
+        self._games_per_session = games_per_session
+        self._settings = settings or [
+            (InputMode.AUTO.value, difficulty.value)
+            for difficulty in Difficulty]
+        self._file_path = file_path
+        self._screen = _Screen(rows, columns)
+        self._num_of_frames = 0
+        self._frame_received = asyncio.Event()
+        self._last_screen = None
+
+    async def play_session(self) -> Dict[str, Any]:
+        """Connects, plays the player's games and quits.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The number of games and questions played and answers that ran
+            out of time, the latency of each question and menu key in
+            seconds, and the error that ended the session, if there was one.
+        """
+        result = {
+            "num_of_games": 0,
+            "num_of_questions": 0,
+            "num_of_timeouts": 0,
+            "question_latencies": [],
+            "menu_latencies": [],
+            "error": None
+        }
+        reader = None
+        try:
+            async with websockets.connect(
+                    self._url, open_timeout=RESPONSE_TIMEOUT,
+                    max_size=None) as websocket:
+                reader = asyncio.ensure_future(self._read_frames(websocket))
+                await self._wait_for(
+                    reader, lambda lines: MAIN_MENU_TEXT in lines[-1])
+                input_mode, difficulty_level = self._random.choice(
+                    self._settings)
+                await self._configure(
+                    websocket, reader, input_mode, difficulty_level, result)
+                for game_index in range(self._games_per_session):
+                    if game_index:
+                        await self._press(websocket, reader, "x", result)
+                    started_at = await self._press(
+                        websocket, reader, ENTER, result)
+                    await self._play_game(
+                        websocket, reader, result, started_at)
+                await websocket.send(QUIT)
+                await asyncio.wait_for(reader, RESPONSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            result["error"] = "timeout"
+        except (OSError, websockets.WebSocketException) as error:
+            result["error"] = type(error).__name__
+        except _GameError as error:
+            result["error"] = str(error)
+        finally:
+            if reader is not None:
+                reader.cancel()
+        return result
+
+    async def _configure(
+            self, websocket, reader: asyncio.Future, input_mode: int,
+            difficulty_level: int, result: Dict[str, Any]):
+        """Chooses the game's settings in the game options menu.
+
+        Starts and ends on the main menu with 'PLAY' selected. The menu
+        isn't opened if the default settings were chosen.
+
+        Parameters
+        ----------
+        websocket : websockets.WebSocketClientProtocol
+            The player's connection.
+        reader
+            The task reading the player's frames.
+        input_mode
+            The input mode to choose.
+        difficulty_level
+            The difficulty level to choose.
+        result
+            The session's result, to add menu latencies to.
+        """
+        num_of_input_mode_presses = input_mode - InputMode.USER.value
+        num_of_difficulty_presses = difficulty_level - Difficulty.EASY.value
+        if not num_of_input_mode_presses and not num_of_difficulty_presses:
+            return
+        keys = ([DOWN, ENTER] + [ENTER] * num_of_input_mode_presses +
+                [DOWN] + [ENTER] * num_of_difficulty_presses +
+                [DOWN] * (NUM_OF_GAME_OPTIONS - 1) + [ENTER, UP])
+        for key in keys:
+            await self._press(websocket, reader, key, result)
+
+    async def _play_game(
+            self, websocket, reader: asyncio.Future,
+            result: Dict[str, Any], started_at: float):
+        """Plays a game from its first prompt to its end screen.
+
+        Parameters
+        ----------
+        websocket : websockets.WebSocketClientProtocol
+            The player's connection.
+        reader
+            The task reading the player's frames.
+        result
+            The session's result, to add the game's timings to.
+        started_at
+            The performance counter time 'PLAY' was pressed at.
+        """
+        waiting_since = started_at
+        self._last_screen = None
+        was_file_requested = False
+        while True:
+            state, lines = await self._wait_for(reader, self._get_game_state)
+            if state == "error":
+                raise _GameError("game error")
+            if state == "end":
+                result["num_of_games"] += 1
+                return
+
+            self._last_screen = lines[:-3]
+            if state == "file":
+                if was_file_requested or self._file_path is None:
+                    raise _GameError("file not found")
+                was_file_requested = True
+                await self._think(MENU_THINK_TIME)
+                await self._type(websocket, self._file_path)
+            elif state == "sentence":
+                await self._think(SENTENCE_THINK_TIME)
+                await self._type(
+                    websocket, self._random.choice(SENTENCES))
+            else:
+                result["num_of_questions"] += 1
+                result["question_latencies"].append(
+                    time.perf_counter() - waiting_since)
+                think_time = self._get_think_time(ANSWER_THINK_TIME)
+                if (TIMED_TEXT in lines[-2] and
+                        think_time >= GameSession.ANSWER_TIME_LIMIT):
+                    # The player doesn't answer in time, so the game moves
+                    # on by itself
+                    result["num_of_timeouts"] += 1
+                    await asyncio.sleep(GameSession.ANSWER_TIME_LIMIT)
+                    waiting_since = time.perf_counter()
+                    continue
+                await asyncio.sleep(think_time)
+                await self._type(websocket, self._choose_answer(lines))
+            waiting_since = time.perf_counter()
+
+    def _get_game_state(
+            self, lines: List[str]) -> Optional[Tuple[str, List[str]]]:
+        """Works out what the game is waiting for from the screen.
+
+        Parameters
+        ----------
+        lines
+            The text of each row of the screen.
+
+        Returns
+        -------
+        Optional[Tuple[str, List[str]]]
+            'answer', 'sentence', 'file', 'end' or 'error', and the
+            screen, or None if the game isn't waiting for the player or
+            is still showing the prompt the player last responded to.
+        """
+        text = "\n".join(lines)
+        if END_SCREEN_TEXT in text:
+            return ("error" if ERROR_TEXT in text else "end"), lines
+        # While the game is waiting for input, the input line is between
+        # the transcript and the toolbar's two lines
+        if lines[-3] != INPUT_LINE or lines[:-3] == self._last_screen:
+            return None
+        prompt = [line for line in lines[:-3] if line][-2:]
+        if any(FILE_PROMPT in line for line in prompt):
+            return "file", lines
+        if any(SENTENCE_PROMPT in line for line in prompt):
+            return "sentence", lines
+        # The question itself can be hidden by the language completions,
+        # since answers are the only input they're offered for
+        return "answer", lines
+
+    def _choose_answer(self, lines: List[str]) -> str:
+        """Chooses an answer to the question on the screen.
+
+        Parameters
+        ----------
+        lines
+            The text of each row of the screen.
+
+        Returns
+        -------
+        str
+            The correct language, if it can be read from the translation
+            and the player gets it right, otherwise a random one. The
+            translation can't be read if it's a local one, or is hidden by
+            the language completions.
+        """
+        languages = _TRANSLATED_LANGUAGE.findall("\n".join(lines))
+        if languages and self._random.random() < ANSWER_ACCURACY:
+            try:
+                return Language(languages[-1]).get_user_friendly_name()
+            except ValueError:
+                pass
+        return self._random.choice(list(Language)).get_user_friendly_name()
+
+    async def _press(
+            self, websocket, reader: asyncio.Future, key: str,
+            result: Dict[str, Any]) -> float:
+        """Presses a menu key after thinking, and times its next frame.
+
+        Parameters
+        ----------
+        websocket : websockets.WebSocketClientProtocol
+            The player's connection.
+        reader
+            The task reading the player's frames.
+        key
+            The key to press.
+        result
+            The session's result, to add the key's latency to.
+
+        Returns
+        -------
+        float
+            The performance counter time the key was pressed at.
+        """
+        await self._think(MENU_THINK_TIME)
+        num_of_frames = self._num_of_frames
+        pressed_at = time.perf_counter()
+        await websocket.send(key)
+        await self._wait_for(
+            reader, lambda _: self._num_of_frames > num_of_frames)
+        result["menu_latencies"].append(time.perf_counter() - pressed_at)
+        return pressed_at
+
+    async def _type(self, websocket, text: str):
+        """Types text and presses enter.
+
+        Parameters
+        ----------
+        websocket : websockets.WebSocketClientProtocol
+            The player's connection.
+        text
+            The text to type.
+        """
+        await websocket.send(text + ENTER)
+
+    async def _think(self, think_time: Tuple[float, float]):
+        """Waits for a think time.
+
+        Parameters
+        ----------
+        think_time
+            The median and spread of the think time's distribution.
+        """
+        await asyncio.sleep(self._get_think_time(think_time))
+
+    def _get_think_time(self, think_time: Tuple[float, float]) -> float:
+        """Picks a think time from a log-normal distribution.
+
+        Parameters
+        ----------
+        think_time
+            The median and spread of the distribution.
+
+        Returns
+        -------
+        float
+            The number of seconds to think for.
+        """
+        median, spread = think_time
+        return self._think_scale * self._random.lognormvariate(
+            math.log(median), spread)
+
+    async def _wait_for(
+            self, reader: asyncio.Future,
+            condition: Callable[[List[str]], Any]) -> Any:
+        """Waits for frames until a condition is met.
+
+        Parameters
+        ----------
+        reader
+            The task reading the player's frames.
+        condition
+            The condition, which is given the text of each row of the
+            screen.
+
+        Returns
+        -------
+        Any
+            The condition's result, once it's truthy.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If the server stops responding.
+        _GameError
+            If the server closes the connection first.
+        """
+        deadline = time.monotonic() + RESPONSE_TIMEOUT
+        while True:
+            value = condition(self._screen.get_lines())
+            if value:
+                return value
+            if reader.done():
+                raise _GameError("connection closed")
+            self._frame_received.clear()
+            await asyncio.wait_for(
+                self._frame_received.wait(), deadline - time.monotonic())
+
+    async def _read_frames(self, websocket):
+        """Draws each frame sent to the player until the connection closes.
+
+        Parameters
+        ----------
+        websocket : websockets.WebSocketClientProtocol
+            The player's connection.
+        """
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    message = message.decode("utf-8", "ignore")
+                self._screen.feed(message)
+                self._num_of_frames += 1
+                self._frame_received.set()
+        finally:
+            self._frame_received.set()
+
+
+class _GameError(Exception):
+    """Raised when a simulated player's game doesn't go as expected."""
+
+
+def get_percentile(values: List[float], percentile: float) -> float:
+    """Gets a percentile of values, using the nearest rank.
+
+    Parameters
+    ----------
+    values
+        The values, in any order.
+    percentile
+        The percentile, from 0 to 100.
+
+    Returns
+    -------
+    float
+        The value at the percentile, or 0.0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = max(int(-(-len(values) * percentile // 100)), 1)
+    return values[rank - 1]
+
+
+def get_stats_url(url: str) -> str:
+    """Gets the URL of the server's statistics from its websocket URL.
+
+    Parameters
+    ----------
+    url
+        The websocket URL of the game server.
+
+    Returns
+    -------
+    str
+        The HTTP URL of '/stats'.
+    """
+    parts = urlsplit(url)
+    scheme = "https" if parts.scheme == "wss" else "http"
+    return urlunsplit((scheme, parts.netloc, "/stats", "", ""))
+
+
+def fetch_stats(stats_url: str) -> Dict[str, Any]:
+    """Gets the statistics of whichever server process answers.
+
+    Parameters
+    ----------
+    stats_url
+        The HTTP URL of '/stats'.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The process' statistics, as served by GameServer.get_stats().
+    """
+    with urlopen(stats_url, timeout=RESPONSE_TIMEOUT) as response:
+        return json.load(response)
+
+
+async def poll_stats(
+        stats_url: str,
+        samples: Dict[Tuple[str, int], List[Tuple[float, Dict[str, Any]]]]):
+    """Polls the server's statistics until cancelled.
+
+    Parameters
+    ----------
+    stats_url
+        The HTTP URL of '/stats'.
+    samples
+        The time each sample was taken and its statistics, by host and
+        process ID, to add to.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            stats = await loop.run_in_executor(None, fetch_stats, stats_url)
+        except (OSError, ValueError):
+            stats = None
+        if stats is not None:
+            key = (stats.get("host", "unknown"), stats["pid"])
+            samples.setdefault(key, []).append((time.monotonic(), stats))
+        await asyncio.sleep(STATS_INTERVAL)
+
+
+def summarise_hosts(
+        samples: Dict[Tuple[str, int], List[Tuple[float, Dict[str, Any]]]]
+        ) -> Dict[str, Dict[str, Any]]:
+    """Summarises the CPU and memory used by each host during a step.
+
+    Parameters
+    ----------
+    samples
+        The time each sample was taken and its statistics, by host and
+        process ID.
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        For each host, its number of cores, the percentage of one core
+        used by its server processes, their largest total RSS in MB and
+        largest number of active sessions, and the same for each process.
+    """
+    hosts = {}
+    for (host, pid), process_samples in sorted(samples.items()):
+        first_time, first = process_samples[0]
+        last_time, last = process_samples[-1]
+        cpu_percent = None
+        if last_time > first_time:
+            cpu_percent = round(
+                (last["cpu_seconds"] - first["cpu_seconds"]) /
+                (last_time - first_time) * 100, 1)
+        summary = hosts.setdefault(host, {
+            "cpu_count": last["cpu_count"], "cpu_percent": 0.0,
+            "rss_mb": 0.0, "peak_active_sessions": 0, "processes": {}})
+        summary["processes"][pid] = {
+            "cpu_percent": cpu_percent,
+            "rss_mb": max(stats["rss_mb"] for _, stats in process_samples),
+            "peak_active_sessions": max(
+                stats["active_sessions"] for _, stats in process_samples)
+        }
+        summary["cpu_percent"] = round(
+            summary["cpu_percent"] + (cpu_percent or 0.0), 1)
+        summary["rss_mb"] = round(
+            summary["rss_mb"] + summary["processes"][pid]["rss_mb"], 2)
+        summary["peak_active_sessions"] += (
+            summary["processes"][pid]["peak_active_sessions"])
+    return hosts
+
+
+async def run_step(
+        num_of_players: int, duration: float, spawn_rate: float,
+        seed: int, stats_url: str, **player_settings) -> Dict[str, Any]:
+    """Keeps a number of players playing for a while and summarises it.
+
+    Parameters
+    ----------
+    num_of_players
+        The number of players playing at the same time.
+    duration
+        The number of seconds to keep starting sessions for. Sessions that
+        have started are finished, so the step takes a little longer.
+    spawn_rate
+        The number of players to start per second at the beginning.
+    seed
+        The seed for the first player, which is increased by one for each
+        player and session after it.
+    stats_url
+        The HTTP URL of the server's '/stats'.
+    player_settings
+        The SimulatedPlayer arguments for every player.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The step's sessions per second, latency percentiles, error rate
+        and host statistics.
+    """
+    results = []
+    seeds = iter(range(seed, sys.maxsize))
+    started_at = time.monotonic()
+    deadline = started_at + duration
+
+    async def keep_playing(player_index: int):
+        await asyncio.sleep(player_index / spawn_rate)
+        while time.monotonic() < deadline:
+            player = SimulatedPlayer(seed=next(seeds), **player_settings)
+            results.append(await player.play_session())
+
+    samples = {}
+    poller = asyncio.ensure_future(poll_stats(stats_url, samples))
+    client_times = os.times()
+    try:
+        await asyncio.gather(
+            *(keep_playing(index) for index in range(num_of_players)))
+    finally:
+        poller.cancel()
+    elapsed = time.monotonic() - started_at
+    client_cpu_seconds = sum(os.times()[:2]) - sum(client_times[:2])
+
+    question_latencies = [
+        latency for result in results
+        for latency in result["question_latencies"]]
+    menu_latencies = [
+        latency for result in results for latency in result["menu_latencies"]]
+    errors = {}
+    for result in results:
+        if result["error"] is not None:
+            errors[result["error"]] = errors.get(result["error"], 0) + 1
+    return {
+        "players": num_of_players,
+        "seconds": round(elapsed, 2),
+        "sessions": len(results),
+        "sessions_per_second": round(len(results) / elapsed, 2),
+        "games": sum(result["num_of_games"] for result in results),
+        "questions": sum(result["num_of_questions"] for result in results),
+        "answer_timeouts": sum(
+            result["num_of_timeouts"] for result in results),
+        "question_latency_ms": _summarise_latencies(question_latencies),
+        "menu_latency_ms": _summarise_latencies(menu_latencies),
+        "error_rate": round(
+            sum(errors.values()) / len(results), 4) if results else 0.0,
+        "errors": errors,
+        "hosts": summarise_hosts(samples),
+        "client_cpu_percent": round(client_cpu_seconds / elapsed * 100, 1)
+    }
+
+
+def _summarise_latencies(latencies: List[float]) -> Dict[str, float]:
+    """Gets the 50th, 90th and 99th percentile and maximum latencies.
+
+    Parameters
+    ----------
+    latencies
+        The latencies in seconds.
+
+    Returns
+    -------
+    Dict[str, float]
+        The percentiles in milliseconds.
+    """
+    return {
+        name: round(get_percentile(latencies, percentile) * 1000, 1)
+        for name, percentile in (
+            ("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+    }
+
+
+def start_server(
+        port: int, workers: int, latency: float) -> subprocess.Popen:
+    """Starts a game server on this machine, with a stub translator.
+
+    Parameters
+    ----------
+    port
+        The port to serve games on.
+    workers
+        The number of processes to serve games from.
+    latency
+        The number of seconds each stub translation takes.
+
+    Returns
+    -------
+    subprocess.Popen
+        The server's first process, which leads its own process group.
+
+    Raises
+    ------
+    RuntimeError
+        If the server doesn't start serving in time.
+    """
+    project_directory = os.path.dirname(
+        os.path.dirname(os.path.abspath(__file__)))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "classes.gameserver", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--stub-translator",
+         "--stub-latency", str(latency)],
+        cwd=project_directory, stderr=subprocess.DEVNULL,
+        start_new_session=True)
+    stats_url = f"http://127.0.0.1:{port}/stats"
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            fetch_stats(stats_url)
+            return server
+        except OSError:
+            if server.poll() is not None:
+                break
+            time.sleep(0.2)
+    stop_server(server)
+    raise RuntimeError("The game server didn't start")
+
+
+def stop_server(server: subprocess.Popen):
+    """Stops a game server started by start_server(), with its workers.
+
+    Parameters
+    ----------
+    server
+        The server's first process.
+    """
+    try:
+        os.killpg(server.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+    server.wait()
+
+
+def print_step(step: Dict[str, Any]):
+    """Prints the summary of a step.
+
+    Parameters
+    ----------
+    step
+        The step's summary, from run_step().
+    """
+    question = step["question_latency_ms"]
+    menu = step["menu_latency_ms"]
+    print(f"{step['players']} players: {step['sessions_per_second']:.2f}"
+          f" sessions/s ({step['sessions']} sessions, {step['questions']}"
+          f" questions in {step['seconds']:.0f}s),"
+          f" {step['error_rate']:.1%} failed {step['errors'] or ''}")
+    print(f"  question latency p50 {question['p50']}ms"
+          f" p90 {question['p90']}ms p99 {question['p99']}ms"
+          f" max {question['max']}ms,"
+          f" menu key latency p50 {menu['p50']}ms p99 {menu['p99']}ms")
+    for host, summary in step["hosts"].items():
+        print(f"  {host}: {summary['cpu_percent']}% CPU of"
+              f" {summary['cpu_count']} cores, {summary['rss_mb']}MB RSS,"
+              f" {summary['peak_active_sessions']} active sessions at peak"
+              f" ({len(summary['processes'])} process(es) sampled)")
+    print(f"  load generator: {step['client_cpu_percent']}% CPU", flush=True)
+
+
+def main(args: List[str] = None):
+    """Runs each step of the load test and prints the results.
+
+    Parameters
+    ----------
+    args : List[str]
+        The command line arguments, or None to use sys.argv.
+    """
+    parser = ArgumentParser(description="Load test the game server.")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument(
+        "--players", type=int, nargs="+", default=[10, 20, 50, 100],
+        help="the number of players for each step, in order")
+    parser.add_argument(
+        "--duration", type=float, default=DEFAULT_DURATION,
+        help="the number of seconds to start sessions for in each step")
+    parser.add_argument(
+        "--spawn-rate", type=float, default=DEFAULT_SPAWN_RATE,
+        help="the number of players to start per second")
+    parser.add_argument(
+        "--think-scale", type=float, default=1.0,
+        help="the multiplier for every think time, e.g. 0 for none")
+    parser.add_argument("--games-per-session", type=int, default=1)
+    parser.add_argument(
+        "--input-mode", action="append", dest="input_modes",
+        choices=[mode.name for mode in InputMode],
+        help="an input mode players may choose (repeatable, default AUTO)")
+    parser.add_argument(
+        "--difficulty", action="append", dest="difficulties",
+        choices=[level.name for level in Difficulty],
+        help="a difficulty level players may choose (repeatable, default"
+             " all)")
+    parser.add_argument(
+        "--file", help="the file for games with file input, on the server")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--columns", type=int, default=DEFAULT_COLUMNS)
+    parser.add_argument(
+        "--spawn-server", action="store_true",
+        help="start a game server on this machine with a stub translator")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--stub-latency", type=float, default=0.0,
+        help="the number of seconds each stub translation takes")
+    parser.add_argument(
+        "--output", help="a file to write every step's summary to as JSON")
+    options = parser.parse_args(args)
+
+    input_modes = options.input_modes or [InputMode.AUTO.name]
+    if InputMode.FILE.name in input_modes and not options.file:
+        parser.error("--file is required for games with file input")
+    settings = [
+        (InputMode[mode].value, Difficulty[level].value)
+        for mode in input_modes
+        for level in options.difficulties or [
+            level.name for level in Difficulty]]
+
+    url = options.url
+    server = None
+    if options.spawn_server:
+        url = f"ws://127.0.0.1:{urlsplit(url).port or DEFAULT_PORT}/"
+        server = start_server(
+            urlsplit(url).port, options.workers, options.stub_latency)
+    steps = []
+    try:
+        for index, num_of_players in enumerate(options.players):
+            step = asyncio.run(run_step(
+                num_of_players, options.duration, options.spawn_rate,
+                options.seed + index * 1000000, get_stats_url(url), url=url,
+                think_scale=options.think_scale,
+                games_per_session=options.games_per_session,
+                settings=settings, file_path=options.file,
+                rows=options.rows, columns=options.columns))
+            steps.append(step)
+            print_step(step)
+    finally:
+        if server is not None:
+            stop_server(server)
+
+    if options.output:
+        with open(options.output, "w") as output_file:
+            json.dump(steps, output_file, indent=2)
+            output_file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""Benchmark for how much memory each game process uses.
+
+Usage
+-----
+To run the benchmark, use:
+    python3 -m benchmarks.memory
+
+which plays scripted games in each input mode, each in a new process
+without a terminal or the DeepL API, and records the process' RSS, the
+memory still allocated by Python and its top allocators, and the memory
+kept per question. Since each player gets their own process, the RSS is
+the cost of one player. It exits with a non-zero status if any result is
+over the budget in benchmarks/memory_budget.json.
+
+To update the budget after an intended change, use:
+    python3 -m benchmarks.memory --update-budget
+"""
+from argparse import ArgumentParser
+from typing import Any, Dict, List
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+
+NUM_OF_GAMES = 20
+NUM_OF_TOP_ALLOCATORS = 10
+# The headroom given to each result when the budget is updated, as a
+# proportion of the result or a minimum amount, whichever is larger
+BUDGET_HEADROOM = 1.2
+MINIMUM_HEADROOM = {
+    "rss_mb": 2.0, "traced_mb": 1.0, "retained_bytes_per_question": 1024
+}
+PROJECT_DIRECTORY = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(
+    PROJECT_DIRECTORY, "benchmarks", "memory_budget.json")
+SENTENCE_FILE = os.path.join(
+    PROJECT_DIRECTORY, "resources", "testdata", "mixed-level-sentences.txt")
+# The game settings for each scenario, as headlessgame arguments
+SCENARIOS = {
+    "user": {
+        "input_mode": "USER", "difficulty": "EASY",
+        "sentences": ["The cat sat on the mat.", "Where is the station?",
+                      "I like green apples."]
+    },
+    "file": {"input_mode": "FILE", "difficulty": "HARD"},
+    "auto_rules": {
+        "input_mode": "AUTO", "difficulty": "BEAST", "engine": "RULES"
+    },
+    "auto_ngram": {
+        "input_mode": "AUTO", "difficulty": "BEAST", "engine": "NGRAM"
+    }
+}
+IMPORT_FILENAMES = [
+    "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>"
+]
+# The results that are checked against the budget
+BUDGETED_RESULTS = ["rss_mb", "traced_mb", "retained_bytes_per_question"]
+
+
+def get_rss_in_mb() -> float:
+    """Gets the resident set size of the current process.
+
+    Returns
+    -------
+    float
+        The number of megabytes of the process' memory in RAM.
+    """
+    with open("/proc/self/statm") as statm:
+        resident_pages = int(statm.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def get_peak_rss_in_mb() -> float:
+    """Gets the largest resident set size of the current process so far.
+
+    Returns
+    -------
+    float
+        The peak number of megabytes of the process' memory in RAM.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def play_scenario(
+        scenario: str, num_of_games: int,
+        trace_allocations: bool) -> Dict[str, Any]:
+    """Plays a scenario's games in the current process and measures them.
+
+    Parameters
+    ----------
+    scenario
+        The name of the scenario to play.
+    num_of_games
+        The number of games to play after the first.
+    trace_allocations
+        True to measure with tracemalloc, which is started before the game
+        is imported, otherwise False to measure RSS, which tracemalloc
+        would inflate.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The scenario's measurements.
+    """
+    if trace_allocations:
+        import tracemalloc
+        tracemalloc.start()
+
+    import run  # noqa: F401 - imported to measure what the game imports
+    result = {}
+    if not trace_allocations:
+        result["import_rss_mb"] = round(get_rss_in_mb(), 2)
+
+    from classes.enums.difficulty import Difficulty
+    from classes.enums.inputmode import InputMode
+    from classes.enums.sentenceengine import SentenceEngine
+    from classes.headlessgame import play_games
+    from classes.services.requestservice import RequestService
+    from classes.services.stubdeeplservice import StubDeepLService
+
+    RequestService.set_handler(StubDeepLService().handle_request)
+    settings = SCENARIOS[scenario]
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = None
+        if settings["input_mode"] == "FILE":
+            file_path = shutil.copy(SENTENCE_FILE, directory)
+
+        def play(num_of_games: int, seed: int) -> int:
+            """Plays games and returns the number of questions asked."""
+            return sum(
+                game["num_of_questions_asked"] for game in play_games(
+                    num_of_games, seed,
+                    input_mode=InputMode[settings["input_mode"]].value,
+                    difficulty_level=Difficulty[settings["difficulty"]].value,
+                    sentence_engine=SentenceEngine[
+                        settings.get("engine", "RULES")].value,
+                    sentences=settings.get("sentences"),
+                    file_path=file_path))
+
+        # The first game loads everything that's loaded lazily
+        play(1, 0)
+        if trace_allocations:
+            before = tracemalloc.take_snapshot()
+        num_of_questions = play(num_of_games, 1)
+
+    if not trace_allocations:
+        result["rss_mb"] = round(get_rss_in_mb(), 2)
+        result["peak_rss_mb"] = round(
+            max(get_peak_rss_in_mb(), get_rss_in_mb()), 2)
+        return result
+
+    after = tracemalloc.take_snapshot()
+    retained = sum(
+        stat.size_diff for stat in after.compare_to(before, "filename"))
+    result["traced_mb"] = round(
+        tracemalloc.get_traced_memory()[0] / (1024 * 1024), 2)
+    # Code objects and the like are allocated by the import system, so
+    # they're totalled separately to show the top allocators in the game
+    import_filters = [
+        tracemalloc.Filter(True, filename) for filename in IMPORT_FILENAMES]
+    result["imports_mb"] = round(sum(
+        stat.size for stat in after.filter_traces(
+            import_filters).statistics("filename")) / (1024 * 1024), 2)
+    after = after.filter_traces([
+        tracemalloc.Filter(False, filename) for filename in IMPORT_FILENAMES])
+    result["retained_bytes_per_question"] = round(
+        max(retained, 0) / num_of_questions)
+    result["top_allocators"] = [
+        {"location": str(stat.traceback), "kb": round(stat.size / 1024, 1),
+         "blocks": stat.count}
+        for stat in after.statistics("lineno")[:NUM_OF_TOP_ALLOCATORS]
+    ]
+    return result
+
+
+def measure_scenario(scenario: str, num_of_games: int) -> Dict[str, Any]:
+    """Measures a scenario in new processes, one for RSS and one for
+    tracemalloc.
+
+    Parameters
+    ----------
+    scenario
+        The name of the scenario to measure.
+    num_of_games
+        The number of games to play after the first.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The scenario's measurements.
+    """
+    result = {}
+    for measure in ("rss", "allocations"):
+        process = subprocess.run(
+            [sys.executable, "-m", "benchmarks.memory", "--child", scenario,
+             "--measure", measure, "--games", str(num_of_games)],
+            cwd=PROJECT_DIRECTORY, capture_output=True, text=True,
+            check=True)
+        result.update(json.loads(process.stdout))
+    return result
+
+
+def check_budget(
+        results: Dict[str, Dict[str, Any]],
+        budget: Dict[str, Dict[str, float]]) -> List[str]:
+    """Checks the results against the budget.
+
+    Parameters
+    ----------
+    results
+        The measurements of each scenario.
+    budget
+        The most each budgeted result may be, for each scenario.
+
+    Returns
+    -------
+    List[str]
+        A description of each result that's over budget.
+    """
+    over_budget = []
+    for scenario, result in results.items():
+        for name, limit in budget.get(scenario, {}).items():
+            if result[name] > limit:
+                over_budget.append(
+                    f"{scenario} {name}: {result[name]} (budget {limit})")
+    return over_budget
+
+
+def main(args: List[str] = None):
+    """Runs each scenario, prints the results and checks the budget.
+
+    Parameters
+    ----------
+    args : List[str]
+        The command line arguments, or None to use sys.argv.
+    """
+    parser = ArgumentParser(description="Benchmark the game's memory use.")
+    parser.add_argument(
+        "--scenario", action="append", dest="scenarios",
+        choices=list(SCENARIOS), help="a scenario to run (repeatable)")
+    parser.add_argument("--games", type=int, default=NUM_OF_GAMES)
+    parser.add_argument(
+        "--update-budget", action="store_true",
+        help="write the results, plus headroom, as the new budget")
+    parser.add_argument("--child", choices=list(SCENARIOS))
+    parser.add_argument("--measure", choices=["rss", "allocations"])
+    options = parser.parse_args(args)
+
+    if options.child:
+        print(json.dumps(play_scenario(
+            options.child, options.games, options.measure == "allocations")))
+        return
+
+    results = {}
+    for scenario in options.scenarios or list(SCENARIOS):
+        result = results[scenario] = measure_scenario(
+            scenario, options.games)
+        print(f"{scenario}: {result['rss_mb']:.1f}MB RSS"
+              f" ({result['import_rss_mb']:.1f}MB after imports,"
+              f" {result['peak_rss_mb']:.1f}MB peak),"
+              f" {result['traced_mb']:.1f}MB allocated by Python"
+              f" ({result['imports_mb']:.1f}MB by imports),"
+              f" {result['retained_bytes_per_question']} bytes kept"
+              " per question")
+        for allocator in result["top_allocators"]:
+            print(f"  {allocator['kb']:>9.1f}KB {allocator['blocks']:>7}"
+                  f" blocks  {allocator['location']}")
+
+    if options.update_budget:
+        with open(BUDGET_PATH) as budget_file:
+            budget = json.load(budget_file)
+        budget["python_version"] = platform.python_version()
+        for scenario, result in results.items():
+            budget[scenario] = {
+                name: round(max(result[name] * BUDGET_HEADROOM,
+                                result[name] + MINIMUM_HEADROOM[name]), 1)
+                for name in BUDGETED_RESULTS}
+        with open(BUDGET_PATH, "w") as budget_file:
+            json.dump(budget, budget_file, indent=4)
+            budget_file.write("\n")
+        print(f"Budget updated in {BUDGET_PATH}")
+        return
+
+    with open(BUDGET_PATH) as budget_file:
+        budget = json.load(budget_file)
+    if budget.get("python_version") != platform.python_version():
+        print(f"The budget was set with Python {budget.get('python_version')}"
+              f" and may not match Python {platform.python_version()}")
+    over_budget = check_budget(results, budget)
+    for description in over_budget:
+        print(f"Over budget: {description}")
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
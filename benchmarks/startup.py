@@ -0,0 +1,133 @@
+"""Benchmark for how long the game takes to show its title.
+
+Usage
+-----
+To run the benchmark, use:
+    python3 -m benchmarks.startup
+
+which imports run.py with '-X importtime' to list the slowest imports,
+checks that the modules only needed later in the game aren't imported at
+start-up, and times how long 'python3 run.py' takes to show the title in a
+terminal. It exits with a non-zero status if the time to the title is over
+budget or a lazily-loaded module has been imported early.
+"""
+from argparse import ArgumentParser
+from typing import Dict, List, Tuple
+import os
+import pty
+import re
+import select
+import signal
+import subprocess
+import sys
+import time
+
+NUM_OF_REPEATS = 5
+NUM_OF_SLOWEST_IMPORTS = 10
+TIME_TO_TITLE_BUDGET = 0.6
+TITLE_TIMEOUT = 10.0
+# Modules that should only be imported once they're needed in the game
+LAZY_MODULES = ["requests", "num2words", "flag", "dotenv"]
+TITLE_MARKER = b"PLAY"
+PROJECT_DIRECTORY = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))
+_IMPORT_TIME_PATTERN = re.compile(
+    r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def get_import_times() -> Dict[str, Tuple[int, int]]:
+    """Imports run.py in a new interpreter and records each import's time.
+
+    Returns
+    -------
+    Dict[str, Tuple[int, int]]
+        The time spent importing each top-level module, and its nested
+        imports, in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import run"],
+        cwd=PROJECT_DIRECTORY, capture_output=True, text=True, check=True)
+    import_times = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_PATTERN.match(line)
+        if match:
+            self_time, cumulative_time, _, module = match.groups()
+            import_times[module] = (int(self_time), int(cumulative_time))
+    return import_times
+
+
+def time_to_title() -> float:
+    """Starts the game in a new terminal and waits for the title.
+
+    Returns
+    -------
+    float
+        The number of seconds taken for the main menu to be shown.
+    """
+    start = time.perf_counter()
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.chdir(PROJECT_DIRECTORY)
+        os.execv(sys.executable, [sys.executable, "run.py"])
+
+    output = b""
+    elapsed = None
+    try:
+        while time.perf_counter() - start < TITLE_TIMEOUT:
+            ready, _, _ = select.select([fd], [], [], 0.01)
+            if not ready:
+                continue
+            try:
+                output += os.read(fd, 65536)
+            except OSError:
+                break
+            if TITLE_MARKER in output:
+                elapsed = time.perf_counter() - start
+                break
+    finally:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        os.close(fd)
+
+    if elapsed is None:
+        raise RuntimeError("The title wasn't shown before the timeout.")
+    return elapsed
+
+
+def main(args: List[str] = None):
+    """Runs each benchmark, prints the results and checks the budget.
+
+    Parameters
+    ----------
+    args : List[str]
+        The command line arguments, or None to use sys.argv.
+    """
+    parser = ArgumentParser(description="Benchmark the game's start-up.")
+    parser.add_argument(
+        "--budget", type=float, default=TIME_TO_TITLE_BUDGET,
+        help="the most seconds the title may take to be shown")
+    parser.add_argument("--repeats", type=int, default=NUM_OF_REPEATS)
+    options = parser.parse_args(args)
+
+    import_times = get_import_times()
+    print(f"Importing run.py: {import_times['run'][1] / 1000:.1f}ms")
+    slowest_imports = sorted(
+        import_times.items(), key=lambda item: item[1][0], reverse=True)
+    for module, (self_time, _) in slowest_imports[:NUM_OF_SLOWEST_IMPORTS]:
+        print(f"  {module}: {self_time / 1000:.1f}ms")
+
+    early_imports = [
+        module for module in LAZY_MODULES if module in import_times]
+    if early_imports:
+        print(f"Imported before they're needed: {', '.join(early_imports)}")
+
+    best_time = min(time_to_title() for _ in range(options.repeats))
+    print(f"Time to title: {best_time * 1000:.0f}ms"
+          f" (budget {options.budget * 1000:.0f}ms)")
+
+    if early_imports or best_time > options.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Class for weighted random sampling in constant time."""
+import random
+from typing import Generic, List, Sequence, TypeVar
+
+_T = TypeVar("_T")
+
+
+class AliasTable(Generic[_T]):
+    """Class for drawing weighted random items using Walker's alias method.
+
+    Building the table is O(n) but each draw afterwards is O(1), regardless
+    of how many items there are.
+    .. Built using Vose's version of the method, as described at:
+        https://www.keithschwarz.com/darts-dice-coins/
+
+    Attributes
+    ----------
+    _items : List[_T]
+        The items to draw from.
+    _probabilities : List[float]
+        The probability of keeping the item in each column rather than
+        taking its alias.
+    _aliases : List[int]
+        The index of the item to take instead for each column.
+
+    Methods
+    -------
+    sample() -> _T:
+        Draws a random item based on its weight.
+    """
+
+    def __init__(self, items: Sequence[_T], weights: Sequence[float]):
+        """Initialises the object with the passed parameters.
+
+        Parameters
+        ----------
+        items
+            The items to draw from.
+        weights
+            The relative weight of each item, which must be positive.
+        """
+        count = len(items)
+        total = sum(weights)
+        scaled = [weight * count / total for weight in weights]
+        small = [i for i, weight in enumerate(scaled) if weight < 1]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1]
+        probabilities = [1.0] * count
+        aliases = list(range(count))
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] -= 1 - scaled[less]
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+
+        self._items: List[_T] = list(items)
+        self._probabilities = probabilities
+        self._aliases = aliases
+
+    def __len__(self) -> int:
+        """Returns the number of items in the table."""
+        return len(self._items)
+
+    def sample(self) -> _T:
+        """Draws a random item based on its weight.
+
+        Returns
+        -------
+        _T
+            The drawn item.
+        """
+        position = random.random() * len(self._items)
+        column = int(position)
+        if position - column < self._probabilities[column]:
+            return self._items[column]
+        return self._items[self._aliases[column]]
@@ -0,0 +1,534 @@
+"""Translates whole sentence files for corpus building.
+
+Usage
+-----
+To translate a file into the languages of a difficulty level, use:
+    python3 -m classes.bulktranslator sentences.txt \\
+        --output sentences.jsonl --difficulty BEAST --concurrency 4
+
+which writes a JSON line (or CSV row, with --format csv) with the source
+text, target language and translation for each sentence. Progress is
+checkpointed, so running the same command again after it has been
+stopped carries on from where it left off.
+"""
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+from urllib.parse import quote_plus
+import csv
+import json
+import os
+import random
+import sys
+import time
+from classes.translation import Translation
+from classes.enums.difficulty import Difficulty
+from classes.enums.language import Language
+from classes.helpers.sentencefilehelper import SentenceFileHelper
+from classes.helpers.translationhelper import TranslationHelper
+from classes.services.requestservice import RequestService
+from classes.services.stubdeeplservice import StubDeepLService
+
+OUTPUT_FORMATS = ["jsonl", "csv"]
+CSV_HEADER = ["line", "text", "target_language", "language", "translation"]
+CHECKPOINT_SUFFIX = ".checkpoint"
+DEFAULT_BATCH_SIZE = 25
+DEFAULT_CONCURRENCY = 4
+# The most bytes of URL-encoded text to send in one request, as each
+# batch is sent in a GET request's query string
+MAX_BATCH_TEXT_SIZE = 4096
+
+# A sentence's line number and text paired with the language to translate
+# it into
+_Job = Tuple[int, str, Language]
+
+
+class BulkTranslationError(Exception):
+    """Raised when a translation request fails during a bulk translation."""
+
+
+class BulkTranslator():
+    """A class used to translate whole sentence files.
+
+    Sentences are read from the input file as they're needed and
+    translated a window at a time. Each window is split into batches of
+    sentences with the same target language, no bigger than
+    MAX_BATCH_TEXT_SIZE once encoded, which are sent as one request each,
+    with up to the concurrency limit being sent at once. The game's
+    translation cache isn't used. Once a
+    window's results have been written, the number of sentences done and
+    the size of the output are saved to a checkpoint file.
+
+    Attributes
+    ----------
+    _input_path : str
+        The path of the sentence file to translate.
+    _output_path : str
+        The path of the file to write the translations to.
+    _output_format : str
+        Either 'jsonl' or 'csv'.
+    _languages : List[Language]
+        The languages to translate into.
+    _every_language : bool
+        True if each sentence is translated into every language, otherwise
+        the languages are taken in turn.
+    _batch_size : int
+        The most sentences to send in one request.
+    _concurrency : int
+        The most requests to send at once.
+
+    Properties
+    ----------
+    checkpoint_path : str
+        Getter method for checkpoint_path property.
+
+    Methods
+    -------
+    run(progress: TextIO = None) -> int:
+        Translates the rest of the file.
+    """
+
+    def __init__(
+            self, input_path: str, output_path: str,
+            languages: List[Language], output_format: str = "jsonl",
+            every_language: bool = False,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            concurrency: int = DEFAULT_CONCURRENCY):
+        """Initialises the object with the passed parameters.
+
+        Parameters
+        ----------
+        input_path
+            The path of the sentence file to translate.
+        output_path
+            The path of the file to write the translations to.
+        languages
+            The languages to translate into.
+        output_format
+            Either 'jsonl' or 'csv'.
+        every_language
+            True if each sentence is translated into every language,
+            otherwise the languages are taken in turn.
+        batch_size
+            The most sentences to send in one request.
+        concurrency
+            The most requests to send at once.
+
+        Raises
+        ------
+        ValueError
+            If the output format is unknown, or the output path is the same
+            file as the input path, which would be overwritten.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        if is_same_file(input_path, output_path):
+            raise ValueError(
+                f"The output path is the same file as the input: {input_path}")
+        self._input_path = input_path
+        self._output_path = output_path
+        self._output_format = output_format
+        self._languages = languages
+        self._every_language = every_language
+        self._batch_size = batch_size
+        self._concurrency = concurrency
+
+    @property
+    def checkpoint_path(self) -> str:
+        """Getter method for checkpoint_path property"""
+        return self._output_path + CHECKPOINT_SUFFIX
+
+    def run(self, progress: TextIO = None) -> int:
+        """Translates the rest of the file.
+
+        Carries on from the last checkpoint, if there is one for the same
+        input, output and settings.
+
+        Parameters
+        ----------
+        progress
+            Where to report progress to after each window, if anywhere.
+
+        Returns
+        -------
+        int
+            The number of sentences translated by this run.
+
+        Raises
+        ------
+        BulkTranslationError
+            If a request fails. The results of the window it was in are not
+            written, so they're retried when the command is run again.
+        """
+        checkpoint = self._load_checkpoint()
+        if checkpoint is None:
+            checkpoint = {"sentences_done": 0, "output_size": 0}
+            with open(self._output_path, mode="w", encoding="utf-8"):
+                pass
+        else:
+            # Drop anything written after the checkpoint was saved
+            with open(self._output_path, mode="r+b") as output:
+                output.truncate(checkpoint["output_size"])
+
+        window_size = self._get_window_size()
+        num_translated = 0
+        start = time.perf_counter()
+        with open(self._input_path, encoding="utf-8") as input_file, \
+                open(self._output_path, mode="a", encoding="utf-8",
+                     newline="") as output, \
+                ThreadPoolExecutor(self._concurrency) as executor:
+            sentences = islice(
+                self._iter_sentences(input_file),
+                checkpoint["sentences_done"], None)
+            writer = self._create_writer(output, checkpoint["output_size"])
+            while True:
+                window = list(islice(sentences, window_size))
+                if not window:
+                    break
+                jobs = self._create_jobs(
+                    window, checkpoint["sentences_done"])
+                translations = self._translate_jobs(jobs, executor)
+                for (line_number, text, language), translation in zip(
+                        jobs, translations):
+                    writer(line_number, text, language, translation)
+                output.flush()
+                os.fsync(output.fileno())
+
+                checkpoint["sentences_done"] += len(window)
+                checkpoint["output_size"] = output.tell()
+                self._save_checkpoint(checkpoint)
+                num_translated += len(window)
+                if progress is not None:
+                    rate = num_translated / (time.perf_counter() - start)
+                    print(f"{checkpoint['sentences_done']} sentence(s) done"
+                          f" ({rate:.1f}/s)", file=progress, flush=True)
+        return num_translated
+
+    def _get_window_size(self) -> int:
+        """Gets the number of sentences to translate between checkpoints.
+
+        The window is big enough for every language to get a full batch
+        and for there to be at least as many batches as the concurrency
+        limit, so requests aren't sent with only a few sentences each.
+
+        Returns
+        -------
+        int
+            The number of sentences in each window.
+        """
+        if self._every_language:
+            return self._batch_size * -(
+                -self._concurrency // len(self._languages))
+        return self._batch_size * max(
+            self._concurrency, len(self._languages))
+
+    def _iter_sentences(self, lines: TextIO) -> Iterator[Tuple[int, str]]:
+        """Yields each sentence in the file with its line number.
+
+        Parameters
+        ----------
+        lines
+            The lines of the file.
+
+        Returns
+        -------
+        Iterator[Tuple[int, str]]
+            The line number and text of each sentence.
+        """
+        for line_number, line in enumerate(lines, 1):
+            stripped_line = line.strip()
+            if SentenceFileHelper.is_sentence(stripped_line):
+                yield line_number, stripped_line
+
+    def _create_jobs(
+            self, window: List[Tuple[int, str]],
+            first_index: int) -> List[_Job]:
+        """Pairs each sentence in a window with its target language(s).
+
+        Parameters
+        ----------
+        window
+            The line number and text of each sentence.
+        first_index
+            The index of the window's first sentence in the file, so the
+            languages are taken in the same turn after resuming.
+
+        Returns
+        -------
+        List[_Job]
+            The sentences to translate paired with their target languages.
+        """
+        if self._every_language:
+            return [(line_number, text, language)
+                    for line_number, text in window
+                    for language in self._languages]
+        return [(line_number, text,
+                 self._languages[(first_index + index) % len(self._languages)])
+                for index, (line_number, text) in enumerate(window)]
+
+    def _translate_jobs(
+            self, jobs: List[_Job],
+            executor: ThreadPoolExecutor) -> List[Translation]:
+        """Translates the jobs, batched by target language.
+
+        Parameters
+        ----------
+        jobs
+            The sentences to translate paired with their target languages.
+        executor
+            The executor to send the requests with.
+
+        Returns
+        -------
+        List[Translation]
+            The translation for each job, in the same order.
+
+        Raises
+        ------
+        BulkTranslationError
+            If a request fails or doesn't return a translation for every
+            sentence sent.
+        """
+        indexes_by_language: Dict[Language, List[int]] = {}
+        for index, (_, _, language) in enumerate(jobs):
+            indexes_by_language.setdefault(language, []).append(index)
+
+        batches = []
+        for language, indexes in indexes_by_language.items():
+            batch = []
+            batch_text_size = 0
+            for index in indexes:
+                text_size = len("&text=") + len(quote_plus(jobs[index][1]))
+                if batch and (
+                        len(batch) == self._batch_size or
+                        batch_text_size + text_size > MAX_BATCH_TEXT_SIZE):
+                    batches.append((language, batch))
+                    batch = []
+                    batch_text_size = 0
+                batch.append(index)
+                batch_text_size += text_size
+            if batch:
+                batches.append((language, batch))
+
+        results = executor.map(
+            lambda batch: TranslationHelper.translate_sentences(
+                [jobs[index][1] for index in batch[1]], batch[0],
+                use_cache=False),
+            batches)
+
+        translations = [None] * len(jobs)
+        for (_, indexes), batch_translations in zip(batches, results):
+            if len(batch_translations) != len(indexes):
+                raise BulkTranslationError(
+                    f"Got {len(batch_translations)} translation(s) for "
+                    f"{len(indexes)} sentence(s)")
+            for index, translation in zip(indexes, batch_translations):
+                if "Error: " in translation.text:
+                    raise BulkTranslationError(translation.text.strip())
+                translations[index] = translation
+        return translations
+
+    def _create_writer(self, output: TextIO, output_size: int):
+        """Creates the function that writes a result in the output format.
+
+        Parameters
+        ----------
+        output
+            The output file.
+        output_size
+            The size of the output file, so a CSV header is only written to
+            an empty file.
+
+        Returns
+        -------
+        Callable[[int, str, Language, Translation], None]
+            The function to write each result with.
+        """
+        if self._output_format == "csv":
+            csv_writer = csv.writer(output)
+            if output_size == 0:
+                csv_writer.writerow(CSV_HEADER)
+
+            def write_csv_row(
+                    line_number: int, text: str, language: Language,
+                    translation: Translation):
+                """Writes a result as a CSV row."""
+                csv_writer.writerow([
+                    line_number, text, language.value,
+                    language.get_user_friendly_name(), translation.text])
+            return write_csv_row
+
+        def write_json_line(
+                line_number: int, text: str, language: Language,
+                translation: Translation):
+            """Writes a result as a JSON line."""
+            output.write(json.dumps({
+                "line": line_number,
+                "text": text,
+                "target_language": language.value,
+                "language": language.get_user_friendly_name(),
+                "translation": translation.text
+            }, ensure_ascii=False) + "\n")
+        return write_json_line
+
+    def _load_checkpoint(self) -> Optional[dict]:
+        """Loads the checkpoint for this input and output, if there is one.
+
+        Returns
+        -------
+        Optional[dict]
+            The checkpoint, or None if a new translation should be started.
+        """
+        if not (os.path.exists(self.checkpoint_path) and
+                os.path.exists(self._output_path)):
+            return None
+        with open(self.checkpoint_path, encoding="utf-8") as file:
+            checkpoint = json.load(file)
+        if (checkpoint.get("input_path") != os.path.abspath(
+                self._input_path) or
+                checkpoint.get("format") != self._output_format or
+                checkpoint.get("every_language") != self._every_language or
+                checkpoint.get("languages") != [
+                    language.value for language in self._languages]):
+            return None
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: dict):
+        """Saves the checkpoint, replacing the previous one in one step.
+
+        Parameters
+        ----------
+        checkpoint
+            The number of sentences done and the size of the output.
+        """
+        checkpoint.update({
+            "input_path": os.path.abspath(self._input_path),
+            "format": self._output_format,
+            "every_language": self._every_language,
+            "languages": [language.value for language in self._languages]
+        })
+        temporary_path = self.checkpoint_path + ".tmp"
+        with open(temporary_path, mode="w", encoding="utf-8") as file:
+            json.dump(checkpoint, file)
+        os.replace(temporary_path, self.checkpoint_path)
+
+
+def is_same_file(first_path: str, second_path: str) -> bool:
+    """Checks if two paths are for the same file.
+
+    Parameters
+    ----------
+    first_path
+        The first path.
+    second_path
+        The second path, which may not exist yet.
+
+    Returns
+    -------
+    bool
+        True if the paths are for the same file, otherwise False.
+    """
+    if os.path.exists(first_path) and os.path.exists(second_path):
+        return os.path.samefile(first_path, second_path)
+    return os.path.realpath(first_path) == os.path.realpath(second_path)
+
+
+def get_default_output_path(input_path: str, output_format: str) -> str:
+    """Gets the path to write translations to if none is given.
+
+    Parameters
+    ----------
+    input_path
+        The path of the sentence file to translate.
+    output_format
+        Either 'jsonl' or 'csv'.
+
+    Returns
+    -------
+    str
+        The input path with the format's extension, e.g:
+            sentences.txt --> sentences.jsonl
+        or with '.translations' before it too if that would be the input
+        path itself, e.g:
+            sentences.jsonl --> sentences.translations.jsonl
+    """
+    root = os.path.splitext(input_path)[0]
+    output_path = f"{root}.{output_format}"
+    if is_same_file(input_path, output_path):
+        output_path = f"{root}.translations.{output_format}"
+    return output_path
+
+
+def main(args: List[str] = None):
+    """Parses the command line arguments and translates the file.
+
+    Parameters
+    ----------
+    args : List[str]
+        The command line arguments, or None to use sys.argv.
+    """
+    parser = ArgumentParser(
+        description="Translate a whole sentence file with DeepL.")
+    parser.add_argument("input", help="the sentence file to translate")
+    parser.add_argument(
+        "--output", help="defaults to the input path with the format's "
+        "extension, or '.translations' and the extension if that's the "
+        "input path")
+    parser.add_argument(
+        "--format", choices=OUTPUT_FORMATS, default=OUTPUT_FORMATS[0])
+    parser.add_argument(
+        "--difficulty", choices=[level.name for level in Difficulty],
+        default=Difficulty.BEAST.name,
+        help="translate into this difficulty level's languages")
+    parser.add_argument(
+        "--languages",
+        help="comma-separated language codes to use instead, e.g. ES,FR")
+    parser.add_argument(
+        "--every-language", action="store_true",
+        help="translate each sentence into every language")
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="the seed for choosing HARD languages, so a run can be resumed")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument(
+        "--stub-translator", action="store_true",
+        help="answer translation requests locally instead of with DeepL")
+    parser.add_argument("--stub-latency", type=float, default=0.0)
+    options = parser.parse_args(args)
+
+    if options.languages:
+        try:
+            languages = [Language(code.strip().upper())
+                         for code in options.languages.split(",")]
+        except ValueError as error:
+            parser.error(str(error))
+    else:
+        random.seed(options.seed)
+        languages = Language.get_choices_for_difficulty_level(
+            Difficulty[options.difficulty].value)
+    output_path = options.output or get_default_output_path(
+        options.input, options.format)
+    if is_same_file(options.input, output_path):
+        parser.error("--output must not be the input file")
+    if options.stub_translator:
+        RequestService.set_handler(
+            StubDeepLService(options.stub_latency).handle_request)
+
+    translator = BulkTranslator(
+        options.input, output_path, languages, options.format,
+        options.every_language, options.batch_size, options.concurrency)
+    try:
+        num_translated = translator.run(progress=sys.stderr)
+    except BulkTranslationError as error:
+        sys.exit(f"{error}\nRun the same command again to carry on.")
+    except KeyboardInterrupt:
+        sys.exit("\nStopped. Run the same command again to carry on.")
+    print(f"Translated {num_translated} sentence(s) to {output_path}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
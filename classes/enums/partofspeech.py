@@ -1,6 +1,18 @@
 """Enum type to represent a part of speech."""
 from enum import Enum
-from typing import List
+from typing import List, Tuple
+
+# region Category bit flags
+NOUN_FLAG = 1 << 0
+PERSONAL_PRONOUN_FLAG = 1 << 1
+VERB_FLAG = 1 << 2
+ADJECTIVE_FLAG = 1 << 3
+ADVERB_FLAG = 1 << 4
+AMOUNT_FLAG = 1 << 5
+ARTICLE_OR_AMOUNT_FLAG = 1 << 6
+INDEFINITE_ARTICLE_FLAG = 1 << 7
+CONJUNCTION_FLAG = 1 << 8
+# endregion
 
 
 class PartOfSpeech(Enum):
@@ -8,6 +20,12 @@ class PartOfSpeech(Enum):
 
     ...
 
+    Attributes
+    ----------
+    flags : int
+        The category bit flags (e.g. NOUN_FLAG) that apply to the part of
+        speech, precomputed at import.
+
     Methods
     -------
     is_a_noun() -> bool:
@@ -117,11 +135,7 @@ class PartOfSpeech(Enum):
         bool
             Returns True if the part of speech represents an article or amount.
         """
-        return self in (
-            PartOfSpeech.DEFINITE_ARTICLE,
-            PartOfSpeech.INDEFINITE_ARTICLE,
-            PartOfSpeech.AMOUNT
-        )
+        return bool(self.flags & ARTICLE_OR_AMOUNT_FLAG)
 
     def is_an_indefinte_article(self) -> bool:
         """Checks if the part of speech represents an indefinite article.
@@ -158,13 +172,7 @@ class PartOfSpeech(Enum):
             Returns True if the current part of speech can follow the
             preceding part, otherwise False.
         """
-        if (self._can_follow_article_or_noun(part_of_speech) or
-                self._can_follow_verb(part_of_speech) or
-                self._can_follow_personal_pronoun_or_noun(part_of_speech) or
-                self._can_follow_adverb(part_of_speech) or
-                self._can_follow_adjective(part_of_speech)):
-            return True
-        return False
+        return bool(self._follow_mask & part_of_speech._bit)
 
     def can_work_in_structure(
             self, sentence_structure: List["PartOfSpeech"],
@@ -182,13 +190,35 @@ class PartOfSpeech(Enum):
             Returns True if the current part of speech can follow the
             preceding part, otherwise False.
         """
-        if ((self.is_a_verb() and self in sentence_structure) or
-                (self.is_an_adverb() and
-                    preceding_part_of_speech.is_an_adjective()) or
-                (self.is_an_adjective() and
-                    preceding_part_of_speech.is_an_adverb())):
+        if self._conflict_mask & preceding_part_of_speech._bit:
             return False
-        return True
+        return not (self.flags & VERB_FLAG and self in sentence_structure)
+
+    def _can_follow_by_rules(self, part_of_speech: "PartOfSpeech") -> bool:
+        """Checks if one part of speech can follow another by evaluating each
+        rule in turn.
+
+        This is only used to build the follow table at import, after which
+        can_follow is a single bit operation.
+
+        Parameters
+        ----------
+        part_of_speech
+            The preceding part of speech to evaluate.
+
+        Returns
+        ----------
+        bool
+            Returns True if the current part of speech can follow the
+            preceding part, otherwise False.
+        """
+        if (self._can_follow_article_or_noun(part_of_speech) or
+                self._can_follow_verb(part_of_speech) or
+                self._can_follow_personal_pronoun_or_noun(part_of_speech) or
+                self._can_follow_adverb(part_of_speech) or
+                self._can_follow_adjective(part_of_speech)):
+            return True
+        return False
 
     def _can_follow_article_or_noun(
             self, part_of_speech: "PartOfSpeech") -> bool:
@@ -357,3 +387,41 @@ class PartOfSpeech(Enum):
         else:
             return False
         return True
+
+
+# region Precomputed lookups
+_CATEGORY_FLAGS = {
+    PartOfSpeech.DEFINITE_ARTICLE: ARTICLE_OR_AMOUNT_FLAG,
+    PartOfSpeech.INDEFINITE_ARTICLE: (
+        ARTICLE_OR_AMOUNT_FLAG | INDEFINITE_ARTICLE_FLAG),
+    PartOfSpeech.PERSONAL_PRONOUN: PERSONAL_PRONOUN_FLAG,
+    PartOfSpeech.ADJECTIVE: ADJECTIVE_FLAG,
+    PartOfSpeech.NOUN: NOUN_FLAG,
+    PartOfSpeech.AMOUNT: AMOUNT_FLAG | ARTICLE_OR_AMOUNT_FLAG,
+    PartOfSpeech.VERB: VERB_FLAG,
+    PartOfSpeech.ADVERB: ADVERB_FLAG,
+    PartOfSpeech.CONJUNCTION: CONJUNCTION_FLAG
+}
+
+for _index, _part in enumerate(PartOfSpeech):
+    _part.flags = _CATEGORY_FLAGS.get(_part, 0)
+    _part._bit = 1 << _index
+
+# FOLLOW_TABLE[i][j] is True if the i-th part of speech can follow the j-th,
+# in PartOfSpeech declaration order.
+FOLLOW_TABLE: Tuple[Tuple[bool, ...], ...] = tuple(
+    tuple(
+        _part._can_follow_by_rules(_preceding)
+        for _preceding in PartOfSpeech)
+    for _part in PartOfSpeech
+)
+
+for _part, _row in zip(PartOfSpeech, FOLLOW_TABLE):
+    _part._follow_mask = sum(
+        _preceding._bit
+        for _preceding, _can_follow in zip(PartOfSpeech, _row) if _can_follow)
+    # An adverb can't come straight after an adjective and vice versa
+    _part._conflict_mask = (
+        PartOfSpeech.ADJECTIVE._bit if _part is PartOfSpeech.ADVERB else
+        PartOfSpeech.ADVERB._bit if _part is PartOfSpeech.ADJECTIVE else 0)
+# endregion
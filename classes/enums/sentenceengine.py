@@ -0,0 +1,37 @@
+"""Enum to represent sentence generation engines"""
+from enum import Enum
+
+
+class SentenceEngine(Enum):
+    """
+    Enum type to represent the game's different sentence generation engines.
+
+    ...
+
+    Members
+    ----------
+    RULES : int
+        The integer representation of the rule-based sentence generator.
+    NGRAM : int
+        The integer representation of the corpus-trained n-gram generator.
+
+    Methods
+    -------
+    get_description(cls, engine: int) -> str:
+        Returns a description for a given sentence engine.
+    """
+    RULES = 1
+    NGRAM = 2
+
+    @classmethod
+    def get_description(cls, engine: int) -> str:
+        """Returns the description for a given sentence engine.
+
+        Returns
+        -------
+        str
+            The description of the given sentence engine.
+        """
+        if engine == 2:
+            return 'Sentences learned from example files'
+        return 'Grammar rules and a fixed dictionary (default)'
@@ -0,0 +1,64 @@
+"""Thin client that plays a game in a warm process from the fork server.
+
+Usage
+-----
+To play a game through a running fork server, use:
+    python3 -m classes.forkclient
+
+which hands this process' terminal to one of the server's ready-to-play
+children and waits for the game to end. If no server is running, the game
+is started with run.py instead.
+
+Note
+----
+* Only the standard library is imported here, so that the client starts
+as quickly as possible.
+"""
+import array
+import json
+import os
+import socket
+import sys
+
+DEFAULT_SOCKET_PATH = "/tmp/guess-the-language.sock"
+SOCKET_PATH_VARIABLE = "FORK_SERVER_SOCKET"
+TERMINAL_FDS = (0, 1, 2)
+
+
+def get_socket_path() -> str:
+    """Returns the path of the fork server's socket.
+
+    Returns
+    -------
+    str
+        The path set in the FORK_SERVER_SOCKET environment variable, or the
+        default path if it isn't set.
+    """
+    return os.environ.get(SOCKET_PATH_VARIABLE) or DEFAULT_SOCKET_PATH
+
+
+def main():
+    """Sends the terminal to the fork server and waits for the game to end."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(get_socket_path())
+    except OSError:
+        client.close()
+        run_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "run.py")
+        os.execv(sys.executable, [sys.executable, run_path])
+
+    settings = json.dumps({"TERM": os.environ.get("TERM", "xterm")})
+    client.sendmsg(
+        [settings.encode()],
+        [(socket.SOL_SOCKET, socket.SCM_RIGHTS,
+          array.array("i", TERMINAL_FDS))])
+    # The server closes the connection once the game is over
+    while client.recv(1):
+        pass
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""Server that keeps warm, ready-to-play processes for new players.
+
+Usage
+-----
+To run the server, use:
+    python3 -m classes.forkserver --spares 2 --games-per-child 20
+
+and start each game with 'python3 -m classes.forkclient'.
+
+The server imports the game, loads the sentence model and freezes the
+heap, so that the children it forks share those pages with it instead of
+each loading their own copy. A number of idle children are kept waiting
+for players, and each child exits after a number of games so that any
+memory it has grown is given back.
+"""
+from argparse import ArgumentParser
+from typing import Dict, List
+import array
+import asyncio
+import gc
+import importlib
+import json
+import os
+import selectors
+import signal
+import socket
+import sys
+
+from dotenv import load_dotenv
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.input import create_input
+from prompt_toolkit.output import create_output
+
+from classes.forkclient import TERMINAL_FDS, get_socket_path
+from classes.gameui import GameUI
+from classes.keypresstracer import KeyPressTracer
+from classes.ngramgenerator import NGramSentenceGenerator
+from classes.services.eventlogservice import EventLogService
+from classes.services.metricsservice import MetricsService
+
+DEFAULT_SPARES = 2
+DEFAULT_GAMES_PER_CHILD = 20
+DEFAULT_MAX_CHILDREN = 64
+REAP_INTERVAL = 1.0
+_BUSY = "busy"
+_IDLE = "idle"
+_MAX_SETTINGS_SIZE = 1024
+# The only settings a client can send, as anything else in the environment
+# could make the child read or write files of the client's choosing
+_ALLOWED_SETTINGS = ("TERM",)
+# Only the server's user can connect to its socket
+_SOCKET_UMASK = 0o177
+_STATUS_READ_SIZE = 4096
+# Modules that the game only imports once they're needed
+_LAZY_MODULES = ("requests", "num2words", "flag")
+
+
+class ForkServer():
+    """A class used to fork warm processes for new players.
+
+    Attributes
+    ----------
+    _socket_path : str
+        The path of the socket that clients connect to.
+    _spares : int
+        The number of idle children to keep waiting for players.
+    _games_per_child : int
+        The number of games each child plays before it exits.
+    _max_children : int
+        The highest number of children that can be running at once.
+    _children : Dict[int, str]
+        The state of each running child by its process ID.
+    _listener : socket.socket
+        The socket that clients connect to.
+    _status_reader : int
+        The end of the pipe that the parent reads children's states from.
+    _status_writer : int
+        The end of the pipe that children write their states to.
+
+    Methods
+    -------
+    warm_up():
+        Loads everything that can be shared by the children.
+    serve():
+        Keeps spare children running until the server is stopped.
+    """
+
+    def __init__(
+            self, socket_path: str, spares: int = DEFAULT_SPARES,
+            games_per_child: int = DEFAULT_GAMES_PER_CHILD,
+            max_children: int = DEFAULT_MAX_CHILDREN):
+        self._socket_path = socket_path
+        self._spares = spares
+        self._games_per_child = games_per_child
+        self._max_children = max_children
+        self._children: Dict[int, str] = {}
+        self._listener = None
+        self._status_reader = None
+        self._status_writer = None
+
+    def warm_up(self):
+        """Loads everything that can be shared by the children.
+
+        The game's modules are imported with this one, so only the modules
+        and data it loads on first use are left to load. The heap is then
+        frozen so the garbage collector doesn't write to the shared pages in
+        the children.
+        """
+        load_dotenv()
+        for module in _LAZY_MODULES:
+            importlib.import_module(module)
+        NGramSentenceGenerator.get_default()
+        gc.collect()
+        gc.freeze()
+
+    def serve(self):
+        """Keeps spare children running until the server is stopped."""
+        if os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(_SOCKET_UMASK)
+        try:
+            self._listener.bind(self._socket_path)
+        finally:
+            os.umask(old_umask)
+        os.chmod(self._socket_path, 0o600)
+        self._listener.listen(self._max_children)
+        self._status_reader, self._status_writer = os.pipe()
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+        _log(f"Serving games on {self._socket_path}")
+
+        selector = selectors.DefaultSelector()
+        selector.register(self._status_reader, selectors.EVENT_READ)
+        # Several children can report at once, so every complete line read
+        # is handled and the rest is kept for the next read
+        pending_status = b""
+        try:
+            while True:
+                self._reap_children()
+                self._fork_spares()
+                if selector.select(timeout=REAP_INTERVAL):
+                    pending_status += os.read(
+                        self._status_reader, _STATUS_READ_SIZE)
+                    *statuses, pending_status = pending_status.split(b"\n")
+                    for status in statuses:
+                        self._update_child(status.decode())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for pid in self._children:
+                os.kill(pid, signal.SIGTERM)
+            self._listener.close()
+            os.unlink(self._socket_path)
+
+    def _fork_spares(self):
+        """Forks children until there are enough idle ones."""
+        idle_children = list(self._children.values()).count(_IDLE)
+        while (idle_children < self._spares and
+               len(self._children) < self._max_children):
+            pid = os.fork()
+            if pid == 0:
+                self._run_child()
+            self._children[pid] = _IDLE
+            idle_children += 1
+
+    def _reap_children(self):
+        """Forgets the children that have exited."""
+        while self._children:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self._children.pop(pid, None)
+
+    def _update_child(self, status: str):
+        """Records the state that a child has reported.
+
+        Parameters
+        ----------
+        status : str
+            The child's process ID and state, separated by a space.
+        """
+        pid, state = status.split()
+        if int(pid) in self._children:
+            self._children[int(pid)] = state
+        _log(f"{list(self._children.values()).count(_BUSY)} game(s) "
+             f"being played, {len(self._children)} child(ren) running")
+
+    def _run_child(self):
+        """Plays games with players until it's time for the child to exit."""
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        os.close(self._status_reader)
+        exit_code = 0
+        try:
+            for games_left in range(self._games_per_child - 1, -1, -1):
+                connection, _ = self._listener.accept()
+                self._report(_BUSY)
+                with connection:
+                    _play_game(connection)
+                if games_left:
+                    self._report(_IDLE)
+        except Exception as error:
+            _log(f"Child stopped: {error!r}")
+            exit_code = 1
+        # Exit handlers don't run after os._exit(), so metrics, events and
+        # key press traces are written first
+        MetricsService.export()
+        EventLogService.stop()
+        KeyPressTracer.write_report()
+        os._exit(exit_code)
+
+    def _report(self, state: str):
+        """Tells the parent what state the child is in.
+
+        Parameters
+        ----------
+        state : str
+            Either 'busy' or 'idle'.
+        """
+        os.write(self._status_writer, f"{os.getpid()} {state}\n".encode())
+
+
+def _play_game(connection: socket.socket):
+    """Plays a game on the terminal received from a client.
+
+    Parameters
+    ----------
+    connection : socket.socket
+        The client's connection, which is closed when the game is over.
+    """
+    fds = array.array("i")
+    message, ancdata, _, _ = connection.recvmsg(
+        _MAX_SETTINGS_SIZE,
+        socket.CMSG_LEN(len(TERMINAL_FDS) * fds.itemsize))
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(data[:len(data) - (len(data) % fds.itemsize)])
+    if len(fds) != len(TERMINAL_FDS):
+        for fd in fds:
+            os.close(fd)
+        return
+
+    try:
+        settings = json.loads(message.decode() or "{}")
+    except ValueError:
+        settings = {}
+    if not isinstance(settings, dict):
+        settings = {}
+    for name in _ALLOWED_SETTINGS:
+        if isinstance(settings.get(name), str):
+            os.environ[name] = settings[name]
+    for fd, terminal_fd in zip(fds, TERMINAL_FDS):
+        os.dup2(fd, terminal_fd)
+        os.close(fd)
+
+    try:
+        asyncio.run(_run_application(connection))
+        print("Thank you for playing!\n", flush=True)
+    finally:
+        # Let go of the player's terminal so it closes with the client
+        null_fd = os.open(os.devnull, os.O_RDWR)
+        for terminal_fd in TERMINAL_FDS:
+            os.dup2(null_fd, terminal_fd)
+        os.close(null_fd)
+
+
+async def _run_application(connection: socket.socket):
+    """Runs the game until the player quits or the client goes away.
+
+    Parameters
+    ----------
+    connection : socket.socket
+        The client's connection, which only becomes readable when the
+        client has gone away.
+    """
+    with create_app_session(
+            input=create_input(sys.stdin), output=create_output(sys.stdout)):
+        app = GameUI().create_application()
+
+        def exit_application():
+            asyncio.get_event_loop().remove_reader(connection.fileno())
+            if app.is_running and not app.future.done():
+                app.exit()
+
+        asyncio.get_event_loop().add_reader(
+            connection.fileno(), exit_application)
+        await app.run_async()
+
+
+def _raise_keyboard_interrupt(*_):
+    """Stops the server in the same way as Ctrl+C."""
+    raise KeyboardInterrupt
+
+
+def _log(message: str):
+    """Prints a message to the server's log.
+
+    Parameters
+    ----------
+    message : str
+        The message to print.
+    """
+    print(f"[pid {os.getpid()}] {message}", file=sys.stderr, flush=True)
+
+
+def main(args: List[str] = None):
+    """Parses the command line arguments and runs the server.
+
+    Parameters
+    ----------
+    args : List[str]
+        The command line arguments, or None to use sys.argv.
+    """
+    parser = ArgumentParser(
+        description="Keep warm 'Guess The Language' processes for players.")
+    parser.add_argument("--socket", default=get_socket_path())
+    parser.add_argument(
+        "--spares", type=int, default=DEFAULT_SPARES,
+        help="the number of idle children to keep waiting for players")
+    parser.add_argument(
+        "--games-per-child", type=int, default=DEFAULT_GAMES_PER_CHILD,
+        help="the number of games each child plays before it's replaced")
+    parser.add_argument(
+        "--max-children", type=int, default=DEFAULT_MAX_CHILDREN)
+    options = parser.parse_args(args)
+
+    server = ForkServer(
+        options.socket, options.spares, options.games_per_child,
+        options.max_children)
+    server.warm_up()
+    server.serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,50 @@
 """Class for word lookup based on parts of speech."""
 import random
-from typing import Dict, List, Tuple
-from num2words import num2words
+from typing import Any, Dict, List, Tuple
+from classes.aliastable import AliasTable
+from classes.enums.difficulty import Difficulty
+from classes.enums.language import Language
 from classes.enums.partofspeech import PartOfSpeech
 
+# Portuguese and Brazilian Portuguese share the same words and grammar for
+# the simple sentences generated locally.
+_PORTUGUESE_WORDS = {
+    "people": {
+        "boy": ("menino", "meninos", "m"),
+        "girl": ("menina", "meninas", "f"),
+        "man": ("homem", "homens", "m"),
+        "woman": ("mulher", "mulheres", "f"),
+        "father": ("pai", "pais", "m"),
+        "mother": ("mãe", "mães", "f"),
+        "brother": ("irmão", "irmãos", "m"),
+        "sister": ("irmã", "irmãs", "f")
+    },
+    "food": {
+        "apple": ("maçã", "maçãs", "f"),
+        "banana": ("banana", "bananas", "f"),
+        "pear": ("pera", "peras", "f"),
+        "orange": ("laranja", "laranjas", "f"),
+        "cherry": ("cereja", "cerejas", "f"),
+        "strawberry": ("morango", "morangos", "m"),
+        "mango": ("manga", "mangas", "f")
+    },
+    "verbs": {
+        "eat": ("come", "comem"),
+        "see": ("vê", "veem"),
+        "want": ("quer", "querem"),
+        "have": ("tem", "têm")
+    },
+    "adjectives": {
+        "nice": ("simpático", "simpática", "simpáticos", "simpáticas"),
+        "strong": ("forte", "forte", "fortes", "fortes"),
+        "funny": ("engraçado", "engraçada", "engraçados", "engraçadas")
+    }
+}
+_PORTUGUESE_GRAMMAR = {
+    "articles": {"m": ("o", "os"), "f": ("a", "as")},
+    "adjective_position": "after"
+}
+
 
 class GameDictionary():
     """Class for looking up words, like a dictionary.
@@ -13,6 +54,22 @@ class GameDictionary():
     WORDS: Dict[str, List[str]]
         A dictionary of words by their identifying part of speech
         and part of speech type/specificity.
+    MAX_SEARCH_ATTEMPTS: int
+        The maximum number of attempts made to find a word before falling
+        back to a known-good one.
+    FALLBACK_ADVERB: str
+        The adverb used when no adverb can be derived from the randomly
+        chosen adjectives.
+    TRANSLATED_WORDS: Dict[Language, Dict[str, Dict[str, Any]]]
+        The words, by language, that sentences can be generated with
+        locally, keyed by their English form.
+    GRAMMAR_RULES: Dict[Language, Dict[str, Any]]
+        The articles and word order used to build a sentence in each
+        language in TRANSLATED_WORDS.
+    WEIGHT_EXPONENTS: Dict[Difficulty, int]
+        The exponent applied to a word's length to weight it when sampling
+        for a difficulty level. Shorter words tend to be the more common
+        ones so they're favoured on EASY, and longer, rarer words on BEAST.
 
     Methods
     -------
@@ -20,8 +77,23 @@ class GameDictionary():
             part_of_speech: PartOfSpeech, specificity: str) -> Tuple[str, str]
         Finds and returns a word that meets the given criteria with its part of
         speech type/specificity.
+    get_fallback_count() -> int
+        Gets the number of searches that had to use a fallback word.
+    has_vocabulary_for(language: Language) -> bool
+        Checks if sentences can be generated locally in a given language.
     """
 
+    MAX_SEARCH_ATTEMPTS: int = 25
+    FALLBACK_ADVERB: str = "kindly"
+    WEIGHT_EXPONENTS: Dict[Difficulty, int] = {
+        Difficulty.EASY: -2,
+        Difficulty.NORMAL: -1,
+        Difficulty.HARD: 0,
+        Difficulty.BEAST: 1
+    }
+    _fallback_count: int = 0
+    _alias_tables: Dict[Tuple[str, str, Difficulty], AliasTable[str]] = {}
+
     WORDS: Dict[str, Dict[str, List[str]]] = {
         "articles": {
             "definite": ["the", "this", "that"],
@@ -290,11 +362,256 @@ class GameDictionary():
         }
     }
 
+    # Nouns are stored as (singular, plural, gender), verbs in the third
+    # person as (singular, plural), and adjectives as either a single form
+    # (if it never changes) or as (masculine, feminine, masculine plural,
+    # feminine plural).
+    TRANSLATED_WORDS: Dict[Language, Dict[str, Dict[str, Any]]] = {
+        Language.ENGLISH: {
+            "people": {
+                "boy": ("boy", "boys", "m"),
+                "girl": ("girl", "girls", "f"),
+                "man": ("man", "men", "m"),
+                "woman": ("woman", "women", "f"),
+                "father": ("father", "fathers", "m"),
+                "mother": ("mother", "mothers", "f"),
+                "brother": ("brother", "brothers", "m"),
+                "sister": ("sister", "sisters", "f")
+            },
+            "food": {
+                "apple": ("apple", "apples", "n"),
+                "banana": ("banana", "bananas", "n"),
+                "pear": ("pear", "pears", "n"),
+                "orange": ("orange", "oranges", "n"),
+                "cherry": ("cherry", "cherries", "n"),
+                "strawberry": ("strawberry", "strawberries", "n"),
+                "mango": ("mango", "mangoes", "n")
+            },
+            "verbs": {
+                "eat": ("eats", "eat"),
+                "see": ("sees", "see"),
+                "want": ("wants", "want"),
+                "have": ("has", "have")
+            },
+            "adjectives": {
+                "nice": "nice",
+                "strong": "strong",
+                "funny": "funny"
+            }
+        },
+        Language.FRENCH: {
+            "people": {
+                "boy": ("garçon", "garçons", "m"),
+                "girl": ("fille", "filles", "f"),
+                "man": ("homme", "hommes", "m"),
+                "woman": ("femme", "femmes", "f"),
+                "father": ("père", "pères", "m"),
+                "mother": ("mère", "mères", "f"),
+                "brother": ("frère", "frères", "m"),
+                "sister": ("sœur", "sœurs", "f")
+            },
+            "food": {
+                "apple": ("pomme", "pommes", "f"),
+                "banana": ("banane", "bananes", "f"),
+                "pear": ("poire", "poires", "f"),
+                "orange": ("orange", "oranges", "f"),
+                "cherry": ("cerise", "cerises", "f"),
+                "strawberry": ("fraise", "fraises", "f"),
+                "mango": ("mangue", "mangues", "f")
+            },
+            "verbs": {
+                "eat": ("mange", "mangent"),
+                "see": ("voit", "voient"),
+                "want": ("veut", "veulent"),
+                "have": ("a", "ont")
+            },
+            "adjectives": {
+                "nice": ("gentil", "gentille", "gentils", "gentilles"),
+                "strong": ("fort", "forte", "forts", "fortes"),
+                "funny": ("drôle", "drôle", "drôles", "drôles")
+            }
+        },
+        Language.SPANISH: {
+            "people": {
+                "boy": ("niño", "niños", "m"),
+                "girl": ("niña", "niñas", "f"),
+                "man": ("hombre", "hombres", "m"),
+                "woman": ("mujer", "mujeres", "f"),
+                "father": ("padre", "padres", "m"),
+                "mother": ("madre", "madres", "f"),
+                "brother": ("hermano", "hermanos", "m"),
+                "sister": ("hermana", "hermanas", "f")
+            },
+            "food": {
+                "apple": ("manzana", "manzanas", "f"),
+                "banana": ("plátano", "plátanos", "m"),
+                "pear": ("pera", "peras", "f"),
+                "orange": ("naranja", "naranjas", "f"),
+                "cherry": ("cereza", "cerezas", "f"),
+                "strawberry": ("fresa", "fresas", "f"),
+                "mango": ("mango", "mangos", "m")
+            },
+            "verbs": {
+                "eat": ("come", "comen"),
+                "see": ("ve", "ven"),
+                "want": ("quiere", "quieren"),
+                "have": ("tiene", "tienen")
+            },
+            "adjectives": {
+                "nice": ("amable", "amable", "amables", "amables"),
+                "strong": ("fuerte", "fuerte", "fuertes", "fuertes"),
+                "funny": ("gracioso", "graciosa", "graciosos", "graciosas")
+            }
+        },
+        Language.ITALIAN: {
+            "people": {
+                "boy": ("ragazzo", "ragazzi", "m"),
+                "girl": ("ragazza", "ragazze", "f"),
+                "man": ("uomo", "uomini", "m"),
+                "woman": ("donna", "donne", "f"),
+                "father": ("padre", "padri", "m"),
+                "mother": ("madre", "madri", "f"),
+                "brother": ("fratello", "fratelli", "m"),
+                "sister": ("sorella", "sorelle", "f")
+            },
+            "food": {
+                "apple": ("mela", "mele", "f"),
+                "banana": ("banana", "banane", "f"),
+                "pear": ("pera", "pere", "f"),
+                "orange": ("arancia", "arance", "f"),
+                "cherry": ("ciliegia", "ciliegie", "f"),
+                "strawberry": ("fragola", "fragole", "f"),
+                "mango": ("mango", "mango", "m")
+            },
+            "verbs": {
+                "eat": ("mangia", "mangiano"),
+                "see": ("vede", "vedono"),
+                "want": ("vuole", "vogliono"),
+                "have": ("ha", "hanno")
+            },
+            "adjectives": {
+                "nice": ("gentile", "gentile", "gentili", "gentili"),
+                "strong": ("forte", "forte", "forti", "forti"),
+                "funny": (
+                    "divertente", "divertente", "divertenti", "divertenti")
+            }
+        },
+        Language.GERMAN: {
+            "people": {
+                "boy": ("Junge", "Jungen", "m"),
+                "girl": ("Mädchen", "Mädchen", "n"),
+                "man": ("Mann", "Männer", "m"),
+                "woman": ("Frau", "Frauen", "f"),
+                "father": ("Vater", "Väter", "m"),
+                "mother": ("Mutter", "Mütter", "f"),
+                "brother": ("Bruder", "Brüder", "m"),
+                "sister": ("Schwester", "Schwestern", "f")
+            },
+            "food": {
+                "apple": ("Apfel", "Äpfel", "m"),
+                "banana": ("Banane", "Bananen", "f"),
+                "pear": ("Birne", "Birnen", "f"),
+                "orange": ("Orange", "Orangen", "f"),
+                "cherry": ("Kirsche", "Kirschen", "f"),
+                "strawberry": ("Erdbeere", "Erdbeeren", "f"),
+                "mango": ("Mango", "Mangos", "f")
+            },
+            "verbs": {
+                "eat": ("isst", "essen"),
+                "see": ("sieht", "sehen"),
+                "want": ("will", "wollen"),
+                "have": ("hat", "haben")
+            },
+            "adjectives": {
+                # (only used with a definite article in the nominative)
+                "nice": ("nette", "nette", "netten", "netten"),
+                "strong": ("starke", "starke", "starken", "starken"),
+                "funny": ("lustige", "lustige", "lustigen", "lustigen")
+            }
+        },
+        Language.DUTCH: {
+            "people": {
+                "boy": ("jongen", "jongens", "m"),
+                "girl": ("meisje", "meisjes", "n"),
+                "man": ("man", "mannen", "m"),
+                "woman": ("vrouw", "vrouwen", "f"),
+                "father": ("vader", "vaders", "m"),
+                "mother": ("moeder", "moeders", "f"),
+                "brother": ("broer", "broers", "m"),
+                "sister": ("zus", "zussen", "f")
+            },
+            "food": {
+                "apple": ("appel", "appels", "m"),
+                "banana": ("banaan", "bananen", "f"),
+                "pear": ("peer", "peren", "f"),
+                "orange": ("sinaasappel", "sinaasappels", "m"),
+                "cherry": ("kers", "kersen", "f"),
+                "strawberry": ("aardbei", "aardbeien", "f"),
+                "mango": ("mango", "mango's", "m")
+            },
+            "verbs": {
+                "eat": ("eet", "eten"),
+                "see": ("ziet", "zien"),
+                "want": ("wil", "willen"),
+                "have": ("heeft", "hebben")
+            },
+            "adjectives": {
+                # (only used with a definite article so always inflected)
+                "nice": "aardige",
+                "strong": "sterke",
+                "funny": "grappige"
+            }
+        },
+        Language.PORTUGUESE: _PORTUGUESE_WORDS,
+        Language.BRAZILIAN_PORTUGUESE: _PORTUGUESE_WORDS
+    }
+
+    # Articles are stored by gender as (singular, plural). Elided articles
+    # replace them before a noun starting with one of the elision letters.
+    GRAMMAR_RULES: Dict[Language, Dict[str, Any]] = {
+        Language.ENGLISH: {
+            "articles": {"m": ("the", "the"), "f": ("the", "the"),
+                         "n": ("the", "the")},
+            "adjective_position": "before"
+        },
+        Language.FRENCH: {
+            "articles": {"m": ("le", "les"), "f": ("la", "les")},
+            "elided_articles": {"m": ("l'", "les"), "f": ("l'", "les")},
+            "elision_letters": "aeiouhâéèêîôû",
+            "adjective_position": "after"
+        },
+        Language.SPANISH: {
+            "articles": {"m": ("el", "los"), "f": ("la", "las")},
+            "adjective_position": "after"
+        },
+        Language.ITALIAN: {
+            "articles": {"m": ("il", "i"), "f": ("la", "le")},
+            "elided_articles": {"m": ("l'", "gli"), "f": ("l'", "le")},
+            "elision_letters": "aeiou",
+            "adjective_position": "after"
+        },
+        Language.GERMAN: {
+            "articles": {"m": ("der", "die"), "f": ("die", "die"),
+                         "n": ("das", "die")},
+            "object_articles": {"m": ("den", "die"), "f": ("die", "die"),
+                                "n": ("das", "die")},
+            "adjective_position": "before"
+        },
+        Language.DUTCH: {
+            "articles": {"m": ("de", "de"), "f": ("de", "de"),
+                         "n": ("het", "de")},
+            "adjective_position": "before"
+        },
+        Language.PORTUGUESE: _PORTUGUESE_GRAMMAR,
+        Language.BRAZILIAN_PORTUGUESE: _PORTUGUESE_GRAMMAR
+    }
+
     @classmethod
     def search_for_word_by_type(
             cls, part_of_speech: PartOfSpeech,
             desired_type: str,
-            excluded_types: Dict[PartOfSpeech, str]) -> Tuple[str, str]:
+            excluded_types: Dict[PartOfSpeech, str],
+            difficulty_level: int = None) -> Tuple[str, str]:
         """Finds a random word in the WORDS dict that falls under a given part
         of speech.
 
@@ -306,6 +623,9 @@ class GameDictionary():
             The desired type of part of speech to look for, if provided.
         excluded_types
             The types of parts_of_speech to ignore, if provided.
+        difficulty_level
+            The game's difficulty level, used to weight words by how common
+            they are. Words are drawn uniformly if not provided.
 
         Returns
         ----------
@@ -316,11 +636,19 @@ class GameDictionary():
         random_word = None
 
         if part_of_speech == PartOfSpeech.ADVERB:
-            potential_adjectives = cls.WORDS["adjectives"].get(
-                desired_type or "people")
-            adjective = random.choice(potential_adjectives)
-            while not random_word:
-                random_word = cls._get_adjective_in_adverb_form(adjective)
+            # Not every adjective has an adverb form that can be derived
+            # (e.g. 'fun'), so a new adjective is picked on each attempt
+            # and the search gives up after MAX_SEARCH_ATTEMPTS.
+            for _ in range(cls.MAX_SEARCH_ATTEMPTS):
+                random_word = cls._get_adjective_in_adverb_form(
+                    cls._choose_word(
+                        "adjectives", desired_type or "people",
+                        difficulty_level))
+                if random_word:
+                    break
+            else:
+                cls._fallback_count += 1
+                random_word = cls.FALLBACK_ADVERB
         elif part_of_speech == PartOfSpeech.AMOUNT:
             number = random.randint(0, 100)
             random_word = cls._get_word_for_number(number)
@@ -330,17 +658,87 @@ class GameDictionary():
 
             for spec in list(potential_words_by_spec.keys()):
                 if not (part_of_speech in excluded_types and
-                        specificity in excluded_types[part_of_speech]):
+                        spec in excluded_types[part_of_speech]):
                     potential_specs.append(spec)
 
-            while specificity is None or specificity == "":
-                specificity = desired_type or random.choice(potential_specs)
+            if not specificity:
+                if desired_type:
+                    specificity = desired_type
+                elif potential_specs:
+                    specificity = random.choice(potential_specs)
+                else:
+                    # Every type has been excluded so fall back to the
+                    # first one listed rather than searching forever.
+                    cls._fallback_count += 1
+                    specificity = next(iter(potential_words_by_spec))
 
-            random_word = random.choice(
-                potential_words_by_spec.get(specificity)
-            )
+            random_word = cls._choose_word(
+                key, specificity, difficulty_level)
         return (random_word, specificity)
 
+    @classmethod
+    def get_fallback_count(cls) -> int:
+        """Gets the number of searches that had to use a fallback word.
+
+        Returns
+        -------
+        int
+            The number of times a search exhausted its attempts.
+        """
+        return cls._fallback_count
+
+    @classmethod
+    def has_vocabulary_for(cls, language: Language) -> bool:
+        """Checks if sentences can be generated locally in a given language.
+
+        Parameters
+        ----------
+        language
+            The language to check.
+
+        Returns
+        -------
+        bool
+            True if the language has words and grammar rules, otherwise
+            False.
+        """
+        return (language in cls.TRANSLATED_WORDS and
+                language in cls.GRAMMAR_RULES)
+
+    @classmethod
+    def _choose_word(
+            cls, key: str, specificity: str, difficulty_level: int) -> str:
+        """Chooses a random word for a given key and specificity.
+
+        Parameters
+        ----------
+        key
+            The part of speech key in WORDS, e.g. 'nouns'.
+        specificity
+            The type of part of speech, e.g. 'food'.
+        difficulty_level
+            The game's difficulty level used to weight the words, otherwise
+            None to draw uniformly.
+
+        Returns
+        -------
+        str
+            The chosen word.
+        """
+        words = cls.WORDS[key][specificity]
+        if difficulty_level is None:
+            return random.choice(words)
+
+        difficulty = Difficulty(difficulty_level)
+        table_key = (key, specificity, difficulty)
+        table = cls._alias_tables.get(table_key)
+        if table is None:
+            exponent = cls.WEIGHT_EXPONENTS[difficulty]
+            table = AliasTable(
+                words, [len(word) ** exponent for word in words])
+            cls._alias_tables[table_key] = table
+        return table.sample()
+
     @staticmethod
     def _get_search_criteria(part_of_speech: PartOfSpeech) -> tuple:
         """Retrieves search criteria for a given part of speech.
@@ -401,5 +799,7 @@ class GameDictionary():
         str
             The number as a word.
         """
-        # Use library to convert number to word equivalent
+        # Use library to convert number to word equivalent, which is only
+        # imported the first time an amount is needed
+        from num2words import num2words
         return num2words(number, lang="en")
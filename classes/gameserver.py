@@ -0,0 +1,470 @@
+"""Server that hosts many games in one process over websockets.
+
+Usage
+-----
+To run the server, use:
+    python3 -m classes.gameserver --port 8080
+
+which serves the browser terminal at '/' and plays one game per
+websocket connection, all in the same event loop. The process' capacity
+can be checked at '/stats' and the time taken by each stage of the
+questions played at '/metrics'.
+"""
+from argparse import ArgumentParser
+from http import HTTPStatus
+from typing import List, Optional, Tuple
+import asyncio
+import json
+import os
+import resource
+import socket
+import sys
+import time
+
+import websockets
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.data_structures import Size
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output.vt100 import Vt100_Output
+
+from classes.gameui import GameUI
+from classes.services.metricsservice import MetricsService
+from classes.services.requestservice import RequestService
+from classes.services.stubdeeplservice import StubDeepLService
+
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 8080
+DEFAULT_ROWS = 24
+DEFAULT_COLUMNS = 80
+FAREWELL_MESSAGE = "Thank you for playing!\n"
+_VIEWS_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "views")
+
+
+class _WebSocketStdout():
+    """Wrapper around a websocket that can be used as a stdout.
+
+    Output is buffered until flush() is called and then queued, so that a
+    single task can send each frame to the browser in order.
+
+    Attributes
+    ----------
+    encoding : str
+        The encoding used for the output.
+    errors : str
+        How encoding errors are handled.
+    _queue : asyncio.Queue
+        The frames waiting to be sent to the browser.
+    _buffer : List[str]
+        The text written since the last flush.
+
+    Methods
+    -------
+    write(data: str):
+        Adds text to the buffer.
+    flush():
+        Queues the buffered text to be sent.
+    isatty() -> bool:
+        Returns True, as the browser is a terminal.
+    get_frame() -> str:
+        Waits for the next frame to send.
+    frame_sent():
+        Marks the last frame as sent.
+    drain(timeout: float):
+        Waits for every queued frame to be sent.
+    """
+
+    def __init__(self):
+        self.encoding = "utf-8"
+        self.errors = "strict"
+        self._queue = asyncio.Queue()
+        self._buffer = []
+
+    def write(self, data: str):
+        """Adds text to the buffer.
+
+        Parameters
+        ----------
+        data : str
+            The text to write, with new lines converted for the terminal.
+        """
+        self._buffer.append(data.replace("\n", "\r\n"))
+
+    def flush(self):
+        """Queues the buffered text to be sent."""
+        if self._buffer:
+            self._queue.put_nowait("".join(self._buffer))
+            self._buffer = []
+
+    def isatty(self) -> bool:
+        """Returns True, as the browser is a terminal.
+
+        Returns
+        -------
+        bool
+            True.
+        """
+        return True
+
+    async def get_frame(self) -> str:
+        """Waits for the next frame to send.
+
+        Returns
+        -------
+        str
+            The text of the frame.
+        """
+        return await self._queue.get()
+
+    def frame_sent(self):
+        """Marks the last frame as sent."""
+        self._queue.task_done()
+
+    async def drain(self, timeout: float):
+        """Waits for every queued frame to be sent.
+
+        Parameters
+        ----------
+        timeout : float
+            The number of seconds to wait, in case the player has left.
+        """
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class GameServer():
+    """A class used to host many games in one process.
+
+    Each websocket connection gets its own GameUI and prompt_toolkit
+    application, but everything that doesn't belong to a single game,
+    such as the imported modules, the game dictionary, the translation
+    cache and the pooled HTTP connections, is shared.
+
+    Attributes
+    ----------
+    _rows : int
+        The number of rows in each player's terminal.
+    _columns : int
+        The number of columns in each player's terminal.
+    _active_sessions : int
+        The number of games currently being played.
+    _peak_sessions : int
+        The highest number of games played at the same time.
+    _total_sessions : int
+        The number of games started since the server started.
+    _baseline_rss : float
+        The memory used by the process before any games were started, in
+        MB.
+    _index_page : bytes
+        The page containing the browser terminal.
+
+    Properties
+    ----------
+    active_sessions : int
+        Getter method for active_sessions property.
+
+    Methods
+    -------
+    get_stats() -> dict:
+        Returns the server's capacity statistics.
+    process_request(path: str, request_headers) -> Optional[Tuple]:
+        Serves the HTTP pages that aren't websocket connections.
+    handle_connection(websocket, path: str = "/"):
+        Plays a game with the player connected to the websocket.
+    serve(host: str, port: int, reuse_port: bool = False):
+        Serves games until the process is stopped.
+    """
+
+    def __init__(
+            self, rows: int = DEFAULT_ROWS, columns: int = DEFAULT_COLUMNS):
+        self._rows = rows
+        self._columns = columns
+        self._active_sessions = 0
+        self._peak_sessions = 0
+        self._total_sessions = 0
+        self._baseline_rss = _get_rss_in_mb()
+        self._index_page = _render_index_page()
+
+    @property
+    def active_sessions(self) -> int:
+        """Getter method for active_sessions property.
+
+        Returns
+        -------
+        int
+            The number of games currently being played.
+        """
+        return self._active_sessions
+
+    def get_stats(self) -> dict:
+        """Returns the server's capacity statistics.
+
+        Returns
+        -------
+        dict
+            The host and process, the number of sessions, the memory used
+            for them and the CPU time spent on them.
+        """
+        rss = _get_rss_in_mb()
+        cpu_count = os.cpu_count() or 1
+        times = os.times()
+        memory_per_session = None
+        if self._active_sessions:
+            memory_per_session = round(
+                (rss - self._baseline_rss) / self._active_sessions, 2)
+        return {
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "active_sessions": self._active_sessions,
+            "peak_sessions": self._peak_sessions,
+            "total_sessions": self._total_sessions,
+            "cpu_count": cpu_count,
+            "sessions_per_core": round(
+                self._active_sessions / cpu_count, 2),
+            "rss_mb": round(rss, 2),
+            "baseline_rss_mb": round(self._baseline_rss, 2),
+            "rss_mb_per_session": memory_per_session,
+            "cpu_seconds": round(times.user + times.system, 2)
+        }
+
+    def process_request(
+            self, path: str, request_headers) -> Optional[Tuple]:
+        """Serves the HTTP pages that aren't websocket connections.
+
+        Parameters
+        ----------
+        path : str
+            The requested path.
+        request_headers : websockets.datastructures.Headers
+            The headers of the request.
+
+        Returns
+        -------
+        Optional[Tuple]
+            The status, headers and body of the response, or None if the
+            request should be upgraded to a websocket.
+        """
+        if path == "/stats":
+            body = json.dumps(self.get_stats()).encode()
+            return (HTTPStatus.OK,
+                    [("Content-Type", "application/json")], body)
+        if path == "/metrics":
+            body = MetricsService.get_prometheus_text().encode()
+            return (HTTPStatus.OK,
+                    [("Content-Type", "text/plain; version=0.0.4")], body)
+        if "Upgrade" not in request_headers:
+            if path != "/":
+                return HTTPStatus.NOT_FOUND, [], b""
+            return (HTTPStatus.OK,
+                    [("Content-Type", "text/html; charset=utf-8")],
+                    self._index_page)
+        return None
+
+    async def handle_connection(self, websocket, path: str = "/"):
+        """Plays a game with the player connected to the websocket.
+
+        Parameters
+        ----------
+        websocket : websockets.WebSocketServerProtocol
+            The player's connection.
+        path : str
+            The requested path, which is not used.
+        """
+        self._track_session(1)
+        stdout = _WebSocketStdout()
+        size = Size(rows=self._rows, columns=self._columns)
+        pipe_input = create_pipe_input()
+        output = Vt100_Output(
+            stdout, lambda: size, term="xterm", write_binary=False)
+        tasks = []
+        try:
+            with create_app_session(input=pipe_input, output=output):
+                app = GameUI().create_application()
+                tasks = [
+                    asyncio.ensure_future(app.run_async()),
+                    asyncio.ensure_future(_read_input(websocket, pipe_input)),
+                    asyncio.ensure_future(_send_output(websocket, stdout))
+                ]
+                await asyncio.wait(
+                    tasks[:2], return_when=asyncio.FIRST_COMPLETED)
+                if not tasks[0].done():
+                    # The player left before the game ended
+                    app.exit()
+                    await asyncio.wait([tasks[0]])
+                stdout.write(FAREWELL_MESSAGE)
+                stdout.flush()
+                await stdout.drain(timeout=1)
+                await websocket.close()
+        finally:
+            for task in tasks:
+                task.cancel()
+            pipe_input.close()
+            self._track_session(-1)
+
+    async def serve(
+            self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+            reuse_port: bool = False):
+        """Serves games until the process is stopped.
+
+        Parameters
+        ----------
+        host : str
+            The host to listen on.
+        port : int
+            The port to listen on.
+        reuse_port : bool
+            Whether other processes may listen on the same port.
+        """
+        async with websockets.serve(
+                self.handle_connection, host, port,
+                process_request=self.process_request,
+                reuse_port=reuse_port):
+            _log(f"Serving games on {host}:{port}")
+            await asyncio.Future()
+
+    def _track_session(self, change: int):
+        """Updates and logs the number of games being played.
+
+        Parameters
+        ----------
+        change : int
+            1 when a game starts and -1 when it ends.
+        """
+        self._active_sessions += change
+        if change > 0:
+            self._total_sessions += 1
+        self._peak_sessions = max(self._peak_sessions, self._active_sessions)
+        stats = self.get_stats()
+        _log(f"{stats['active_sessions']} active session(s), "
+             f"{stats['rss_mb']} MB RSS, "
+             f"{stats['rss_mb_per_session']} MB per session")
+
+
+async def _read_input(websocket, pipe_input):
+    """Sends the player's key presses to their game.
+
+    Parameters
+    ----------
+    websocket : websockets.WebSocketServerProtocol
+        The player's connection.
+    pipe_input : PipeInput
+        The input of the player's game.
+    """
+    try:
+        async for message in websocket:
+            if isinstance(message, bytes):
+                message = message.decode("utf-8", "ignore")
+            pipe_input.send_text(message)
+    except websockets.ConnectionClosed:
+        pass
+
+
+async def _send_output(websocket, stdout: _WebSocketStdout):
+    """Sends each frame of the player's game to their browser.
+
+    Parameters
+    ----------
+    websocket : websockets.WebSocketServerProtocol
+        The player's connection.
+    stdout : _WebSocketStdout
+        The output of the player's game.
+    """
+    try:
+        while True:
+            frame = await stdout.get_frame()
+            await websocket.send(frame)
+            stdout.frame_sent()
+    except websockets.ConnectionClosed:
+        pass
+
+
+def _get_rss_in_mb() -> float:
+    """Returns the memory currently used by the process.
+
+    Returns
+    -------
+    float
+        The resident set size in MB, or the peak size if the current size
+        can't be read.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _render_index_page() -> bytes:
+    """Returns the page containing the browser terminal.
+
+    Returns
+    -------
+    bytes
+        The index view inserted into the layout view.
+    """
+    with open(os.path.join(_VIEWS_DIRECTORY, "layout.html")) as layout:
+        page = layout.read()
+    with open(os.path.join(_VIEWS_DIRECTORY, "index.html")) as index:
+        page = page.replace("@{body}", index.read())
+    return page.encode()
+
+
+def _log(message: str):
+    """Prints a message to the server's log.
+
+    Parameters
+    ----------
+    message : str
+        The message to print.
+    """
+    print(f"[{time.strftime('%H:%M:%S')} pid {os.getpid()}] {message}",
+          file=sys.stderr, flush=True)
+
+
+def main(args: List[str] = None):
+    """Parses the command line arguments and serves games.
+
+    Parameters
+    ----------
+    args : List[str]
+        The command line arguments, or None to use sys.argv.
+    """
+    parser = ArgumentParser(description="Serve 'Guess The Language' games.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument(
+        "--port", type=int, default=int(os.environ.get("PORT", DEFAULT_PORT)))
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--columns", type=int, default=DEFAULT_COLUMNS)
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="the number of processes to serve games from, e.g. one per core")
+    parser.add_argument(
+        "--stub-translator", action="store_true",
+        help="answer translation requests locally instead of with DeepL")
+    parser.add_argument("--stub-latency", type=float, default=0.0)
+    options = parser.parse_args(args)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    if options.stub_translator:
+        RequestService.set_handler(
+            StubDeepLService(options.stub_latency).handle_request)
+
+    reuse_port = options.workers > 1
+    for _ in range(options.workers - 1):
+        if os.fork() == 0:
+            break
+    MetricsService.install_exporters()
+    server = GameServer(options.rows, options.columns)
+    try:
+        asyncio.run(server.serve(options.host, options.port, reuse_port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,653 @@
+"""Class for playing a game independently of how it's displayed."""
+import os
+import time
+import uuid
+from itertools import islice
+from typing import Iterator, List, Tuple
+from classes.translation import Translation
+from classes.translationwriter import TranslationWriter
+from classes.sentenceindex import SentenceIndex
+from classes.enums.difficulty import Difficulty
+from classes.enums.inputmode import InputMode
+from classes.enums.language import Language
+from classes.enums.sentenceengine import SentenceEngine
+from classes.helpers.sentencefilehelper import SentenceFileHelper
+from classes.helpers.translationhelper import TranslationHelper
+from classes.services.eventlogservice import EventLogService
+from classes.services.hintservice import HintService
+from classes.services.metricsservice import MetricsService
+from classes.gamedictionary import GameDictionary
+from classes.ngramgenerator import NGramSentenceGenerator
+from classes.sentencegenerator import SentenceGenerator
+
+
+class GameSession():
+    """Class for the state of a single game.
+
+    Holds a game's settings and progress, so that many games can be played
+    in one process, each by its own user interface. Nothing is displayed by
+    this class and the only blocking call is translate().
+
+    Attributes
+    ----------
+    NUM_OF_QS_PER_DIFFICULTY_LEVEL: List[int]
+        The number of questions in a game for each difficulty level.
+    CHAR_LIMIT_PER_DIFFICULTY_LEVEL: List[int]
+        The character limit for sentences for each difficulty level.
+    ANSWER_TIME_LIMIT: float
+        The number of seconds to answer a question in a timed game.
+    _game_id : str
+        The game's unique ID, used to tell its events apart in the event
+        log.
+    INDEXED_FILE_SIZE: int
+        The size in bytes from which sentences are sampled from anywhere in
+        a file, using its index, instead of read from the start of it.
+    _input_mode : int
+        The game's input mode.
+    _difficulty_level : int
+        The game's difficulty level.
+    _enable_hints : bool
+        True if hints are enabled, otherwise False.
+    _sentence_engine : int
+        The engine used to generate sentences.
+    _language_choices : List[Language]
+        The languages that haven't been translated into yet.
+    _num_of_questions_asked : int
+        The number of questions asked so far.
+    _num_of_correct_answers : int
+        The number of questions answered correctly so far.
+    _hints_used : int
+        The number of hints used for the current question.
+    _sentence : str
+        The sentence for the current question.
+    _target_language : Language
+        The language the current question's sentence is translated into.
+    _translation : Translation
+        The translation for the current question, if it has been made.
+    _answer : Language
+        The answer to the current question, or None if it isn't waiting to
+        be answered.
+    _file_sentences : List[Tuple[str, bool]]
+        The sentences read from file paired with whether or not they're
+        viable for translation.
+    _translation_writer : TranslationWriter
+        The writer for the translations made during a game with file input.
+    _answer_times : List[float]
+        The number of seconds taken to answer each question.
+
+    Methods
+    -------
+    load_file(path_or_filename: str) -> bool:
+        Reads the sentences to translate from a file.
+    next_question(user_sentence: str = None) -> str:
+        Starts the next question.
+    translate() -> Translation:
+        Translates the current question's sentence.
+    submit_answer(guess: str, time_taken: float = None) -> bool:
+        Submits an answer to the current question.
+    get_hint() -> str:
+        Gets the next hint for the current question.
+    save_translations() -> str:
+        Saves the translations made during a game with file input.
+    close():
+        Closes the file the game's translations are written to, if any.
+    is_viable_for_translation(user_input: str) -> bool:
+        Checks if input is viable for translation.
+    record_timing(stage: str, seconds: float):
+        Records how long a stage of the current question took.
+    is_valid_answer(user_input: str) -> bool:
+        Checks if input is a valid answer.
+    """
+
+    NUM_OF_QS_PER_DIFFICULTY_LEVEL: List[int] = [5, 5, 10, 24]
+    CHAR_LIMIT_PER_DIFFICULTY_LEVEL: List[int] = [30, 30, 40, 20]
+    ANSWER_TIME_LIMIT: float = 5.0
+    INDEXED_FILE_SIZE: int = 10 * 1024 * 1024
+
+    def __init__(
+            self, input_mode: int = InputMode.USER.value,
+            difficulty_level: int = Difficulty.EASY.value,
+            enable_hints: bool = True,
+            sentence_engine: int = SentenceEngine.RULES.value):
+        """Initialises the object with the passed parameters.
+
+        Parameters
+        ----------
+        input_mode
+            The game's input mode.
+        difficulty_level
+            The game's difficulty level.
+        enable_hints
+            True if hints are enabled, otherwise False.
+        sentence_engine
+            The engine used to generate sentences.
+        """
+        self._game_id = uuid.uuid4().hex
+        self._input_mode = input_mode
+        self._difficulty_level = difficulty_level
+        self._enable_hints = enable_hints
+        self._sentence_engine = sentence_engine
+        self._language_choices = Language.get_choices_for_difficulty_level(
+            difficulty_level)
+        self._num_of_questions_asked = 0
+        self._num_of_correct_answers = 0
+        self._hints_used = 0
+        self._sentence = None
+        self._target_language = None
+        self._translation = None
+        self._answer = None
+        self._file_sentences = None
+        self._translation_writer = None
+        self._answer_times = []
+        self._log_event(
+            "game_start", input_mode=InputMode(input_mode).name,
+            difficulty=Difficulty(difficulty_level).name,
+            enable_hints=enable_hints,
+            sentence_engine=SentenceEngine(sentence_engine).name,
+            num_of_questions=self.question_limit)
+
+    @property
+    def game_id(self) -> str:
+        """Getter method for game_id property"""
+        return self._game_id
+
+    @property
+    def input_mode(self) -> int:
+        """Getter method for input_mode property"""
+        return self._input_mode
+
+    @property
+    def difficulty_level(self) -> int:
+        """Getter method for difficulty_level property"""
+        return self._difficulty_level
+
+    @property
+    def char_limit(self) -> int:
+        """Getter method for char_limit property"""
+        return self.CHAR_LIMIT_PER_DIFFICULTY_LEVEL[self._difficulty_level]
+
+    @property
+    def question_limit(self) -> int:
+        """Getter method for question_limit property"""
+        return self.NUM_OF_QS_PER_DIFFICULTY_LEVEL[self._difficulty_level]
+
+    @property
+    def num_of_questions_asked(self) -> int:
+        """Getter method for num_of_questions_asked property"""
+        return self._num_of_questions_asked
+
+    @property
+    def score(self) -> int:
+        """Getter method for score property, i.e. the number of questions
+        answered correctly"""
+        return self._num_of_correct_answers
+
+    @property
+    def answer_times(self) -> List[float]:
+        """Getter method for answer_times property"""
+        return self._answer_times
+
+    @property
+    def sentence(self) -> str:
+        """Getter method for sentence property"""
+        return self._sentence
+
+    @property
+    def target_language(self) -> Language:
+        """Getter method for target_language property"""
+        return self._target_language
+
+    @property
+    def translation(self) -> Translation:
+        """Getter method for translation property"""
+        return self._translation
+
+    @property
+    def needs_sentence_from_user(self) -> bool:
+        """Getter method for needs_sentence_from_user property"""
+        return self._input_mode == InputMode.USER.value
+
+    @property
+    def needs_file(self) -> bool:
+        """Getter method for needs_file property, i.e. True if sentences
+        still need to be read from file"""
+        return (self._input_mode == InputMode.FILE.value and
+                not self._file_sentences)
+
+    @property
+    def is_timed(self) -> bool:
+        """Getter method for is_timed property"""
+        return self._difficulty_level == Difficulty.BEAST.value
+
+    @property
+    def has_error(self) -> bool:
+        """Getter method for has_error property, i.e. True if the current
+        question's translation failed"""
+        return (self._translation is not None and
+                "Error: " in self._translation.text)
+
+    @property
+    def can_get_hint(self) -> bool:
+        """Getter method for can_get_hint property"""
+        return (not self.is_timed and self._enable_hints and
+                self._answer is not None)
+
+    @property
+    def is_over(self) -> bool:
+        """Getter method for is_over property.
+
+        Easy and normal difficulty levels have 5 questions, hard has 10, and
+        BEAST has 24 (all available languages in the chosen API minus
+        English). Games with file input also end when the file's sentences
+        run out.
+        .. A detailed explanation can be found at:
+            https://github.com/DebzDK/guess-the-language#features
+        """
+        return (self._num_of_questions_asked == self.question_limit or
+                (self._file_sentences is not None and
+                 self._num_of_questions_asked >= len(self._file_sentences)))
+
+    def load_file(self, path_or_filename: str) -> bool:
+        """Reads the sentences to translate from a file.
+
+        Reads from file, line by line, and keeps each line that isn't blank,
+        a '//' comment or added by the game when writing translations. Stops
+        reading once there are enough sentences for the game's questions, so
+        large files aren't read in full. If there aren't enough, the rest are
+        auto-generated.
+
+        Files of INDEXED_FILE_SIZE or more are instead sampled at random,
+        using their index, from the sentences viable for the game's
+        difficulty level. The index is built the first time such a file is
+        loaded and only the sampled sentences are read. Building the index
+        reads the whole file, so this should be called off the event loop.
+        If the index can't be built, e.g. because the file's directory is
+        read-only, the file is read from the start instead.
+
+        Parameters
+        ----------
+        path_or_filename
+            The path to or name of the file to read from.
+
+        Returns
+        -------
+        bool
+            True if sentences were read, otherwise False.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file doesn't exist.
+        """
+        is_indexed = (
+            os.path.getsize(path_or_filename) >= self.INDEXED_FILE_SIZE)
+        if is_indexed:
+            try:
+                with SentenceIndex(
+                        path_or_filename,
+                        self.CHAR_LIMIT_PER_DIFFICULTY_LEVEL) as index:
+                    sentences = [
+                        (sentence, True) for sentence in index.sample(
+                            self._difficulty_level, self.question_limit)]
+            except OSError:
+                is_indexed = False
+        if not is_indexed:
+            with open(path_or_filename, encoding="utf-8") as file:
+                sentences = list(islice(
+                    self._iter_file_sentences(file), self.question_limit))
+
+        num_read = len(sentences)
+        while len(sentences) < self.question_limit:
+            sentences.append((self._generate_sentence(), True))
+
+        self._log_event(
+            "file_loaded", path=path_or_filename, is_indexed=is_indexed,
+            num_of_sentences=num_read,
+            num_of_viable_sentences=sum(
+                is_viable for _, is_viable in sentences[:num_read]))
+        self._file_sentences = sentences
+        self._translation_writer = TranslationWriter(
+            TranslationWriter.get_output_path(path_or_filename),
+            self._game_id)
+        return len(sentences) > 0
+
+    def next_question(self, user_sentence: str = None) -> str:
+        """Starts the next question.
+
+        Chooses a language that hasn't been translated into yet and the
+        sentence to translate. If the sentence is auto-generated with the
+        rule-based engine, its translation is generated along with it,
+        otherwise translate() must be called.
+
+        Parameters
+        ----------
+        user_sentence
+            The sentence entered by the user (only for user input game mode).
+
+        Returns
+        -------
+        str
+            The sentence for translation.
+        """
+        self._hints_used = 0
+        self._translation = None
+        self._target_language = TranslationHelper.choose_target_language(
+            self._language_choices)
+        start = time.perf_counter()
+
+        if self._can_generate_translation_locally(self._target_language):
+            sentence, translation = SentenceGenerator.generate_sentence_pair(
+                self.char_limit, self._target_language,
+                self._difficulty_level)
+            self._sentence = str(sentence)
+            self.record_timing("generation", time.perf_counter() - start)
+            self._log_question_start("generated_with_translation")
+            self._set_translation(translation)
+            return self._sentence
+
+        source = "generated"
+        if self._input_mode == InputMode.USER.value:
+            self._sentence = user_sentence
+            self._log_question_start("user")
+            return self._sentence
+        if self._input_mode == InputMode.FILE.value:
+            sentence, is_viable = (
+                self._file_sentences[self._num_of_questions_asked])
+            if is_viable:
+                self._sentence = sentence
+                self._log_question_start("file")
+                return self._sentence
+            source = "generated_for_file"
+
+        self._sentence = self._generate_sentence()
+        self.record_timing("generation", time.perf_counter() - start)
+        self._log_question_start(source)
+        return self._sentence
+
+    def translate(self) -> Translation:
+        """Translates the current question's sentence.
+
+        Makes a request to the translation API, so should not be called from
+        an event loop's thread. The time taken by each stage of the
+        translation is recorded.
+
+        Returns
+        -------
+        Translation
+            The translation, or an error parsed into a Translation object if
+            the request failed.
+        """
+        timings = {}
+        self._set_translation(TranslationHelper.translate_sentence(
+            self._sentence, self._target_language, timings))
+        for stage, seconds in timings.items():
+            self.record_timing(stage, seconds)
+        return self._translation
+
+    def submit_answer(self, guess: str, time_taken: float = None) -> bool:
+        """Submits an answer to the current question.
+
+        Parameters
+        ----------
+        guess
+            The value the user provided as input.
+        time_taken
+            The number of seconds taken to answer, if it was measured.
+
+        Returns
+        -------
+        bool
+            True if the guess is correct, otherwise False.
+        """
+        # Names typed with spaces, e.g. Brazilian Portuguese, are accepted
+        is_correct = (
+            guess.strip().lower().replace(" ", "_") ==
+            self._answer.name.lower())
+        if is_correct:
+            self._num_of_correct_answers += 1
+        if time_taken is not None:
+            self._answer_times.append(time_taken)
+            self.record_timing("think_time", time_taken)
+        self._log_event(
+            "answer", question=self._num_of_questions_asked, guess=guess,
+            answer=self._answer.name, is_correct=is_correct,
+            timed_out=self.is_timed and not guess.strip(),
+            time_taken=time_taken, hints_used=self._hints_used)
+        self._answer = None
+        if self.is_over:
+            self._log_event(
+                "game_end", score=self.score,
+                num_of_questions_asked=self._num_of_questions_asked)
+        return is_correct
+
+    def get_hint(self) -> str:
+        """Gets the next hint for the current question.
+
+        Returns
+        -------
+        str
+            The hint.
+        """
+        hint = HintService.get_next_hint(self._answer.value, self._hints_used)
+        self._hints_used += 1
+        self._log_event(
+            "hint_used", question=self._num_of_questions_asked,
+            hint_number=self._hints_used, hint=hint)
+        return hint
+
+    def save_translations(self) -> str:
+        """Saves the translations made during a game with file input.
+
+        Each translation has already been written as it was made, so this
+        only moves them to the output file, leaving the file that was read
+        from as it was.
+
+        Returns
+        -------
+        str
+            The path of the file the translations were saved to.
+        """
+        self._translation_writer.save()
+        return self._translation_writer.output_path
+
+    def close(self):
+        """Closes the file the game's translations are written to, if any.
+
+        Should be called once the game is over or stopped. If the
+        translations haven't been saved, those made so far are left in the
+        partial file.
+        """
+        if self._translation_writer is not None:
+            self._translation_writer.close()
+            self._translation_writer = None
+
+    def record_timing(self, stage: str, seconds: float):
+        """Records how long a stage of the current question took.
+
+        Parameters
+        ----------
+        stage
+            The stage, such as 'generation' or 'think_time'.
+        seconds
+            The number of seconds the stage took.
+        """
+        MetricsService.record(
+            stage, seconds, Difficulty(self._difficulty_level).name,
+            InputMode(self._input_mode).name, self._target_language.name)
+
+    def is_viable_for_translation(self, user_input: str) -> bool:
+        """Checks if input is viable for translation.
+
+        Ensures that input adheres to the character limit for the game's
+        difficulty level in order for the chosen API's character limit to not
+        be exceeded.
+        .. A detailed explanation can be found in the project's README:
+            https://github.com/DebzDK/guess-the-language#features
+
+        Parameters
+        ----------
+        user_input
+            The input given by a user.
+
+        Returns
+        ----------
+        bool
+            True if user input is viable for translation, otherwise False
+        """
+        return SentenceFileHelper.is_viable_for_translation(
+            user_input, self.char_limit)
+
+    @staticmethod
+    def is_valid_answer(user_input: str) -> bool:
+        """Checks if input is a valid answer.
+
+        Ensures that the user input isn't an empty string and that it's at
+        least 2 characters, in case the use has entered a code representing
+        a language.
+
+        Parameters
+        ----------
+        user_input
+            The input given by a user.
+
+        Returns
+        -------
+        bool
+            True if user input is not an empty string, otherwise False.
+        """
+        user_input = user_input.strip()
+        return bool(user_input) and len(user_input) > 1
+
+    def _set_translation(self, translation: Translation):
+        """Sets the translation for the current question.
+
+        Once translated, the question counts as asked and waits for an
+        answer, unless the translation failed.
+
+        Parameters
+        ----------
+        translation
+            The translation.
+        """
+        self._translation = translation
+        if self.has_error:
+            self._log_event(
+                "error", question=self._num_of_questions_asked + 1,
+                message=str(translation).strip())
+            if self._translation_writer is not None:
+                self._translation_writer.close()
+            return
+
+        self._log_event(
+            "translation", question=self._num_of_questions_asked + 1,
+            target_language=translation.lang.name,
+            translation=str(translation))
+
+        if self._input_mode == InputMode.FILE.value:
+            self._write_translation(translation)
+        self._num_of_questions_asked += 1
+        self._answer = translation.lang
+
+    def _write_translation(self, translation: Translation):
+        """Writes the current question's translation to the partial file.
+
+        Adds an appropriate note if the sentence from the file had to be
+        replaced with an auto-generated one.
+
+        Parameters
+        ----------
+        translation
+            The translation.
+        """
+        original_sentence, was_viable = (
+            self._file_sentences[self._num_of_questions_asked])
+        note = None
+        if not was_viable:
+            note = (
+                f"Original sentence: {original_sentence}\n"
+                "Note: Exceeded character limit for"
+                f" {Difficulty(self._difficulty_level).name} level"
+                f" ({self.char_limit} chars)"
+                " so was replaced with an auto-generated sentence.")
+        self._translation_writer.write_translation(
+            self._sentence, translation, note)
+
+    def _log_question_start(self, source: str):
+        """Logs the start of the current question.
+
+        Parameters
+        ----------
+        source
+            Where the sentence came from: 'user', 'file', 'generated',
+            'generated_for_file' or 'generated_with_translation'.
+        """
+        self._log_event(
+            "question_start", question=self._num_of_questions_asked + 1,
+            target_language=self._target_language.name,
+            sentence_source=source, sentence=self._sentence)
+
+    def _log_event(self, event: str, **fields):
+        """Logs an event for the game.
+
+        Parameters
+        ----------
+        event
+            The name of the event.
+        fields
+            The event's details.
+        """
+        EventLogService.log_event(self._game_id, event, **fields)
+
+    def _iter_file_sentences(
+            self, lines: Iterator[str]) -> Iterator[Tuple[str, bool]]:
+        """Yields the sentences from a file paired with their viability.
+
+        Parameters
+        ----------
+        lines
+            The lines of the file.
+
+        Returns
+        -------
+        Iterator[Tuple[str, bool]]
+            Each sentence paired with whether or not it's viable for
+            translation.
+        """
+        for sentence in SentenceFileHelper.iter_sentences(lines):
+            yield sentence, self.is_viable_for_translation(sentence)
+
+    def _can_generate_translation_locally(
+            self, target_language: Language) -> bool:
+        """Checks if a sentence and its translation can be generated locally.
+
+        Sentences are only translated locally when auto-generating them with
+        the rule-based engine, since that uses the same dictionary.
+
+        Parameters
+        ----------
+        target_language
+            The language the sentence will be translated into.
+
+        Returns
+        -------
+        bool
+            True if no translation request is needed, otherwise False.
+        """
+        return (self._input_mode == InputMode.AUTO.value and
+                self._sentence_engine == SentenceEngine.RULES.value and
+                GameDictionary.has_vocabulary_for(target_language))
+
+    def _generate_sentence(self) -> str:
+        """Generates a sentence using the chosen sentence engine.
+
+        Returns
+        -------
+        str
+            The generated sentence, within the character limit for the game's
+            difficulty level.
+        """
+        if self._sentence_engine == SentenceEngine.NGRAM.value:
+            return NGramSentenceGenerator.get_default().generate_sentence(
+                self.char_limit, self._difficulty_level)
+        return str(SentenceGenerator.generate_sentence(
+            self.char_limit, self._difficulty_level))
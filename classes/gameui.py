@@ -0,0 +1,999 @@
+"""Class for displaying the game in a terminal.
+
+Note
+----
+* # region comments are present to better separate code by their
+concerns in order to navigate through the code.
+"""
+import asyncio
+import time
+from functools import lru_cache
+from itertools import groupby
+from typing import Any, Awaitable, Callable, List, Union
+from prompt_toolkit.application import Application
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.data_structures import Point
+from prompt_toolkit.filters import Condition
+from prompt_toolkit.formatted_text import (
+    ANSI, StyleAndTextTuples, to_formatted_text)
+from prompt_toolkit.keys import Keys
+from prompt_toolkit.key_binding import KeyBindings, KeyPressEvent
+from prompt_toolkit.completion import (
+    Completer, DynamicCompleter, WordCompleter)
+from prompt_toolkit.layout import Layout
+from prompt_toolkit.layout.containers import (
+    ConditionalContainer, Float, FloatContainer, HSplit, Window)
+from prompt_toolkit.layout.controls import (
+    BufferControl, FormattedTextControl)
+from prompt_toolkit.layout.menus import CompletionsMenu
+from prompt_toolkit.layout.processors import BeforeInput
+from prompt_toolkit.styles import Style
+from classes.translation import Translation
+from classes.enums.difficulty import Difficulty
+from classes.enums.inputmode import InputMode
+from classes.enums.language import Language
+from classes.enums.sentenceengine import SentenceEngine
+from classes.helpers.menuhelper import MenuHelper
+from classes.gamesession import GameSession
+from classes.keypresstracer import KeyPressTracer
+from classes.sessionprofiler import SessionProfiler
+
+# region Constants
+ALL_LANGUAGES = [lang.get_user_friendly_name() for lang in Language]
+MAIN_MENU_OPTIONS = ["PLAY", "GAME OPTIONS", "QUIT"]
+GAME_OPTIONS = [
+    "Input mode",
+    "Difficulty",
+    "Enable hints",
+    "Sentence engine",
+    "Return to main menu"
+]
+COUNTDOWN_REFRESH_INTERVAL = 0.1
+# ..Found thanks to StackOverflow:
+#   https://stackoverflow.com/questions/287871/how-to-print-colored-text-to-the-terminal
+UNICODES = {
+    "green": "\u001b[32;1m",
+    "red": "\u001b[31;1m",
+    "white-bg": "\u001b[30;47m",
+    "underline": "\u001b[4m",
+    "reset": "\u001b[37;0m"
+}
+STYLE = Style.from_dict({"selected-option": "fg:black bg:white"})
+INPUT_PROMPT = "> "
+TITLE = """
+////////////////////////////////////////////////////////////////////////////////
+////////////////////////////////////////////////////////////////////////////////
+ ________   __  __   _______   ______   ______
+|  ______| | |  | | |  ___  | |  ____| |  ____|
+| |  ____  | |  | | | |___| | | |____  | |____
+| | |___ | | |  | | |  _____| |____  | |____  |
+| |____| | | |__| | | |_____   ____| |  ____| |
+|________| |______| |_______| |______| |______|
+ _______   __  __   _______
+|__   __| | |  | | |  ___  |
+   | |    | |__| | | |___| |
+   | |    |  __  | |  _____|
+   | |    | |  | | | |_____
+   |_|    |_|  |_| |_______|
+ _       _______   ______   ________   __  __   _______   ________   _______
+| |     |  ___  | |  __  | |  ______| | |  | | |  ___  | |  ______| |  ___  |
+| |     | |   | | | |  | | | |  ____  | |  | | | |   | | | |  ____  | |___| |
+| |     | |___| | | |  | | | | |___ | | |  | | | |___| | | | |___ | |  _____|
+| |___  |   _   | | |  | | | |____| | | |__| | |   _   | | |____| | | |_____
+|_____| |__| |__| |_|  |_| |________| |______| |__| |__| |________| |_______|
+
+////////////////////////////////////////////////////////////////////////////////
+////////////////////////////////////////////////////////////////////////////////
+"""
+# print() ended the title with a new line, which is kept for the layout
+TITLE_FRAGMENTS = [("", TITLE + "\n")]
+TITLE_LINE_COUNT = TITLE.count("\n") + 1
+# endregion
+
+
+@lru_cache(maxsize=None)
+def get_language_completer() -> WordCompleter:
+    """Gets the completer for language names, creating it on first use.
+
+    Returns
+    -------
+    WordCompleter
+        The completer used when the user guesses a language.
+    """
+    return WordCompleter(ALL_LANGUAGES, ignore_case=True)
+
+
+@lru_cache(maxsize=None)
+def get_flag(country_code: str) -> str:
+    """Gets the flag emoji for a country code, importing flag on first use.
+
+    Parameters
+    ----------
+    country_code
+        The two-letter code of the country.
+
+    Returns
+    -------
+    str
+        The country's flag.
+    """
+    import flag
+    return flag.flag(country_code)
+
+
+class GameUI():
+    """Class for displaying the game in a terminal.
+
+    A thin adapter between a prompt-toolkit application and a GameSession,
+    holding only what's needed to display the menus and the game. Each
+    instance has its own application, so a separate instance can be used for
+    each connected user.
+
+    Attributes
+    ----------
+    _input_mode : int
+        The input mode for the next game.
+    _difficulty_level : int
+        The difficulty level for the next game.
+    _enable_hints : bool
+        True if hints are enabled for the next game, otherwise False.
+    _sentence_engine : int
+        The sentence engine for the next game.
+    _session : GameSession
+        The game being played, or None if no game has been played yet.
+    _viewing_main_menu : bool
+        True if the main menu is being viewed, otherwise False.
+    _viewing_game_options_menu : bool
+        True if the game options menu is being viewed, otherwise False.
+    _viewing_end_screen : bool
+        True if the end of a game is being viewed, otherwise False.
+    _is_playing_game : bool
+        True if a game is being played, otherwise False.
+    _selected_main_menu_option_index : int
+        The index of the selected main menu option.
+    _selected_game_option_index : int
+        The index of the selected game option.
+    _transcript : StyleAndTextTuples
+        The game's text below the title, as shown while playing.
+    _transcript_line_count : int
+        The number of lines in the transcript.
+    _pending_input : asyncio.Future
+        The future for the input being waited on, if any.
+    _input_completer : Completer
+        The completer to use for the input being waited on.
+    _answer_deadline : float
+        The monotonic clock time the current answer must be given by, if any.
+    _input_buffer : Buffer
+        The buffer the user types input into.
+    _key_bindings : KeyBindings
+        The key bindings for the whole application.
+    _app : Application
+        The application, once created.
+    _render_started_at : float
+        The performance counter time the current redraw started at.
+
+    Methods
+    -------
+    create_application() -> Application:
+        Creates the application that displays the whole game.
+    """
+
+    def __init__(self):
+        """Initialises the object with the default game options."""
+        self._input_mode = InputMode.USER.value
+        self._difficulty_level = Difficulty.EASY.value
+        self._enable_hints = True
+        self._sentence_engine = SentenceEngine.RULES.value
+        self._session = None
+
+        self._viewing_main_menu = True
+        self._viewing_game_options_menu = False
+        self._viewing_end_screen = False
+        self._is_playing_game = False
+        self._selected_main_menu_option_index = 0
+        self._selected_game_option_index = 0
+
+        self._transcript = []
+        self._transcript_line_count = 0
+        self._pending_input = None
+        self._input_completer = None
+        self._answer_deadline = None
+
+        self._input_buffer = Buffer(
+            completer=DynamicCompleter(lambda: self._input_completer),
+            complete_while_typing=True,
+            multiline=False,
+            read_only=Condition(lambda: self._pending_input is None),
+            accept_handler=self.accept_input)
+        self._key_bindings = self._create_key_bindings()
+        self._app = None
+        self._render_started_at = 0.0
+
+    # region Display methods
+    def display_message(self, text: str = ""):
+        """Displays a message below the title.
+
+        Messages are added to the game's transcript in the same way print()
+        would add them to the terminal, including any ANSI escape codes.
+
+        Parameters
+        ----------
+        text
+            The message to display.
+        """
+        # Messages are separated rather than followed by new lines so that
+        # the last line of the transcript sits directly above the input
+        if self._transcript:
+            self._transcript.append(("", "\n"))
+        if "\u001b" in text:
+            # Merge the single character fragments made by ANSI to keep
+            # rendering the transcript cheap
+            self._transcript.extend(
+                (style, "".join(fragment[1] for fragment in fragments))
+                for style, fragments in groupby(
+                    to_formatted_text(ANSI(text)), key=lambda f: f[0]))
+        else:
+            self._transcript.append(("", text))
+        self._transcript_line_count += text.count("\n") + 1
+        self._invalidate()
+
+    def display_main_menu(self):
+        """Displays main manu options."""
+        self._viewing_main_menu = True
+        self._viewing_game_options_menu = False
+        self._invalidate()
+
+    def display_hint(self):
+        """Displays a hint for the answer to the current question."""
+        self.display_message(f"Hint: {self._session.get_hint()}")
+
+    def display_time_up_message(self):
+        """Displays time up message."""
+        self.display_message("\nTime's up!")
+
+    def display_error_message(
+            self, error: Union[Translation, str],
+            can_try_again: bool = False):
+        """Displays an informative error message.
+
+        Parameters
+        ----------
+        error
+            The error in the form of a Translation object or a message.
+        can_try_again
+            True if the user will be asked again straight away, otherwise
+            False if the game is ending.
+        """
+        if can_try_again:
+            self.display_message(f"{error}\nPlease try again.")
+            return
+        self.display_message(
+            f"{error}\n"
+            "You will now be returned to the main menu..."
+            "If it's a connection or HTTP issue, please try again."
+            "\nOtherwise, please contact the developer to report a "
+            "potential bug.\n"
+        )
+
+    def display_end_of_game_message(
+            self, num_of_correct_answers: int, num_of_questions_asked: int,
+            times_taken: List[float] = None):
+        """Displays a message to signal the end of the game.
+
+        Prints out how many questions the user answered correctly along with
+        an encouraging statement and, if any questions were answered, the
+        average time taken to answer.
+
+        Parameters
+        ----------
+        num_of_correct_answers
+            The number of questions the user answered correctly.
+        num_of_questions_asked
+            The number of questions asked during the game.
+        times_taken
+            The number of seconds taken to answer each question.
+        """
+        extra_text = ""
+        if num_of_correct_answers < (num_of_questions_asked / 2):
+            extra_text = "..\nBetter luck next time"
+        elif num_of_correct_answers == num_of_questions_asked:
+            extra_text = "\nPerfect score"
+        else:
+            extra_text = "\nWell done"
+
+        self.display_message(
+            f"\nYou guessed {num_of_correct_answers}/{num_of_questions_asked}"
+            f" languages correctly.{extra_text}!\n"
+        )
+        if times_taken:
+            average_time = sum(times_taken) / len(times_taken)
+            self.display_message(
+                f"Average time to answer: {average_time:.1f}s\n")
+
+    def get_toolbar_text(self) -> str:
+        """Gets toolbar text.
+
+        Displays the appropriate text depending on what the user is currently
+        viewing, i.e. the main menu, the game options menu, or the game.
+
+        Returns
+        -------
+        str
+            The string that will display in the bottom toolbar, or an empty
+            string if the toolbar should be hidden.
+        """
+        menu_default_text = (
+            "Press the UP and DOWN arrow keys to navigate the menu")
+
+        if self._viewing_game_options_menu:
+            return f"{menu_default_text}\nPress ENTER to toggle a game option"
+        if self._is_playing_game and self._answer_deadline is not None:
+            # Hints aren't available when answers are timed (BEAST level)
+            time_left = max(self._answer_deadline - time.monotonic(), 0)
+            return (
+                f"Time left to answer: {time_left:.1f}s\n"
+                "Press CTRL+C at any time to quit the game"
+            )
+        if self._is_playing_game:
+            return (
+                "Press CTRL+H for hints (if enabled)\n"
+                "Press CTRL+C at any time to quit the game"
+            )
+        if self._viewing_end_screen:
+            return ""
+        return menu_default_text
+
+    def get_screen_text(self) -> StyleAndTextTuples:
+        """Gets the text to display above the input and toolbar.
+
+        Returns
+        -------
+        StyleAndTextTuples
+            The title followed by the menu being viewed or, during a game,
+            the game's transcript.
+        """
+        if self._viewing_main_menu:
+            return TITLE_FRAGMENTS + list(MenuHelper.get_menu_lines(
+                MAIN_MENU_OPTIONS, self._selected_main_menu_option_index))
+        if self._viewing_game_options_menu:
+            # The last option returns to the main menu so has no description
+            descriptions = [
+                self.get_game_option_description(i)
+                for i in range(len(GAME_OPTIONS) - 1)
+            ] + [None]
+            return TITLE_FRAGMENTS + list(MenuHelper.get_menu_lines(
+                GAME_OPTIONS, self._selected_game_option_index,
+                descriptions))
+        return TITLE_FRAGMENTS + self._transcript
+
+    def get_screen_cursor_position(self) -> Point:
+        """Gets the position to keep in view when the screen text is scrolled.
+
+        Returns
+        -------
+        Point
+            The position of the selected menu option or, during a game, the
+            end of the game's transcript.
+        """
+        if self._viewing_main_menu:
+            return Point(
+                0, TITLE_LINE_COUNT + self._selected_main_menu_option_index)
+        if self._viewing_game_options_menu:
+            return Point(
+                0, TITLE_LINE_COUNT + self._selected_game_option_index)
+        return Point(
+            0, TITLE_LINE_COUNT + max(self._transcript_line_count - 1, 0))
+
+    def clear_terminal(self):
+        """Clears the game's transcript so only the title is displayed."""
+        self._transcript.clear()
+        self._transcript_line_count = 0
+        self._invalidate()
+
+    def select_next_main_menu_option(self):
+        """Selects the next main menu option.
+
+        Updates the terminal to show the next menu option as the one
+        that's selected.
+        """
+        if self._selected_main_menu_option_index < len(MAIN_MENU_OPTIONS) - 1:
+            self._selected_main_menu_option_index += 1
+        self.display_main_menu()
+
+    def select_previous_main_menu_option(self):
+        """Selects the previous main menu option.
+
+        Updates the terminal to show the previous menu option as the one
+        that's selected.
+        """
+        if self._selected_main_menu_option_index > 0:
+            self._selected_main_menu_option_index -= 1
+        self.display_main_menu()
+
+    def process_main_menu_selection(self):
+        """Processes the main menu option based on user selection.
+
+        Checks if the key pressed corresponds to a main menu option and
+        processes accordingly, starting the game as a task on the
+        application's event loop if the user has chosen to play.
+        """
+        if self._selected_main_menu_option_index == 0:
+            self.clear_terminal()
+            self._viewing_main_menu = False
+            self._is_playing_game = True
+            self._app.create_background_task(self.run_game())
+        elif self._selected_main_menu_option_index == 1:
+            self.clear_terminal()
+            self._viewing_main_menu = False
+            self.display_game_options_menu()
+        elif self._selected_main_menu_option_index == 2:
+            self.quit_game()
+
+    def display_game_options_menu(self):
+        """Displays game menu options."""
+        self._viewing_game_options_menu = True
+        self._invalidate()
+
+    def get_game_option_description(self, index: int) -> str:
+        """Gets the description for the currently selected game option.
+
+        Parameters
+        ----------
+        index
+            The index of the game option.
+
+        Returns
+        -------
+        str
+            The game options's description.
+        """
+        if index == 0:
+            return InputMode.get_description(self._input_mode)
+
+        if index == 1:
+            return (
+                Difficulty.get_description(self._difficulty_level) +
+                " (" + Difficulty(self._difficulty_level).name + ")")
+
+        if index == 2:
+            hint_message = str(self._enable_hints)
+            if self._difficulty_level == 3 and self._enable_hints:
+                hint_message += " (Ignored - No hints for BEAST level)"
+            return hint_message
+
+        if index == 3:
+            return SentenceEngine.get_description(self._sentence_engine)
+        return ""
+
+    def select_next_game_option(self):
+        """Selects the next game menu option.
+
+        Updates the terminal to show the next menu option as the one
+        that's selected.
+        """
+        if self._selected_game_option_index == len(GAME_OPTIONS) - 1:
+            return
+
+        self._selected_game_option_index += 1
+        self.display_game_options_menu()
+
+    def select_previous_game_option(self):
+        """Selects the previous game option.
+
+        Updates the terminal to show the previous game option as the one
+        that's selected.
+        """
+        if self._selected_game_option_index == 0:
+            return
+
+        self._selected_game_option_index -= 1
+        self.display_game_options_menu()
+
+    def process_game_option_selection(self):
+        """Toggles the game option based on user input and current settings.
+
+        Checks if user input corresponds to a game option and processes
+        accordingly.
+        """
+        index = self._selected_game_option_index
+        if index == 0:
+            self._input_mode = (
+                self._input_mode + 1 if self._input_mode < 3 else 1)
+        elif index == 1:
+            self._difficulty_level = (
+                self._difficulty_level + 1
+                if self._difficulty_level < 3 else 0)
+        elif index == 2:
+            self._enable_hints = not self._enable_hints
+        elif index == 3:
+            self._sentence_engine = (
+                self._sentence_engine + 1 if self._sentence_engine < 2 else 1)
+
+        if index == 4:
+            self.display_main_menu()
+        else:
+            self.display_game_options_menu()
+    # endregion
+
+    # region Gameplay methods
+    def end_prompt(self):
+        """Ends prompt for user input.
+
+        Ends the prompt with no input once the time to answer has run out.
+        """
+        if self._pending_input is None:
+            return
+
+        if self._session.is_timed:
+            self.display_time_up_message()
+
+        self._input_buffer.reset()
+        self.resolve_pending_input("")
+
+    async def end_prompt_at(self, deadline: float):
+        """Ends prompt for user input once a deadline has passed.
+
+        Refreshes the countdown in the toolbar until then. Runs as a task on
+        the event loop, which is cancelled if the user answers in time.
+
+        Parameters
+        ----------
+        deadline
+            The monotonic clock time to end the prompt at.
+        """
+        while True:
+            time_left = deadline - time.monotonic()
+            if time_left <= 0:
+                break
+            self._invalidate()
+            await asyncio.sleep(min(time_left, COUNTDOWN_REFRESH_INTERVAL))
+        self.end_prompt()
+
+    def resolve_pending_input(self, user_input: str):
+        """Passes user input to the code waiting for it.
+
+        Parameters
+        ----------
+        user_input
+            The value the user provided as input.
+        """
+        if (self._pending_input is not None and
+                not self._pending_input.done()):
+            self._pending_input.set_result(user_input)
+        self._pending_input = None
+        self._invalidate()
+
+    def accept_input(self, buffer: Buffer) -> bool:
+        """Accepts the input typed in by the user when ENTER is pressed.
+
+        Parameters
+        ----------
+        buffer
+            The buffer holding the input.
+
+        Returns
+        -------
+        bool
+            False so that the buffer is cleared for the next input.
+        """
+        self.display_message(f"{INPUT_PROMPT}{buffer.text}")
+        self.resolve_pending_input(buffer.text)
+        return False
+
+    def get_user_input(
+            self, prompt: str, completer: Completer = None) -> Awaitable[str]:
+        """Waits for the user to enter input.
+
+        Parameters
+        ----------
+        prompt
+            The text to display to the user to indicate the desired type of
+            input.
+        completer
+            The class holding the list of all values to use as autocomplete
+            suggestions for the user.
+
+        Returns
+        -------
+        Awaitable[str]
+            A future for the value the user provides as input.
+        """
+        if prompt:
+            self.display_message(prompt.rstrip("\n"))
+        self._input_completer = completer
+        self._pending_input = asyncio.get_running_loop().create_future()
+        self._invalidate()
+        return self._pending_input
+
+    async def get_processed_user_input(
+            self, prompt: str, process: Callable[[str], Any],
+            completer: WordCompleter = None,
+            set_timer: bool = False) -> str:
+        """Prompts user for input, process input if required and return the
+        input.
+
+        Continuously waits for user input and executes functions based on
+        input as required until it can be returned.
+
+        Parameters
+        ----------
+        prompt
+            The text to display to the user to indicate the desired type of
+            input.
+        process
+            The function to call process user input.
+        completer
+            The class holding the list of all values to use as autocomplete
+            suggestions for the user.
+        set_timer
+            True if playing with BEAST level difficulty, otherwise
+            False by default.
+
+        Returns
+        -------
+            str
+                A string value if user input passes processing, otherwise an
+                empty string if the input loop should be exited and return
+                nothing.
+        """
+        user_input = ""
+        countdown = None
+        while True:
+            if set_timer:
+                self.display_message(
+                    f"You have {GameSession.ANSWER_TIME_LIMIT:g} seconds to"
+                    " answer: ")
+                self._answer_deadline = (
+                    time.monotonic() + GameSession.ANSWER_TIME_LIMIT)
+                countdown = self._app.create_background_task(
+                    self.end_prompt_at(self._answer_deadline))
+
+            try:
+                user_input = await self.get_user_input(prompt, completer)
+            finally:
+                # Also cancelled if the game is quit while waiting for input
+                self._answer_deadline = None
+                if countdown:
+                    countdown.cancel()
+
+            if process is not None:
+                end_loop = process(user_input)
+                if end_loop or set_timer:
+                    return user_input
+            else:
+                return user_input
+
+    def ask_question(self):
+        """Displays the question."""
+        self.display_message("What language is this?")
+
+    async def get_user_answer(self) -> str:
+        """Gets the answer from the user.
+
+        Returns
+        -------
+        str
+            The value that the user has provided as the answer.
+        """
+        guess = await self.get_processed_user_input(
+            "", GameSession.is_valid_answer, get_language_completer(),
+            self._session.is_timed)
+        return guess
+
+    def end_question(self, guess: str, answer: Language, is_correct: bool):
+        """Ends question by printing a statemtn to inform the user as to
+        whether they were right or not.
+
+        Parameters
+        ----------
+        guess
+            The value the user provided as input.
+        answer
+            The correct answer.
+        is_correct
+            True if the guess was correct, otherwise False.
+        """
+        if is_correct:
+            result_indicator = UNICODES['green']
+        else:
+            result_indicator = UNICODES['red']
+
+        guess_statement = ""
+        answer_statement = ""
+
+        if guess:
+            guess_statement = f"\nYou guessed{result_indicator} {guess}"
+            answer_statement = f"{UNICODES['reset']} and the answer is"
+        else:
+            answer_statement = "The answer is"
+
+        self.display_message(
+            f"{guess_statement}{answer_statement}"
+            f"{UNICODES['green']} {answer.get_user_friendly_name()}"
+            f" ({get_flag(answer.get_language_abbreviation())})"
+            f"{UNICODES['reset']}."
+        )
+
+    async def read_from_file(self):
+        """Prompts the user for a file and reads the game's sentences from it.
+
+        Keeps prompting until a readable file with sentences in it is
+        given.
+        """
+        self.display_message((
+            "\nSince you've chosen to play with file input,"
+            " please make sure that each sentence\n in your file"
+            " is on a new line.\n"))
+
+        while True:
+            path_or_filename = await self.get_processed_user_input(
+                "\nEnter the name or path of the file you wish to read from: ",
+                None)
+            try:
+                # Large files are indexed the first time they're loaded,
+                # which reads the whole file, so it's done on another thread
+                if await asyncio.get_running_loop().run_in_executor(
+                        None, self._session.load_file, path_or_filename):
+                    return
+            except FileNotFoundError:
+                self.display_message(
+                    "\nUh oh... Looks like that file doesn't exist.")
+            except (OSError, UnicodeDecodeError) as error:
+                self.display_error_message(
+                    "\nUh oh... Looks like that file can't be read.\n"
+                    f"Error: {error}", can_try_again=True)
+
+    def save_translations(self):
+        """Saves the game's translations to their own file."""
+        self.display_message("\nSaving translations to file...")
+        output_path = self._session.save_translations()
+        self.display_message(f"All done! They can be found in {output_path}\n")
+
+    async def get_sentence_from_user(self) -> str:
+        """Prompts the user for a sentence to translate.
+
+        Returns
+        -------
+        str
+            The sentence for translation.
+        """
+        return await self.get_processed_user_input(
+            (
+                "Enter a sentence"
+                f" (no longer than {self._session.char_limit} characters"
+                " long and has more than one word):\n"
+            ),
+            self._session.is_viable_for_translation
+        )
+
+    async def run_game(self):
+        """Runs the game loop.
+
+        Runs as a task on the application's event loop, waiting for input
+        without blocking key presses or redrawing. The game is profiled if
+        profiling has been enabled with the PROFILE environment variable.
+        Any unexpected error is displayed and ends the game, rather than
+        the task. The session is closed however the game ends.
+        """
+        session = GameSession(
+            self._input_mode, self._difficulty_level, self._enable_hints,
+            self._sentence_engine)
+        self._session = session
+
+        profiler = SessionProfiler()
+        profiler.start()
+        try:
+            if session.needs_file:
+                await self.read_from_file()
+
+            while not session.is_over:
+                self.display_message(
+                    f"\n{UNICODES['underline']}"
+                    f"Question {session.num_of_questions_asked + 1}"
+                    f"{UNICODES['reset']}\n"
+                )
+
+                user_sentence = None
+                if session.needs_sentence_from_user:
+                    user_sentence = await self.get_sentence_from_user()
+                with profiler.step("generation"):
+                    sentence_to_translate = session.next_question(
+                        user_sentence)
+
+                if not session.needs_sentence_from_user:
+                    self.display_message(sentence_to_translate)
+
+                translation = session.translation
+                if translation is None:
+                    # Translation requests block so are made on another thread
+                    with profiler.step("translation"):
+                        translation = (
+                            await asyncio.get_running_loop().run_in_executor(
+                                None, session.translate))
+
+                if session.has_error:
+                    self.display_error_message(translation)
+                    self.end_game()
+                    return
+
+                self.display_message(f"\nTranslation: {translation}\n")
+                self.ask_question()
+                asked_at = time.monotonic()
+                guess = await self.get_user_answer()
+                is_correct = session.submit_answer(
+                    guess, time.monotonic() - asked_at)
+                self.end_question(guess, translation.lang, is_correct)
+
+            self.display_end_of_game_message(
+                session.score, session.num_of_questions_asked,
+                session.answer_times)
+
+            if session.input_mode == InputMode.FILE.value:
+                self.save_translations()
+
+            self.end_game()
+        except Exception as error:
+            # The game runs as a background task, so anything unexpected
+            # would otherwise end it silently and leave the user stuck
+            self.display_error_message(
+                "\nUh oh... We encountered the following issue:\n"
+                f"Error: {error}")
+            self.end_game()
+        finally:
+            # Also reached if the game is quit or its task cancelled
+            # part-way through
+            session.close()
+            profiler.stop()
+
+    def end_game(self):
+        """Ends the game.
+
+        Any key press afterwards returns the user to the main menu.
+        """
+        self.display_message("Press any key to return to the main menu")
+        self._is_playing_game = False
+        self._viewing_end_screen = True
+        self._invalidate()
+
+    def quit_game(self):
+        """Quits the game by exiting the application."""
+        self._app.exit()
+    # endregion
+
+    # region Key press listeners
+    def _create_key_bindings(self) -> KeyBindings:
+        """Creates the key bindings for the whole application.
+
+        ..As described in prompt-toolkit documentation:
+            https://python-prompt-toolkit.readthedocs.io/en/master/pages/advanced_topics/key_bindings.html
+
+        Returns
+        -------
+        KeyBindings
+            The key bindings, each only active when its condition is met.
+        """
+        key_bindings = KeyBindings()
+        can_navigate_menu = Condition(
+            lambda: self._viewing_main_menu or self._viewing_game_options_menu)
+        can_return_to_main_menu = Condition(lambda: self._viewing_end_screen)
+        can_get_hint = Condition(
+            lambda: self._is_playing_game and self._session.can_get_hint)
+
+        # All keys except enter and arrows
+        @key_bindings.add(Keys.Any, filter=can_navigate_menu)
+        @key_bindings.add(Keys.Any, filter=can_return_to_main_menu)
+        @key_bindings.add("enter", filter=can_return_to_main_menu)
+        def _(event: KeyPressEvent):
+            """Clears terminal on any key press and display main menu."""
+            self._viewing_end_screen = False
+            self.clear_terminal()
+            self.display_main_menu()
+
+        @key_bindings.add("up", filter=can_navigate_menu)
+        def _(event: KeyPressEvent):
+            """Cycles up through menu options."""
+            if self._viewing_main_menu:
+                self.select_previous_main_menu_option()
+            elif self._viewing_game_options_menu:
+                self.select_previous_game_option()
+
+        @key_bindings.add("down", filter=can_navigate_menu)
+        def _(event: KeyPressEvent):
+            """Cycles down through menu options."""
+            if self._viewing_main_menu:
+                self.select_next_main_menu_option()
+            elif self._viewing_game_options_menu:
+                self.select_next_game_option()
+
+        @key_bindings.add("enter", filter=can_navigate_menu)
+        def _(event: KeyPressEvent):
+            """Processes the selected menu option."""
+            if self._viewing_main_menu:
+                self.process_main_menu_selection()
+            elif self._viewing_game_options_menu:
+                self.process_game_option_selection()
+
+        @key_bindings.add("c-c")
+        def _(event: KeyPressEvent):
+            """Quits the game."""
+            self.quit_game()
+
+        @key_bindings.add("c-h", filter=can_get_hint)
+        def _(event: KeyPressEvent):
+            """Gets the next hint for language."""
+            self.display_hint()
+
+        return key_bindings
+    # endregion
+
+    # region Layout
+    def create_application(self) -> Application:
+        """Creates the application that displays the whole game.
+
+        The application is created once and its views are swapped as the
+        user moves between the menus and the game, so nothing needs to be set
+        up again for each prompt. Its key presses are traced if
+        KEYPRESS_TRACE_FILE is set.
+
+        Returns
+        -------
+        Application
+            The full-screen application.
+        """
+        screen_window = Window(
+            FormattedTextControl(
+                self.get_screen_text,
+                get_cursor_position=self.get_screen_cursor_position),
+            wrap_lines=True)
+        input_window = Window(
+            BufferControl(self._input_buffer, input_processors=[
+                BeforeInput(INPUT_PROMPT)]),
+            height=1)
+        toolbar_window = Window(
+            FormattedTextControl(self.get_toolbar_text),
+            style="class:bottom-toolbar",
+            dont_extend_height=True)
+
+        root_container = FloatContainer(
+            content=HSplit([
+                screen_window,
+                ConditionalContainer(
+                    input_window,
+                    filter=Condition(lambda: self._pending_input is not None)),
+                ConditionalContainer(
+                    toolbar_window,
+                    filter=Condition(lambda: bool(self.get_toolbar_text())))
+            ]),
+            floats=[
+                Float(
+                    xcursor=True, ycursor=True,
+                    content=CompletionsMenu(max_height=8, scroll_offset=1))
+            ])
+
+        self._app = Application(
+            layout=Layout(root_container, focused_element=input_window),
+            key_bindings=self._key_bindings,
+            style=STYLE,
+            full_screen=True)
+        self._app.before_render += self._start_render_timing
+        self._app.after_render += self._record_render_timing
+        if KeyPressTracer.is_enabled():
+            KeyPressTracer(self._app).attach(self._key_bindings)
+        return self._app
+
+    def _invalidate(self):
+        """Redraws the application, if it has been created."""
+        if self._app is not None:
+            self._app.invalidate()
+
+    def _start_render_timing(self, _: Application):
+        """Notes the time a redraw started at."""
+        self._render_started_at = time.perf_counter()
+
+    def _record_render_timing(self, _: Application):
+        """Records how long a redraw took, if it was during a question."""
+        if (self._is_playing_game and self._session is not None and
+                self._session.target_language is not None):
+            self._session.record_timing(
+                "render", time.perf_counter() - self._render_started_at)
+    # endregion
@@ -0,0 +1,310 @@
+"""Plays games without a terminal, for batch runs and load generation.
+
+Usage
+-----
+To play 10 auto-generated games without the DeepL API, use:
+    python3 -m classes.headlessgame --input-mode AUTO --games 10 \\
+        --seed 1 --stub-translator
+
+which prints a JSON result for each game, one per line, with its
+questions, translations, languages, timings and score.
+"""
+from argparse import ArgumentParser
+from typing import Any, Dict, Iterable, List, Optional
+import itertools
+import json
+import random
+import sys
+import time
+from classes.gamesession import GameSession
+from classes.sentencegenerator import SentenceGenerator
+from classes.enums.difficulty import Difficulty
+from classes.enums.inputmode import InputMode
+from classes.enums.language import Language
+from classes.enums.sentenceengine import SentenceEngine
+from classes.services.metricsservice import MetricsService
+from classes.services.requestservice import RequestService
+from classes.services.stubdeeplservice import StubDeepLService
+
+ANSWER_STRATEGIES = ["correct", "wrong", "random"]
+
+
+class HeadlessGame():
+    """A class used to play a game without a terminal.
+
+    Plays through a GameSession in the same order as GameUI.run_game, with
+    each answer chosen by a strategy instead of typed by a user.
+
+    Attributes
+    ----------
+    _session : GameSession
+        The game being played.
+    _strategy : str
+        How answers are chosen: 'correct', 'wrong' or 'random'.
+    _hints_per_question : int
+        The number of hints to get before answering each question.
+    _think_time : float
+        The number of seconds to wait before answering each question.
+    _sentences : Iterator[str]
+        The sentences to enter when the game asks the user for one.
+    _file_path : str
+        The file to read sentences from, for games with file input.
+
+    Methods
+    -------
+    play() -> Dict[str, Any]:
+        Plays the whole game and returns its result.
+    choose_answer(answer: Language) -> str:
+        Chooses a guess for a question using the answer strategy.
+    """
+
+    def __init__(
+            self, session: GameSession, strategy: str = "correct",
+            hints_per_question: int = 0, think_time: float = 0.0,
+            sentences: Iterable[str] = None, file_path: str = None):
+        """Initialises the object with the passed parameters.
+
+        Parameters
+        ----------
+        session
+            The game to play.
+        strategy
+            How answers are chosen: 'correct', 'wrong' or 'random'.
+        hints_per_question
+            The number of hints to get before answering each question.
+        think_time
+            The number of seconds to wait before answering each question.
+        sentences
+            The sentences to enter when the game asks the user for one,
+            which are reused if there are fewer than the game's questions. If
+            None, sentences are auto-generated.
+        file_path
+            The file to read sentences from, for games with file input.
+        """
+        if strategy not in ANSWER_STRATEGIES:
+            raise ValueError(f"Unknown answer strategy: {strategy}")
+        self._session = session
+        self._strategy = strategy
+        self._hints_per_question = hints_per_question
+        self._think_time = think_time
+        self._sentences = itertools.cycle(sentences) if sentences else None
+        self._file_path = file_path
+
+    def play(self) -> Dict[str, Any]:
+        """Plays the whole game and returns its result.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The game's settings, questions, score and timings, and the error
+            that ended it early, if there was one.
+        """
+        session = self._session
+        result = {
+            "input_mode": InputMode(session.input_mode).name,
+            "difficulty": Difficulty(session.difficulty_level).name,
+            "questions": [],
+            "error": None
+        }
+        start = time.perf_counter()
+
+        try:
+            if session.needs_file:
+                session.load_file(self._file_path)
+
+            while not session.is_over:
+                user_sentence = None
+                if session.needs_sentence_from_user:
+                    user_sentence = self._get_sentence_from_user()
+                sentence = session.next_question(user_sentence)
+
+                translation = session.translation
+                translated_locally = translation is not None
+                translate_start = time.perf_counter()
+                if not translated_locally:
+                    translation = session.translate()
+                translate_time = time.perf_counter() - translate_start
+
+                if session.has_error:
+                    result["error"] = str(translation)
+                    break
+
+                hints = [session.get_hint()
+                         for _ in range(self._hints_per_question)
+                         if session.can_get_hint]
+                if self._think_time:
+                    time.sleep(self._think_time)
+                guess = self.choose_answer(translation.lang)
+                if (session.is_timed and
+                        self._think_time >= GameSession.ANSWER_TIME_LIMIT):
+                    guess = ""
+                is_correct = session.submit_answer(
+                    guess,
+                    min(self._think_time, GameSession.ANSWER_TIME_LIMIT)
+                    if session.is_timed else self._think_time)
+
+                result["questions"].append({
+                    "sentence": str(sentence),
+                    "translation": str(translation),
+                    "language": translation.lang.name,
+                    "guess": guess,
+                    "is_correct": is_correct,
+                    "hints": hints,
+                    "translated_locally": translated_locally,
+                    "translate_time": round(translate_time, 6)
+                })
+
+            result["output_path"] = None
+            if (session.input_mode == InputMode.FILE.value and
+                    result["error"] is None):
+                result["output_path"] = session.save_translations()
+        finally:
+            # Also reached if translating or loading the file fails
+            session.close()
+
+        result["score"] = session.score
+        result["num_of_questions_asked"] = session.num_of_questions_asked
+        result["answer_times"] = session.answer_times
+        result["duration"] = round(time.perf_counter() - start, 6)
+        return result
+
+    def choose_answer(self, answer: Language) -> str:
+        """Chooses a guess for a question using the answer strategy.
+
+        Parameters
+        ----------
+        answer
+            The correct answer.
+
+        Returns
+        -------
+        str
+            The guess, as a user would type it.
+        """
+        if self._strategy == "correct":
+            guess = answer
+        elif self._strategy == "wrong":
+            guess = random.choice(
+                [language for language in Language if language != answer])
+        else:
+            guess = random.choice(list(Language))
+        return guess.get_user_friendly_name()
+
+    def _get_sentence_from_user(self) -> str:
+        """Gets the next sentence, as if entered by the user.
+
+        Returns
+        -------
+        str
+            The next of the given sentences, or an auto-generated one.
+        """
+        if self._sentences is not None:
+            return next(self._sentences)
+        return str(SentenceGenerator.generate_sentence(
+            self._session.char_limit, self._session.difficulty_level))
+
+
+def play_games(
+        num_of_games: int, seed: Optional[int] = None,
+        **settings) -> Iterable[Dict[str, Any]]:
+    """Plays a number of headless games, one after the other.
+
+    Parameters
+    ----------
+    num_of_games
+        The number of games to play.
+    seed
+        The seed for the first game, which is increased by one for each
+        game after it, or None to not seed the games.
+    settings
+        The GameSession and HeadlessGame arguments for each game.
+
+    Returns
+    -------
+    Iterable[Dict[str, Any]]
+        The result of each game, with its seed, as it's played.
+    """
+    session_settings = {
+        key: settings.pop(key) for key in (
+            "input_mode", "difficulty_level", "enable_hints",
+            "sentence_engine") if key in settings
+    }
+    for game_index in range(num_of_games):
+        game_seed = None if seed is None else seed + game_index
+        if game_seed is not None:
+            random.seed(game_seed)
+        game = HeadlessGame(GameSession(**session_settings), **settings)
+        result = game.play()
+        result["seed"] = game_seed
+        yield result
+
+
+def main(args: List[str] = None):
+    """Parses the command line arguments and plays the games.
+
+    Parameters
+    ----------
+    args : List[str]
+        The command line arguments, or None to use sys.argv.
+    """
+    parser = ArgumentParser(
+        description="Play 'Guess The Language' without a terminal.")
+    parser.add_argument(
+        "--input-mode", choices=[mode.name for mode in InputMode],
+        default=InputMode.AUTO.name)
+    parser.add_argument(
+        "--difficulty", choices=[level.name for level in Difficulty],
+        default=Difficulty.EASY.name)
+    parser.add_argument(
+        "--engine", choices=[engine.name for engine in SentenceEngine],
+        default=SentenceEngine.RULES.name)
+    parser.add_argument("--no-hints", action="store_true")
+    parser.add_argument("--hints-per-question", type=int, default=0)
+    parser.add_argument(
+        "--strategy", choices=ANSWER_STRATEGIES, default="correct")
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument(
+        "--sentence", action="append", dest="sentences",
+        help="a sentence to enter in games with user input (repeatable)")
+    parser.add_argument("--file", help="the file for games with file input")
+    parser.add_argument(
+        "--stub-translator", action="store_true",
+        help="answer translation requests locally instead of with DeepL")
+    parser.add_argument("--stub-latency", type=float, default=0.0)
+    options = parser.parse_args(args)
+
+    if options.input_mode == InputMode.FILE.name and not options.file:
+        parser.error("--file is required for games with file input")
+    from dotenv import load_dotenv
+    load_dotenv()
+    MetricsService.install_exporters()
+    if options.stub_translator:
+        RequestService.set_handler(
+            StubDeepLService(options.stub_latency).handle_request)
+
+    start = time.perf_counter()
+    num_of_questions = 0
+    for result in play_games(
+            options.games, options.seed,
+            input_mode=InputMode[options.input_mode].value,
+            difficulty_level=Difficulty[options.difficulty].value,
+            enable_hints=not options.no_hints,
+            sentence_engine=SentenceEngine[options.engine].value,
+            strategy=options.strategy,
+            hints_per_question=options.hints_per_question,
+            think_time=options.think_time,
+            sentences=options.sentences,
+            file_path=options.file):
+        num_of_questions += result["num_of_questions_asked"]
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+
+    duration = time.perf_counter() - start
+    print(f"Played {options.games} game(s) and {num_of_questions} "
+          f"question(s) in {duration:.2f}s "
+          f"({options.games / duration:.1f} games/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Class to help with displaying menus."""
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+# A line of text paired with the style to display it with
+_StyledLine = Tuple[str, str]
+
+
+class MenuHelper():
+    """Class containing methods to help with displaying menus.
+
+    Methods
+    -------
+    get_menu_lines(
+            options: Sequence[str], selected_index: int,
+            descriptions: Sequence[Optional[str]] = None
+            ) -> Tuple[_StyledLine, ...]:
+        Gets the styled lines for a menu.
+    """
+
+    SELECTED_OPTION_STYLE = "class:selected-option"
+
+    @staticmethod
+    def get_menu_lines(
+            options: Sequence[str], selected_index: int,
+            descriptions: Sequence[Optional[str]] = None
+            ) -> Tuple[_StyledLine, ...]:
+        """Gets the styled lines for a menu.
+
+        Parameters
+        ----------
+        options
+            The menu options.
+        selected_index
+            The index of the selected option.
+        descriptions
+            The description to show after each option, if any.
+
+        Returns
+        -------
+        Tuple[_StyledLine, ...]
+            A (style, text) pair for each option, with the selected one
+            highlighted, which can be displayed as prompt-toolkit formatted
+            text.
+        """
+        return tuple(
+            _format_option(
+                option, descriptions[i] if descriptions else None,
+                i == selected_index)
+            for i, option in enumerate(options)
+        )
+
+
+@lru_cache(maxsize=128)
+def _format_option(
+        option: str, description: Optional[str],
+        is_selected: bool) -> _StyledLine:
+    """Formats a menu option.
+
+    Parameters
+    ----------
+    option
+        The menu option.
+    description
+        The description to show after the option, if any.
+    is_selected
+        True if the option is selected, otherwise False.
+
+    Returns
+    -------
+    _StyledLine
+        The style and text for the option.
+    """
+    text = f"> {option}"
+    if description is not None:
+        text += f": {description}"
+    if is_selected:
+        return (MenuHelper.SELECTED_OPTION_STYLE, f"{text} <\n")
+    return ("", f"{text}\n")
@@ -0,0 +1,94 @@
+"""Class to help with reading sentence files."""
+import re
+from typing import Iterable, Iterator
+
+COMMENT_MARKER = "//"
+# Lines the game adds when writing translations back to a sentence file
+INSERTED_MARKERS = (
+    "Translation:", "Language:", "Note:", "Original sentence:"
+)
+
+
+class SentenceFileHelper():
+    """Class containing methods to help with reading sentence files.
+
+    Methods
+    -------
+    iter_sentences(lines: Iterable[str]) -> Iterator[str]:
+        Yields the sentences from the lines of a sentence file.
+    is_sentence(stripped_line: str) -> bool:
+        Checks if a line of a sentence file is a sentence.
+    is_viable_for_translation(text: str, char_limit: int) -> bool:
+        Checks if text is viable for translation.
+    """
+
+    @staticmethod
+    def iter_sentences(lines: Iterable[str]) -> Iterator[str]:
+        """Yields the sentences from the lines of a sentence file.
+
+        Lines are read one at a time, so only as much of the file as is
+        needed is read, however large it is.
+
+        Parameters
+        ----------
+        lines
+            The lines of the file, such as the file object itself.
+
+        Returns
+        -------
+        Iterator[str]
+            Each sentence, without surrounding whitespace.
+        """
+        for line in lines:
+            stripped_line = line.strip()
+            if SentenceFileHelper.is_sentence(stripped_line):
+                yield stripped_line
+
+    @staticmethod
+    def is_sentence(stripped_line: str) -> bool:
+        """Checks if a line of a sentence file is a sentence.
+
+        Blank lines, '//' comments and lines added by the game when writing
+        translations to a file aren't sentences.
+
+        Parameters
+        ----------
+        stripped_line
+            The line, without surrounding whitespace.
+
+        Returns
+        -------
+        bool
+            True if the line is a sentence, otherwise False.
+        """
+        return bool(stripped_line and
+                    not stripped_line.startswith(COMMENT_MARKER) and
+                    not stripped_line.startswith(INSERTED_MARKERS))
+
+    @staticmethod
+    def is_viable_for_translation(text: str, char_limit: int) -> bool:
+        """Checks if text is viable for translation.
+
+        Viable text has more than one word, starts with a letter or number
+        and is within the character limit.
+
+        Parameters
+        ----------
+        text
+            The text to check.
+        char_limit
+            The most characters the text may have.
+
+        Returns
+        -------
+        bool
+            True if the text is viable for translation, otherwise False.
+        """
+        text = text.strip()
+        str_len = len(text)
+        if (str_len == 0 or
+                len(text.split()) == 1 or
+                re.search("^[^A-Za-z0-9]+", text) or
+                str_len > char_limit):
+            return False
+        return True
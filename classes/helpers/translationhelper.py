@@ -1,10 +1,12 @@
 """Class to help with translations."""
+from collections import OrderedDict
 from os import environ as env
-from typing import TypeVar
+from threading import Lock
+from typing import Dict, List, Tuple, TypeVar
 from datetime import date
 import random
 import json
-import requests
+import time
 from classes.translation import Translation
 from classes.enums.language import Language
 from classes.services.requestservice import RequestService
@@ -17,20 +19,80 @@ _T = TypeVar("T")
 class TranslationHelper():
     """Class containing method to help with translations.
 
+    Attributes
+    ----------
+    MAX_CACHED_TRANSLATIONS: int
+        The number of successful translations to keep, shared by every game
+        in the process.
+    _translation_cache : OrderedDict[Tuple[str, Language], Translation]
+        The most recently used translations by their text and language.
+    _cache_lock : Lock
+        The lock for the cache, since translations are requested from
+        several threads.
+    _is_environment_loaded : bool
+        True once the variables in the .env file have been loaded.
+
     Methods
     -------
+    choose_target_language(language_choices: List[Language]) -> Language:
+        Chooses a language that hasn't been translated into yet.
     translate_sentence(
-            text: str, use_all_languages: bool = False) -> Translation:
+            text: str, target_language: Language,
+            timings: Dict[str, float] = None) -> Translation:
         Translates sentence into another language.
+    translate_sentences(
+            texts: List[str], target_language: Language,
+            timings: Dict[str, float] = None,
+            use_cache: bool = True) -> List[Translation]:
+        Translates several sentences into a language with one request.
     """
-    _language_choices = None
+
+    MAX_CACHED_TRANSLATIONS: int = 1024
+    _translation_cache: "OrderedDict[Tuple[str, Language], Translation]" = (
+        OrderedDict())
+    _cache_lock: Lock = Lock()
+    _is_environment_loaded: bool = False
+
+    @staticmethod
+    def choose_target_language(language_choices: List[Language]) -> Language:
+        """Chooses a language that hasn't been translated into yet.
+
+        Parameters
+        ----------
+        language_choices
+            The languages that haven't been translated into yet, which the
+            chosen language is removed from.
+
+        Returns
+        -------
+        Language
+            The language to translate into.
+        """
+        target_language = random.choice(language_choices)
+        language_choices.remove(target_language)
+        return target_language
 
     @staticmethod
     def translate_sentence(
-            text: str, difficulty_level: int,
-            use_all_languages: bool = False) -> Translation:
+            text: str, target_language: Language,
+            timings: Dict[str, float] = None) -> Translation:
         """Makes request for translation and return response.
 
+        Successful translations are cached, so the same sentence is only
+        requested once per language. The requests library and the .env
+        file are only loaded when the first translation is made, so they
+        don't slow down the start of the game.
+
+        Parameters
+        ----------
+        text
+            The text to translate.
+        target_language
+            The language to translate into.
+        timings
+            The dictionary to add the number of seconds taken by each stage
+            of the translation to, if given.
+
         Returns
         -------
         Translation
@@ -38,22 +100,57 @@ class TranslationHelper():
             parsed into a Translation object for later processing to show
             the user a useful message.
         """
-        global _language_choices
+        return TranslationHelper.translate_sentences(
+            [text], target_language, timings)[0]
+
+    @staticmethod
+    def translate_sentences(
+            texts: List[str], target_language: Language,
+            timings: Dict[str, float] = None,
+            use_cache: bool = True) -> List[Translation]:
+        """Translates several sentences into a language with one request.
+
+        Sentences that have already been translated into the language are
+        taken from the cache instead of being requested again, unless the
+        cache isn't used.
 
+        Parameters
+        ----------
+        texts
+            The texts to translate.
+        target_language
+            The language to translate into.
+        timings
+            The dictionary to add the number of seconds taken by each stage
+            of the translation to, if given: 'cache_lookup',
+            'deepl_round_trip' and 'json_decode'. Stages that weren't
+            reached are left out.
+        use_cache
+            True to use and add to the cache shared by every game, otherwise
+            False, such as for bulk translations that would push the games'
+            translations out of it.
+
+        Returns
+        -------
+        List[Translation]
+            The translation of each text, in the same order, or the same
+            error parsed into a Translation object for every text if the
+            request failed.
+        """
         def create_translation_error(
-                error: _T, target_language: Language) -> Translation:
-            """Returns error wrapped in a Translation object.
+                error: _T, target_language: Language) -> List[Translation]:
+            """Returns error wrapped in a Translation object for each text.
 
             Returns
             -------
-            Translation
+            List[Translation]
                 An error parsed into a Translation object for later processing
                 to show the user a useful message.
             """
-            return Translation((
+            return [Translation((
                         "\nUh oh... We encountered the following issue:\n"
                         f"Error: {error}"),
-                        target_language)
+                        target_language)] * len(texts)
 
         def get_api_error_message(code: int, detailed_error: str) -> str:
             """Gets a user-friendly error message for the API error.
@@ -76,29 +173,51 @@ class TranslationHelper():
                         f"{limit_refresh_date.strftime('%B %d, %Y')}.")
             return detailed_error
 
+        if timings is None:
+            timings = {}
+        stage_start = time.perf_counter()
+        translations = {}
+        if use_cache:
+            TranslationHelper._get_cached_translations(
+                texts, target_language, translations)
+        texts_to_request = list(dict.fromkeys(
+            text for text in texts if text not in translations))
+        timings["cache_lookup"] = time.perf_counter() - stage_start
+        if not texts_to_request:
+            return [translations[text] for text in texts]
+
+        import requests
+        if not TranslationHelper._is_environment_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            TranslationHelper._is_environment_loaded = True
+
         api_endpoint = "https://api-free.deepl.com/v2/translate"
         api_key = env.get("DEEPL_API_KEY", "NO_API_KEY_PROVIDED")
 
-        if use_all_languages:
-            _language_choices = Language.get_choices_for_difficulty_level(
-                difficulty_level)
-
-        target_language = random.choice(_language_choices)
-        _language_choices.remove(target_language)
         params = {
             "auth_key": api_key,
-            "text": text,
+            "text": texts_to_request,
             "source_lang": "EN",
             "target_lang": target_language.value,
             "split_sentences": "0"
         }
 
-        response = RequestService.make_get_request(api_endpoint, params)
-
         try:
+            stage_start = time.perf_counter()
+            response = RequestService.make_get_request(api_endpoint, params)
+            timings["deepl_round_trip"] = time.perf_counter() - stage_start
+            stage_start = time.perf_counter()
             result = response.json()
-            translation = result["translations"]
-            return Translation(translation[0]["text"], target_language)
+            timings["json_decode"] = time.perf_counter() - stage_start
+            if len(result["translations"]) != len(texts_to_request):
+                return create_translation_error(
+                    f"Got {len(result['translations'])} translation(s) "
+                    f"for {len(texts_to_request)} text(s)", target_language)
+            for text, translation in zip(
+                    texts_to_request, result["translations"]):
+                translations[text] = Translation(
+                    translation["text"], target_language)
         except KeyError:
             return create_translation_error(result["message"], target_language)
         except json.decoder.JSONDecodeError as json_error:
@@ -109,3 +228,58 @@ class TranslationHelper():
                     response.status_code, json_error), target_language)
         except requests.RequestException as request_error:
             return create_translation_error(request_error, target_language)
+
+        if use_cache:
+            TranslationHelper._cache_translations(
+                texts_to_request, target_language, translations)
+        return [translations[text] for text in texts]
+
+    @staticmethod
+    def _get_cached_translations(
+            texts: List[str], target_language: Language,
+            translations: Dict[str, Translation]):
+        """Adds the texts' cached translations to a dictionary.
+
+        Parameters
+        ----------
+        texts
+            The texts to look up.
+        target_language
+            The language they're translated into.
+        translations
+            The dictionary to add the cached translations to, by text.
+        """
+        with TranslationHelper._cache_lock:
+            for text in texts:
+                cache_key = (text, target_language)
+                if cache_key in TranslationHelper._translation_cache:
+                    TranslationHelper._translation_cache.move_to_end(
+                        cache_key)
+                    translations[text] = (
+                        TranslationHelper._translation_cache[cache_key])
+
+    @staticmethod
+    def _cache_translations(
+            texts: List[str], target_language: Language,
+            translations: Dict[str, Translation]):
+        """Adds the texts' translations to the cache.
+
+        The least recently used translations are removed once there are
+        more than MAX_CACHED_TRANSLATIONS.
+
+        Parameters
+        ----------
+        texts
+            The texts that were translated.
+        target_language
+            The language they were translated into.
+        translations
+            The translations, by text.
+        """
+        with TranslationHelper._cache_lock:
+            for text in texts:
+                TranslationHelper._translation_cache[
+                    (text, target_language)] = translations[text]
+            while (len(TranslationHelper._translation_cache) >
+                    TranslationHelper.MAX_CACHED_TRANSLATIONS):
+                TranslationHelper._translation_cache.popitem(last=False)
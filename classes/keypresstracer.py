@@ -0,0 +1,272 @@
+"""Class for measuring how long key presses take to be displayed.
+
+Usage
+-----
+Tracing is off unless the KEYPRESS_TRACE_FILE environment variable is set
+to the path of a report, e.g.:
+    KEYPRESS_TRACE_FILE=/tmp/keypresses-{pid}.json python3 run.py
+
+where '{pid}' is replaced with the process's ID. When the process exits,
+the report is written with the percentile latencies from each key press
+to the frame it caused being flushed to the terminal, and the number of
+bytes written for those frames, for each key binding.
+"""
+from os import environ as env
+from threading import Lock
+from typing import Any, Dict, List
+import atexit
+import json
+import os
+import time
+from prompt_toolkit.application import Application
+from prompt_toolkit.key_binding import KeyBindings, KeyPressEvent
+
+# The label for key presses handled by the input's own key bindings, such
+# as typing an answer
+INPUT_LABEL = "input"
+
+
+class KeyPressTracer():
+    """Class for measuring how long key presses take to be displayed.
+
+    Attached to an application, each key press is timed from when it's
+    processed until the next frame is flushed to the terminal. Key presses
+    are labelled by the key binding that handled them, so the cost of each
+    menu action and redraw can be told apart. The timings of every
+    application in the process are reported together.
+
+    Attributes
+    ----------
+    _app : Application
+        The application being traced.
+    _key_started_at : float
+        The performance counter time the current key press started at.
+    _label : str
+        The label of the current key press.
+    _pending : List[Tuple[str, float]]
+        The label and start time of the key presses waiting to be
+        displayed.
+    _num_of_bytes : int
+        The number of bytes written since the last frame was flushed.
+    _latencies : Dict[str, List[float]]
+        The latency of every displayed key press in seconds, by label.
+    _frame_sizes : Dict[str, List[int]]
+        The number of bytes in the frame that displayed each key press,
+        by label.
+    _num_without_frame : Dict[str, int]
+        The number of key presses that didn't cause a redraw, by label.
+    _is_report_registered : bool
+        True once the report has been registered to be written at exit.
+    _lock : Lock
+        The lock for the timings shared by every application.
+
+    Methods
+    -------
+    is_enabled() -> bool:
+        Checks if key presses should be traced.
+    attach(key_bindings: KeyBindings):
+        Starts tracing the application's key presses.
+    get_report() -> Dict[str, Any]:
+        Summarises the timings of every traced key press.
+    write_report():
+        Writes the report to the file set by KEYPRESS_TRACE_FILE.
+    """
+
+    _latencies: Dict[str, List[float]] = {}
+    _frame_sizes: Dict[str, List[int]] = {}
+    _num_without_frame: Dict[str, int] = {}
+    _is_report_registered: bool = False
+    _lock: Lock = Lock()
+
+    def __init__(self, app: Application):
+        """Initialises the object with the application to trace.
+
+        Parameters
+        ----------
+        app
+            The application to trace.
+        """
+        self._app = app
+        self._key_started_at = 0.0
+        self._label = INPUT_LABEL
+        self._pending = []
+        self._num_of_bytes = 0
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Checks if key presses should be traced.
+
+        Returns
+        -------
+        bool
+            True if KEYPRESS_TRACE_FILE is set, otherwise False.
+        """
+        return bool(env.get("KEYPRESS_TRACE_FILE"))
+
+    def attach(self, key_bindings: KeyBindings):
+        """Starts tracing the application's key presses.
+
+        Wraps the handler of every key binding to label its key presses, and
+        the application's output to count the bytes in each frame and note
+        when it's flushed.
+
+        Parameters
+        ----------
+        key_bindings
+            The application's own key bindings.
+        """
+        for binding in key_bindings.bindings:
+            binding.handler = self._wrap_handler(binding.handler, "/".join(
+                getattr(key, "value", key) for key in binding.keys))
+
+        key_processor = self._app.key_processor
+        key_processor.before_key_press += self._start_key_press
+        key_processor.after_key_press += self._end_key_press
+
+        output = self._app.output
+        write, write_raw, flush = output.write, output.write_raw, output.flush
+
+        def count_write(data: str):
+            self._num_of_bytes += len(data.encode("utf-8", "replace"))
+            write(data)
+
+        def count_write_raw(data: str):
+            self._num_of_bytes += len(data.encode("utf-8", "replace"))
+            write_raw(data)
+
+        def flush_frame():
+            flush()
+            self._record_frame()
+
+        output.write = count_write
+        output.write_raw = count_write_raw
+        output.flush = flush_frame
+
+        with KeyPressTracer._lock:
+            if not KeyPressTracer._is_report_registered:
+                KeyPressTracer._is_report_registered = True
+                atexit.register(KeyPressTracer.write_report)
+
+    @classmethod
+    def get_report(cls) -> Dict[str, Any]:
+        """Summarises the timings of every traced key press.
+
+        Returns
+        -------
+        Dict[str, Any]
+            For each label, the number of key presses, their 50th, 90th and
+            99th percentile and maximum latencies in milliseconds, the mean
+            and maximum bytes in the frames that displayed them and the
+            number that didn't cause a redraw.
+        """
+        report = {}
+        with cls._lock:
+            labels = sorted(set(cls._latencies) | set(cls._num_without_frame))
+            for label in labels:
+                latencies = sorted(cls._latencies.get(label, []))
+                frame_sizes = cls._frame_sizes.get(label, [])
+                report[label] = {
+                    "count": len(latencies),
+                    "latency_ms": {
+                        name: round(
+                            _get_percentile(latencies, percentile) * 1000, 3)
+                        for name, percentile in (
+                            ("p50", 50), ("p90", 90), ("p99", 99),
+                            ("max", 100))
+                    },
+                    "bytes_per_frame": {
+                        "mean": round(
+                            sum(frame_sizes) / len(frame_sizes), 1)
+                        if frame_sizes else 0,
+                        "max": max(frame_sizes, default=0)
+                    },
+                    "without_frame": cls._num_without_frame.get(label, 0)
+                }
+        return report
+
+    @classmethod
+    def write_report(cls):
+        """Writes the report to the file set by KEYPRESS_TRACE_FILE, with
+        '{pid}' replaced with the process's ID."""
+        path = env.get("KEYPRESS_TRACE_FILE")
+        if not path or not cls._latencies and not cls._num_without_frame:
+            return
+        path = path.replace("{pid}", str(os.getpid()))
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(cls.get_report(), file, indent=2)
+            file.write("\n")
+
+    def _wrap_handler(self, handler, keys: str):
+        """Wraps a key binding's handler to label its key presses.
+
+        Parameters
+        ----------
+        handler : Callable[[KeyPressEvent], Any]
+            The handler.
+        keys : str
+            The keys the binding is for, e.g. 'up' or 'c-h'.
+
+        Returns
+        -------
+        Callable[[KeyPressEvent], Any]
+            The wrapped handler.
+        """
+        description = (handler.__doc__ or handler.__name__).strip()
+        label = f"{keys}: {description.splitlines()[0]}"
+
+        def traced_handler(event: KeyPressEvent):
+            self._label = label
+            return handler(event)
+        return traced_handler
+
+    def _start_key_press(self, _):
+        """Notes the time a key press started at."""
+        self._key_started_at = time.perf_counter()
+        self._label = INPUT_LABEL
+
+    def _end_key_press(self, _):
+        """Waits for the key press to be displayed, if it caused a
+        redraw."""
+        if self._app.invalidated:
+            self._pending.append((self._label, self._key_started_at))
+        else:
+            with KeyPressTracer._lock:
+                KeyPressTracer._num_without_frame[self._label] = (
+                    KeyPressTracer._num_without_frame.get(self._label, 0) + 1)
+
+    def _record_frame(self):
+        """Records the latency of the key presses displayed by the frame
+        that's just been flushed."""
+        num_of_bytes = self._num_of_bytes
+        self._num_of_bytes = 0
+        if not self._pending or not num_of_bytes:
+            return
+        flushed_at = time.perf_counter()
+        with KeyPressTracer._lock:
+            for label, started_at in self._pending:
+                KeyPressTracer._latencies.setdefault(label, []).append(
+                    flushed_at - started_at)
+                KeyPressTracer._frame_sizes.setdefault(label, []).append(
+                    num_of_bytes)
+        self._pending = []
+
+
+def _get_percentile(values: List[float], percentile: float) -> float:
+    """Gets a percentile of sorted values, using the nearest rank.
+
+    Parameters
+    ----------
+    values
+        The values, sorted from smallest to largest.
+    percentile
+        The percentile, from 0 to 100.
+
+    Returns
+    -------
+    float
+        The value at the percentile, or 0.0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    rank = max(int(-(-len(values) * percentile // 100)), 1)
+    return values[rank - 1]
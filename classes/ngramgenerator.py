@@ -0,0 +1,330 @@
+"""Class for generating sentences from a corpus-trained n-gram model.
+
+Usage
+-----
+To train a model from sentence files, use:
+    python3 -m classes.ngramgenerator resources/testdata/*.txt
+
+which writes the model to NGramSentenceGenerator.MODEL_PATH, unless
+another path is given with --output.
+"""
+import argparse
+import json
+import os
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, List, Tuple
+from classes.helpers.sentencefilehelper import SentenceFileHelper
+
+_START = "<s>"
+_END = "</s>"
+
+
+class NGramSentenceGenerator():
+    """Class for generating sentences from an n-gram model.
+
+    Each state (the previous order - 1 words) has a sampling table with its
+    candidate next words sorted by the fewest characters needed to finish a
+    sentence after choosing them. This means the words that can still finish
+    within a character limit are always a prefix of the table, so a word is
+    drawn from that prefix by bisection with no rejection loop.
+
+    Attributes
+    ----------
+    MODEL_PATH: str
+        The path of the default model, which doesn't depend on the
+        working directory.
+    _order : int
+        The number of words in each n-gram.
+    _counts : Dict[Tuple[str, ...], Dict[str, int]]
+        The number of times each word followed each state in the corpus.
+    _tables : Dict[Tuple[str, ...], Tuple[List[int], List[str], List[int]]]
+        The sampling table for each state, made up of the sorted costs,
+        the words, and the cumulative counts.
+
+    Methods
+    -------
+    train(sentences: Iterable[str], order: int = 2) -> NGramSentenceGenerator:
+        Trains a model from the given sentences.
+    read_sentences(paths: Iterable[str]) -> List[str]:
+        Reads the unique sentences from the given sentence files.
+    load(path: str) -> NGramSentenceGenerator:
+        Loads a model from file.
+    get_default() -> NGramSentenceGenerator:
+        Gets the model stored at MODEL_PATH, loading it on first use.
+    save(path: str):
+        Saves the model to file.
+    generate_sentence(
+            character_limit: int, difficulty_level: int = None) -> str:
+        Generates a sentence within a character limit.
+    """
+
+    MODEL_PATH: str = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "resources", "models", "sentences-ngram.json")
+    _default: "NGramSentenceGenerator" = None
+
+    def __init__(
+            self, order: int,
+            counts: Dict[Tuple[str, ...], Dict[str, int]]):
+        """Initialises the object with the passed parameters.
+
+        Parameters
+        ----------
+        order
+            The number of words in each n-gram.
+        counts
+            The number of times each word followed each state.
+        """
+        self._order = order
+        self._counts = counts
+        self._tables = self._build_tables()
+
+    @classmethod
+    def train(
+            cls, sentences: Iterable[str],
+            order: int = 2) -> "NGramSentenceGenerator":
+        """Trains a model from the given sentences.
+
+        Parameters
+        ----------
+        sentences
+            The sentences to train on.
+        order
+            The number of words in each n-gram.
+
+        Returns
+        -------
+        NGramSentenceGenerator
+            The trained model.
+        """
+        counts = {}
+        for sentence in sentences:
+            words = [_START] * (order - 1) + sentence.split() + [_END]
+            for i in range(order - 1, len(words)):
+                state = tuple(words[i - order + 1:i])
+                following = counts.setdefault(state, {})
+                following[words[i]] = following.get(words[i], 0) + 1
+        return cls(order, counts)
+
+    @staticmethod
+    def read_sentences(paths: Iterable[str]) -> List[str]:
+        """Reads the unique sentences from the given sentence files.
+
+        Blank lines, '//' comments and lines added by the game when writing
+        translations to a file are skipped.
+
+        Parameters
+        ----------
+        paths
+            The paths of the files to read.
+
+        Returns
+        -------
+        List[str]
+            The sentences in the order they were first found.
+        """
+        sentences = {}
+        for path in paths:
+            with open(path, encoding="utf-8") as file:
+                for sentence in SentenceFileHelper.iter_sentences(file):
+                    sentences[sentence] = None
+        return list(sentences)
+
+    @classmethod
+    def load(cls, path: str) -> "NGramSentenceGenerator":
+        """Loads a model from file.
+
+        Parameters
+        ----------
+        path
+            The path of the model file.
+
+        Returns
+        -------
+        NGramSentenceGenerator
+            The loaded model.
+        """
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+
+        words = data["words"]
+        counts = {}
+        for state, following in data["counts"]:
+            counts[tuple(words[i] for i in state)] = {
+                words[word]: count for word, count in following
+            }
+        return cls(data["order"], counts)
+
+    @classmethod
+    def get_default(cls) -> "NGramSentenceGenerator":
+        """Gets the model stored at MODEL_PATH, loading it on first use.
+
+        Returns
+        -------
+        NGramSentenceGenerator
+            The default model.
+        """
+        if cls._default is None:
+            cls._default = cls.load(cls.MODEL_PATH)
+        return cls._default
+
+    def save(self, path: str):
+        """Saves the model to file.
+
+        Words are stored once and referred to by index to keep the file
+        compact.
+
+        Parameters
+        ----------
+        path
+            The path to save the model to.
+        """
+        words = sorted(
+            {word for state in self._counts for word in state} |
+            {word for following in self._counts.values()
+             for word in following})
+        indexes = {word: i for i, word in enumerate(words)}
+        data = {
+            "order": self._order,
+            "words": words,
+            "counts": [
+                [
+                    [indexes[word] for word in state],
+                    [[indexes[word], count]
+                     for word, count in following.items()]
+                ]
+                for state, following in self._counts.items()
+            ]
+        }
+        with open(path, mode="w", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+
+    def generate_sentence(
+            self, character_limit: int, difficulty_level: int = None) -> str:
+        """Generates a sentence within a character limit.
+
+        If no sentence in the model can fit within the character limit, the
+        shortest one that can be generated is returned instead.
+
+        Parameters
+        ----------
+        character_limit
+            The character limit for the sentence.
+        difficulty_level
+            Unused, but accepted so that this can be used in place of
+            SentenceGenerator.generate_sentence.
+
+        Returns
+        -------
+        str
+            The generated sentence.
+        """
+        state = (_START,) * (self._order - 1)
+        words = []
+        remaining = character_limit
+        while True:
+            costs, following, totals = self._tables[state]
+            # Words after the first need a space before them
+            separator = 1 if words else 0
+            limit = bisect_right(costs, remaining - separator) or 1
+            position = random.random() * totals[limit - 1]
+            word = following[bisect_right(totals, position, 0, limit - 1)]
+            if word == _END:
+                return " ".join(words)
+
+            words.append(word)
+            remaining -= separator + len(word)
+            state = (state + (word,))[1:]
+
+    def _build_tables(
+            self
+            ) -> Dict[Tuple[str, ...], Tuple[List[int], List[str], List[int]]]:
+        """Builds the sampling table for each state.
+
+        Returns
+        -------
+        Dict[Tuple[str, ...], Tuple[List[int], List[str], List[int]]]
+            The sorted costs, words and cumulative counts for each state.
+        """
+        finishing_costs = self._get_finishing_costs()
+        tables = {}
+        for state, following in self._counts.items():
+            candidates = sorted(
+                (self._get_cost(state, word, finishing_costs), word, count)
+                for word, count in following.items())
+            costs, words, counts = zip(*candidates)
+            tables[state] = (
+                list(costs), list(words), list(accumulate(counts)))
+        return tables
+
+    def _get_finishing_costs(self) -> Dict[Tuple[str, ...], int]:
+        """Gets the fewest characters needed to finish a sentence from each
+        state, excluding the space before the next word.
+
+        Returns
+        -------
+        Dict[Tuple[str, ...], int]
+            The finishing cost for each state.
+        """
+        unreachable = float("inf")
+        finishing_costs = {state: unreachable for state in self._counts}
+        has_changed = True
+        # Repeatedly relax every transition until no cost can be lowered
+        # (the corpus is small so this settles within a few passes).
+        while has_changed:
+            has_changed = False
+            for state, following in self._counts.items():
+                cost = min(
+                    self._get_cost(state, word, finishing_costs)
+                    for word in following)
+                if cost < finishing_costs[state]:
+                    finishing_costs[state] = cost
+                    has_changed = True
+        return finishing_costs
+
+    def _get_cost(
+            self, state: Tuple[str, ...], word: str,
+            finishing_costs: Dict[Tuple[str, ...], int]) -> int:
+        """Gets the fewest characters needed to finish a sentence after
+        choosing a word, excluding the space before it.
+
+        Parameters
+        ----------
+        state
+            The state the word follows.
+        word
+            The chosen word.
+        finishing_costs
+            The finishing cost for each state.
+
+        Returns
+        -------
+        int
+            The cost of choosing the word.
+        """
+        if word == _END:
+            return 0
+        next_state = (state + (word,))[1:]
+        next_cost = finishing_costs.get(next_state, float("inf"))
+        # Every word after this one needs a space before it
+        return len(word) + (next_cost + 1 if next_cost else 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Trains an n-gram model from sentence files.")
+    parser.add_argument("paths", nargs="+", help="The sentence files.")
+    parser.add_argument(
+        "--order", type=int, default=2,
+        help="The number of words in each n-gram (default: 2).")
+    parser.add_argument(
+        "--output", default=NGramSentenceGenerator.MODEL_PATH,
+        help="The path to save the model to.")
+    args = parser.parse_args()
+
+    training_sentences = NGramSentenceGenerator.read_sentences(args.paths)
+    NGramSentenceGenerator.train(training_sentences, args.order).save(
+        args.output)
+    print(f"Trained on {len(training_sentences)} sentences: {args.output}")
@@ -1,8 +1,9 @@
 """Class for generating random sentences."""
 import random
 import re
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
 from classes.sentence import Sentence
+from classes.translation import Translation
 from classes.word import Word
 from classes.gamedictionary import GameDictionary
 from classes.enums.language import Language
@@ -22,22 +23,106 @@ class SentenceGenerator():
 
     ...
 
+    Attributes
+    ----------
+    MAX_WORD_ATTEMPTS: int
+        The maximum number of attempts made to find a suitable word for a
+        part of speech before falling back to a known-good sentence.
+    MAX_STRUCTURE_ATTEMPTS: int
+        The maximum number of parts of speech tried when building a sentence
+        structure before falling back to a known-good structure.
+    FALLBACK_STRUCTURE: List[PartOfSpeech]
+        The sentence structure used when one can't be built in time.
+    FALLBACK_SENTENCES: Tuple[Sentence, ...]
+        Known-good sentences, longest first, used when a sentence can't be
+        generated in time.
+    FALLBACK_TEMPLATE_WORDS: Dict[str, Any]
+        The words used when a sentence pair can't be generated within the
+        character limit in time.
+
     Methods
     -------
-    generate_sentence(character_limit: int) -> Sentence:
+    generate_sentence(
+            character_limit: int, difficulty_level: int = None) -> Sentence:
         Generates and returns a sentence.
+    generate_sentence_pair(
+            character_limit: int, target_language: Language,
+            difficulty_level: int = None) -> Tuple[Sentence, Translation]:
+        Generates a sentence along with its translation into another
+        language, without making a translation request.
+    get_generation_stats() -> Dict[str, int]:
+        Gets the number of sentences generated and how often each fallback
+        was used.
     """
 
+    MAX_WORD_ATTEMPTS: int = 50
+    MAX_STRUCTURE_ATTEMPTS: int = 50
+    FALLBACK_STRUCTURE: List[PartOfSpeech] = [
+        PartOfSpeech.DEFINITE_ARTICLE,
+        PartOfSpeech.NOUN,
+        PartOfSpeech.VERB,
+        PartOfSpeech.NOUN
+    ]
+    FALLBACK_SENTENCES: Tuple[Sentence, ...] = (
+        Sentence([
+            Word("The", PartOfSpeech.DEFINITE_ARTICLE, "definite"),
+            Word("girl", PartOfSpeech.NOUN, "people"),
+            Word("likes", PartOfSpeech.VERB, "transitive"),
+            Word("the", PartOfSpeech.DEFINITE_ARTICLE, "definite"),
+            Word("mango", PartOfSpeech.NOUN, "food")
+        ]),
+        Sentence([
+            Word("The", PartOfSpeech.DEFINITE_ARTICLE, "definite"),
+            Word("boy", PartOfSpeech.NOUN, "people"),
+            Word("likes", PartOfSpeech.VERB, "transitive"),
+            Word("me", PartOfSpeech.OBJECT_PRONOUN, "object")
+        ]),
+        Sentence([
+            Word("I", PartOfSpeech.PERSONAL_PRONOUN, "personal"),
+            Word("see", PartOfSpeech.VERB, "transitive"),
+            Word("them", PartOfSpeech.OBJECT_PRONOUN, "object")
+        ])
+    )
+    FALLBACK_TEMPLATE_WORDS: Dict[str, Any] = {
+        "name": "Ann",
+        "subject": "boy",
+        "subject_is_plural": False,
+        "adjective": None,
+        "verb": "have",
+        "object": "pear",
+        "object_is_plural": False
+    }
+    _generation_counts: Dict[str, int] = {
+        "generated": 0,
+        "structure_fallbacks": 0,
+        "sentence_fallbacks": 0
+    }
+
     @classmethod
-    def generate_sentence(cls, character_limit: int) -> Sentence:
+    def generate_sentence(
+            cls, character_limit: int,
+            difficulty_level: int = None) -> Sentence:
         """Generates a sentence that follows a basic structure and adheres to a
         character limit.
 
+        If a suitable word can't be found within MAX_WORD_ATTEMPTS, one of
+        the FALLBACK_SENTENCES is returned instead so that generation always
+        terminates.
+
+        Parameters
+        ----------
+        character_limit
+            The character limit for the sentence.
+        difficulty_level
+            The game's difficulty level, used to weight words by how common
+            they are, if provided.
+
         Returns
         -------
         Sentence
             A basic sentence.
         """
+        cls._generation_counts["generated"] += 1
         sentence_structure = cls._get_sentence_structure()
         words = []
         excluded_parts = {}
@@ -47,7 +132,12 @@ class SentenceGenerator():
                 found_first_verb = True
 
             has_suitable_word = False
+            attempts = 0
             while not has_suitable_word:
+                if attempts == cls.MAX_WORD_ATTEMPTS:
+                    return cls._get_fallback_sentence(character_limit)
+                attempts += 1
+
                 # (only set to 'associative' when a preposition has been
                 # manually added on L101 and the previous word was an
                 # intransive verb (i.e. isn't followed by a direct object))
@@ -62,7 +152,9 @@ class SentenceGenerator():
                 value, specificity = cls._select_word_for_part_of_speech(
                     part_of_speech, character_limit,
                     desired_type,
-                    excluded_parts)
+                    excluded_parts, difficulty_level)
+                if value is None:
+                    return cls._get_fallback_sentence(character_limit)
 
                 # If not looking at the first part of speech in
                 # sentence_structure,
@@ -74,8 +166,10 @@ class SentenceGenerator():
                             cls._select_word_for_part_of_speech(
                                 part_of_speech, character_limit,
                                 "people",
-                                excluded_parts)
+                                excluded_parts, difficulty_level)
                         )
+                        if value is None:
+                            return cls._get_fallback_sentence(character_limit)
 
                     preceding_word = words[len(words) - 1]
                     # conjugate the word if the part of speech is a verb.
@@ -125,12 +219,244 @@ class SentenceGenerator():
 
         return Sentence(words, Language.ENGLISH)
 
+    @classmethod
+    def generate_sentence_pair(
+            cls, character_limit: int, target_language: Language,
+            difficulty_level: int = None) -> Tuple[Sentence, Translation]:
+        """Generates a sentence along with its translation into another
+        language, without making a translation request.
+
+        Both sentences follow the format:
+            - (article (+ adjective) + noun) or name + verb + article + noun
+        using the words in GameDictionary.TRANSLATED_WORDS and the word order,
+        articles and verb agreement rules in GameDictionary.GRAMMAR_RULES for
+        each language.
+
+        Parameters
+        ----------
+        character_limit
+            The character limit for the English sentence.
+        target_language
+            The language to translate the sentence into, which must have
+            vocabulary in GameDictionary.
+        difficulty_level
+            The game's difficulty level, used to weight names by how common
+            they are, if provided.
+
+        Returns
+        -------
+        Tuple[Sentence, Translation]
+            The English sentence and its translation.
+        """
+        cls._generation_counts["generated"] += 1
+        for _ in range(cls.MAX_WORD_ATTEMPTS):
+            choices = cls._choose_template_words(difficulty_level)
+            parts = cls._render_template(choices, Language.ENGLISH)
+            # (+ 1 for the full stop)
+            sentence_length = sum(len(part[0]) + 1 for part in parts)
+            if sentence_length <= character_limit:
+                break
+        else:
+            cls._generation_counts["sentence_fallbacks"] += 1
+            choices = cls.FALLBACK_TEMPLATE_WORDS
+            parts = cls._render_template(choices, Language.ENGLISH)
+
+        words = [
+            Word(value.capitalize() if count == 0 else value,
+                 part_of_speech, specificity)
+            for count, (value, part_of_speech, specificity) in enumerate(
+                parts)
+        ]
+        translated_parts = cls._render_template(choices, target_language)
+        translated_text = ""
+        for value, _, _ in translated_parts:
+            # Elided articles (e.g. l') are joined to the following word
+            if translated_text and not translated_text.endswith("'"):
+                translated_text += " "
+            translated_text += value
+        translated_text = (
+            translated_text[0].upper() + translated_text[1:] + ".")
+        return (
+            Sentence(words, Language.ENGLISH),
+            Translation(translated_text, target_language)
+        )
+
+    @classmethod
+    def get_generation_stats(cls) -> Dict[str, int]:
+        """Gets the number of sentences generated and how often each fallback
+        was used.
+
+        Returns
+        -------
+        Dict[str, int]
+            The counters for sentence generation, including fallbacks used
+            by GameDictionary when searching for words.
+        """
+        stats = cls._generation_counts.copy()
+        stats["dictionary_fallbacks"] = GameDictionary.get_fallback_count()
+        return stats
+
+    @classmethod
+    def _get_fallback_sentence(cls, character_limit: int) -> Sentence:
+        """Gets the longest known-good sentence that fits a character limit.
+
+        Parameters
+        ----------
+        character_limit
+            The character limit for the sentence.
+
+        Returns
+        -------
+        Sentence
+            The first of the FALLBACK_SENTENCES within the character limit,
+            otherwise the shortest one.
+        """
+        cls._generation_counts["sentence_fallbacks"] += 1
+        for sentence in cls.FALLBACK_SENTENCES:
+            if len(str(sentence)) <= character_limit:
+                return sentence
+        return cls.FALLBACK_SENTENCES[-1]
+
+    @staticmethod
+    def _choose_template_words(difficulty_level: int) -> Dict[str, Any]:
+        """Chooses the English words to fill a sentence pair template with.
+
+        Parameters
+        ----------
+        difficulty_level
+            The game's difficulty level used to weight names, if provided.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The chosen words and whether or not the nouns are plural.
+        """
+        english_words = GameDictionary.TRANSLATED_WORDS[Language.ENGLISH]
+        name = None
+        # Names don't need translating so only use one a third of the time
+        if random.randint(0, 2) == 0:
+            name, _ = GameDictionary.search_for_word_by_type(
+                PartOfSpeech.NOUN, "name", {}, difficulty_level)
+
+        return {
+            "name": name,
+            "subject": random.choice(list(english_words["people"])),
+            "subject_is_plural": random.choice((True, False)),
+            "adjective": random.choice(
+                [None] + list(english_words["adjectives"])),
+            "verb": random.choice(list(english_words["verbs"])),
+            "object": random.choice(list(english_words["food"])),
+            "object_is_plural": random.choice((True, False))
+        }
+
+    @classmethod
+    def _render_template(
+            cls, choices: Dict[str, Any],
+            language: Language) -> List[Tuple[str, PartOfSpeech, str]]:
+        """Renders the words chosen for a sentence pair in a given language.
+
+        Parameters
+        ----------
+        choices
+            The English words chosen for the template.
+        language
+            The language to render the sentence in.
+
+        Returns
+        -------
+        List[Tuple[str, PartOfSpeech, str]]
+            Each word in order, with its part of speech and specificity.
+        """
+        words = GameDictionary.TRANSLATED_WORDS[language]
+        if choices["name"]:
+            is_plural = False
+            parts = [(choices["name"], PartOfSpeech.NOUN, "name")]
+        else:
+            is_plural = choices["subject_is_plural"]
+            adjective = choices["adjective"]
+            parts = cls._render_noun_phrase(
+                language, "people", choices["subject"], is_plural,
+                words["adjectives"][adjective] if adjective else None)
+
+        verb = choices["verb"]
+        parts.append((
+            words["verbs"][verb][1 if is_plural else 0],
+            PartOfSpeech.VERB,
+            "possessive" if verb == "have" else "transitive"
+        ))
+        parts.extend(cls._render_noun_phrase(
+            language, "food", choices["object"],
+            choices["object_is_plural"], is_object=True))
+        return parts
+
+    @staticmethod
+    def _render_noun_phrase(
+            language: Language, specificity: str, noun: str, is_plural: bool,
+            adjective: Any = None,
+            is_object: bool = False) -> List[Tuple[str, PartOfSpeech, str]]:
+        """Renders a noun phrase in a given language.
+
+        Following the format:
+            definite article (+ adjective) + noun
+        where the adjective comes before or after the noun depending on the
+        language, and the article and adjective agree with the noun.
+
+        Parameters
+        ----------
+        language
+            The language to render the noun phrase in.
+        specificity
+            The type of noun, i.e. 'people' or 'food'.
+        noun
+            The English form of the noun.
+        is_plural
+            True if the noun should be in its plural form.
+        adjective
+            The adjective's form (or forms by gender and number) in the
+            given language, if there is one.
+        is_object
+            True if the noun phrase is the object of the sentence.
+
+        Returns
+        -------
+        List[Tuple[str, PartOfSpeech, str]]
+            Each word in order, with its part of speech and specificity.
+        """
+        grammar = GameDictionary.GRAMMAR_RULES[language]
+        singular, plural, gender = (
+            GameDictionary.TRANSLATED_WORDS[language][specificity][noun])
+        parts = [(
+            plural if is_plural else singular, PartOfSpeech.NOUN, specificity)]
+
+        if adjective:
+            if not isinstance(adjective, str):
+                adjective = adjective[
+                    (2 if is_plural else 0) + (1 if gender == "f" else 0)]
+            adjective_part = (adjective, PartOfSpeech.ADJECTIVE, "people")
+            if grammar["adjective_position"] == "before":
+                parts.insert(0, adjective_part)
+            else:
+                parts.append(adjective_part)
+
+        articles = grammar["articles"]
+        if is_object:
+            articles = grammar.get("object_articles", articles)
+        if parts[0][0][0].lower() in grammar.get("elision_letters", ""):
+            articles = grammar["elided_articles"]
+        parts.insert(0, (
+            articles[gender][1 if is_plural else 0],
+            PartOfSpeech.DEFINITE_ARTICLE, "definite"
+        ))
+        return parts
+
     @classmethod
     def _get_sentence_structure(cls) -> List[PartOfSpeech]:
         """Returns a random but valid order of parts of speech.
 
         Uses the random module to choose parts of speech, ensuring
-        that the chosen part of speech can follow the previous.
+        that the chosen part of speech can follow the previous. If a
+        predicate isn't found within MAX_STRUCTURE_ATTEMPTS, a copy of
+        FALLBACK_STRUCTURE is returned instead.
 
         Returns
         ----------
@@ -148,7 +474,13 @@ class SentenceGenerator():
         # game to stall when attempting to generate a sentence.
         temp_list_of_choices.remove(PartOfSpeech.ADVERB)
 
+        attempts = 0
         while not found_predicate:
+            if attempts == cls.MAX_STRUCTURE_ATTEMPTS:
+                cls._generation_counts["structure_fallbacks"] += 1
+                return cls.FALLBACK_STRUCTURE.copy()
+            attempts += 1
+
             preceding_part_of_speech = sentence_structure[-1]
 
             next_part = cls._get_next_part(
@@ -190,11 +522,12 @@ class SentenceGenerator():
                 return None
         return next_part
 
-    @staticmethod
+    @classmethod
     def _select_word_for_part_of_speech(
-            part_of_speech: PartOfSpeech, char_limit: int,
+            cls, part_of_speech: PartOfSpeech, char_limit: int,
             desired_type: str = "",
-            excluded_types: Dict[PartOfSpeech, str] = None) -> Word:
+            excluded_types: Dict[PartOfSpeech, str] = None,
+            difficulty_level: int = None) -> Tuple[str, str]:
         """Selects a word for a given part of speech.
 
         Selects a word for a given part of speech at random until one is found
@@ -211,24 +544,24 @@ class SentenceGenerator():
             The desired type of part of speech to look for, if provided.
         excluded_types
             The types of parts_of_speech to ignore, if provided.
+        difficulty_level
+            The game's difficulty level used to weight words, if provided.
 
         Returns
         ----------
-        Word
-            A Word object if one is found that meets the criteria, otherwise
-            None.
+        Tuple[str, str]
+            The word and its specificity if one is found that meets the
+            criteria within MAX_WORD_ATTEMPTS, otherwise (None, None).
         """
-        has_found_word = False
-        found_word = ""
-
-        while not has_found_word:
+        for _ in range(cls.MAX_WORD_ATTEMPTS):
             found_word = GameDictionary.search_for_word_by_type(
-                part_of_speech, desired_type, excluded_types)
+                part_of_speech, desired_type, excluded_types,
+                difficulty_level)
 
-            if char_limit - len(found_word) >= 0:
-                has_found_word = True
+            if char_limit - len(found_word[0]) >= 0:
+                return found_word
 
-        return found_word
+        return (None, None)
 
     @classmethod
     def _get_subject(cls) -> List[PartOfSpeech]:
@@ -0,0 +1,369 @@
+"""Class used to sample sentences from huge sentence files.
+
+Usage
+-----
+To build the index for one or more sentence files ahead of time, use:
+    python3 -m classes.sentenceindex sentences.txt
+
+which writes 'sentences.txt.idx' next to the file. Otherwise, the index
+is built the first time the file is opened.
+"""
+from argparse import ArgumentParser
+from typing import List, Sequence
+import array
+import mmap
+import os
+import random
+import struct
+import tempfile
+from classes.helpers.sentencefilehelper import SentenceFileHelper
+
+INDEX_SUFFIX = ".idx"
+_MAGIC = b"GTLIDX01"
+# Magic, file size, file modification time, number of sentences and number
+# of difficulty levels, padded to keep the arrays after it aligned
+_HEADER = struct.Struct("<8sQQQQ24x")
+_COUNT = struct.Struct("<Q")
+
+
+class SentenceIndex():
+    """Class used to sample sentences from huge sentence files.
+
+    The index is a sidecar file holding the byte offset, length and
+    character count of every sentence in a file, and the positions of the
+    sentences that are viable for each difficulty level. It's rebuilt if
+    the file's size or modification time changes. Both files are memory
+    mapped, so only the sentences that are sampled are read.
+
+    Attributes
+    ----------
+    _path : str
+        The path of the sentence file.
+    _file : BinaryIO
+        The sentence file.
+    _file_map : mmap.mmap
+        The memory-mapped sentence file.
+    _index_file : BinaryIO
+        The index file.
+    _index_map : mmap.mmap
+        The memory-mapped index file.
+    _offsets : memoryview
+        The byte offset of each sentence.
+    _byte_lengths : memoryview
+        The number of bytes in each sentence.
+    _char_lengths : memoryview
+        The number of characters in each sentence.
+    _viable_positions : List[memoryview]
+        The positions of the sentences that are viable for each difficulty
+        level.
+
+    Properties
+    ----------
+    num_of_sentences : int
+        Getter method for num_of_sentences property.
+
+    Methods
+    -------
+    get_index_path(path: str) -> str:
+        Gets the path of a sentence file's index.
+    build(path: str, char_limits: Sequence[int]):
+        Builds the index for a sentence file.
+    get_sentence(position: int) -> str:
+        Gets a sentence by its position in the file.
+    get_char_length(position: int) -> int:
+        Gets the number of characters in a sentence.
+    count_viable(difficulty_level: int) -> int:
+        Counts the sentences viable for a difficulty level.
+    sample(difficulty_level: int, num_of_sentences: int) -> List[str]:
+        Picks random sentences that are viable for a difficulty level.
+    close():
+        Closes the sentence and index files.
+    """
+
+    def __init__(self, path: str, char_limits: Sequence[int]):
+        """Opens a sentence file and its index, building the index if it's
+        missing or out of date.
+
+        Parameters
+        ----------
+        path
+            The path of the sentence file.
+        char_limits
+            The character limit for sentences for each difficulty level,
+            used if the index has to be built.
+        """
+        self._path = path
+        index_path = self.get_index_path(path)
+        if not self._is_index_current(path, index_path, len(char_limits)):
+            self.build(path, char_limits)
+
+        self._file = open(path, "rb")
+        self._index_file = open(index_path, "rb")
+        self._file_map = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if os.path.getsize(path) else b"")
+        self._index_map = mmap.mmap(
+            self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, _, _, count, num_of_levels = _HEADER.unpack_from(self._index_map)
+        view = memoryview(self._index_map)
+        position = _HEADER.size
+        self._offsets = view[position:position + 8 * count].cast("Q")
+        position += 8 * count
+        self._byte_lengths = view[position:position + 4 * count].cast("I")
+        position += 4 * count
+        self._char_lengths = view[position:position + 4 * count].cast("I")
+        position += 4 * count
+        self._viable_positions = []
+        for _ in range(num_of_levels):
+            (num_viable,) = _COUNT.unpack_from(self._index_map, position)
+            position += _COUNT.size
+            self._viable_positions.append(
+                view[position:position + 8 * num_viable].cast("Q"))
+            position += 8 * num_viable
+
+    def __enter__(self) -> "SentenceIndex":
+        """Returns the index, so it can be used in a with statement."""
+        return self
+
+    def __exit__(self, *_):
+        """Closes the index at the end of a with statement."""
+        self.close()
+
+    @property
+    def num_of_sentences(self) -> int:
+        """Getter method for num_of_sentences property"""
+        return len(self._offsets)
+
+    @staticmethod
+    def get_index_path(path: str) -> str:
+        """Gets the path of a sentence file's index.
+
+        Parameters
+        ----------
+        path
+            The path of the sentence file.
+
+        Returns
+        -------
+        str
+            The path with '.idx' added to the end.
+        """
+        return path + INDEX_SUFFIX
+
+    @staticmethod
+    def build(path: str, char_limits: Sequence[int]):
+        """Builds the index for a sentence file.
+
+        The file is read once, a line at a time, and the index is written to
+        a temporary file that replaces the old index in one step. Each build
+        has its own temporary file, so the same file can be indexed by
+        several threads or processes at once.
+
+        Parameters
+        ----------
+        path
+            The path of the sentence file.
+        char_limits
+            The character limit for sentences for each difficulty level.
+
+        Raises
+        ------
+        OSError
+            If the file can't be read or the index can't be written, in
+            which case no temporary file is left behind.
+        """
+        stat = os.stat(path)
+        offsets = array.array("Q")
+        byte_lengths = array.array("I")
+        char_lengths = array.array("I")
+        viable_positions = [array.array("Q") for _ in char_limits]
+        max_char_limit = max(char_limits)
+
+        with open(path, "rb") as file:
+            offset = 0
+            for line in file:
+                stripped_line = line.strip()
+                text = stripped_line.decode("utf-8", "replace")
+                if SentenceFileHelper.is_sentence(text):
+                    position = len(offsets)
+                    offsets.append(offset + line.index(stripped_line))
+                    byte_lengths.append(len(stripped_line))
+                    char_lengths.append(len(text))
+                    # Viability only differs by character limit, so the
+                    # rest of the checks are made once per sentence
+                    if SentenceFileHelper.is_viable_for_translation(
+                            text, max_char_limit):
+                        for level, char_limit in enumerate(char_limits):
+                            if len(text) <= char_limit:
+                                viable_positions[level].append(position)
+                offset += len(line)
+
+        index_path = SentenceIndex.get_index_path(path)
+        temporary_fd, temporary_path = tempfile.mkstemp(
+            prefix=os.path.basename(index_path) + ".",
+            dir=os.path.dirname(index_path))
+        try:
+            with open(temporary_fd, "wb") as index_file:
+                # The temporary file can only be read by its owner, so the
+                # index is given the sentence file's permissions instead
+                os.chmod(temporary_path, stat.st_mode & 0o666)
+                index_file.write(_HEADER.pack(
+                    _MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets),
+                    len(char_limits)))
+                offsets.tofile(index_file)
+                byte_lengths.tofile(index_file)
+                char_lengths.tofile(index_file)
+                for positions in viable_positions:
+                    index_file.write(_COUNT.pack(len(positions)))
+                    positions.tofile(index_file)
+            os.replace(temporary_path, index_path)
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    def get_sentence(self, position: int) -> str:
+        """Gets a sentence by its position in the file.
+
+        Parameters
+        ----------
+        position
+            The position of the sentence among the file's sentences.
+
+        Returns
+        -------
+        str
+            The sentence.
+        """
+        offset = self._offsets[position]
+        return self._file_map[
+            offset:offset + self._byte_lengths[position]].decode(
+                "utf-8", "replace")
+
+    def get_char_length(self, position: int) -> int:
+        """Gets the number of characters in a sentence.
+
+        Parameters
+        ----------
+        position
+            The position of the sentence among the file's sentences.
+
+        Returns
+        -------
+        int
+            The number of characters in the sentence.
+        """
+        return self._char_lengths[position]
+
+    def count_viable(self, difficulty_level: int) -> int:
+        """Counts the sentences viable for a difficulty level.
+
+        Parameters
+        ----------
+        difficulty_level
+            The difficulty level.
+
+        Returns
+        -------
+        int
+            The number of viable sentences.
+        """
+        return len(self._viable_positions[difficulty_level])
+
+    def sample(
+            self, difficulty_level: int, num_of_sentences: int) -> List[str]:
+        """Picks random sentences that are viable for a difficulty level.
+
+        Only the picked sentences are read, so this takes the same time
+        however big the file is.
+
+        Parameters
+        ----------
+        difficulty_level
+            The difficulty level.
+        num_of_sentences
+            The number of sentences to pick, which is reduced to the number
+            of viable sentences if there aren't enough.
+
+        Returns
+        -------
+        List[str]
+            The sentences, in a random order.
+        """
+        positions = self._viable_positions[difficulty_level]
+        picked = random.sample(
+            range(len(positions)), min(num_of_sentences, len(positions)))
+        return [self.get_sentence(positions[index]) for index in picked]
+
+    def close(self):
+        """Closes the sentence and index files."""
+        for view in (self._offsets, self._byte_lengths, self._char_lengths,
+                     *self._viable_positions):
+            view.release()
+        self._viable_positions = []
+        self._index_map.close()
+        self._index_file.close()
+        if isinstance(self._file_map, mmap.mmap):
+            self._file_map.close()
+        self._file.close()
+
+    @staticmethod
+    def _is_index_current(
+            path: str, index_path: str, num_of_levels: int) -> bool:
+        """Checks if a sentence file's index is up to date.
+
+        Parameters
+        ----------
+        path
+            The path of the sentence file.
+        index_path
+            The path of the index.
+        num_of_levels
+            The number of difficulty levels the index should have.
+
+        Returns
+        -------
+        bool
+            True if the index exists and was built from the file as it is
+            now, otherwise False.
+        """
+        try:
+            with open(index_path, "rb") as index_file:
+                header = index_file.read(_HEADER.size)
+            magic, size, mtime_ns, _, levels = _HEADER.unpack(header)
+        except (OSError, struct.error):
+            return False
+        stat = os.stat(path)
+        return (magic == _MAGIC and size == stat.st_size and
+                mtime_ns == stat.st_mtime_ns and levels == num_of_levels)
+
+
+def main(args: List[str] = None):
+    """Parses the command line arguments and builds the indexes.
+
+    Parameters
+    ----------
+    args : List[str]
+        The command line arguments, or None to use sys.argv.
+    """
+    from classes.gamesession import GameSession
+
+    parser = ArgumentParser(description="Index sentence files.")
+    parser.add_argument("paths", nargs="+")
+    options = parser.parse_args(args)
+
+    for path in options.paths:
+        SentenceIndex.build(path, GameSession.CHAR_LIMIT_PER_DIFFICULTY_LEVEL)
+        with SentenceIndex(
+                path, GameSession.CHAR_LIMIT_PER_DIFFICULTY_LEVEL) as index:
+            viable = ", ".join(
+                str(index.count_viable(level))
+                for level in range(
+                    len(GameSession.CHAR_LIMIT_PER_DIFFICULTY_LEVEL)))
+            print(f"{path}: {index.num_of_sentences} sentence(s), "
+                  f"viable per difficulty level: {viable}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Class for logging what happens in each game as JSON lines.
+
+Usage
+-----
+Events are only logged if the EVENT_LOG_FILE environment variable is set
+to the path of the log, e.g.:
+    EVENT_LOG_FILE=logs/events-{pid}.jsonl python3 run.py
+
+where '{pid}' is replaced with the process's ID. The log is rotated once it
+reaches EVENT_LOG_MAX_BYTES (default 10MB), keeping EVENT_LOG_BACKUP_COUNT
+old logs (default 5).
+"""
+from logging import Formatter, Logger, LogRecord
+from logging.handlers import (
+    QueueHandler, QueueListener, RotatingFileHandler)
+from os import environ as env
+from threading import Lock
+from typing import Any
+import atexit
+import json
+import logging
+import os
+import queue
+import time
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+# The number of events that can wait to be written before new ones are
+# dropped, so that a slow disk never holds up a game
+QUEUE_SIZE = 10000
+
+
+class _JsonFormatter(Formatter):
+    """Formats events as JSON on the writer's thread."""
+
+    def format(self, record: LogRecord) -> str:
+        """Formats an event as a line of JSON.
+
+        Parameters
+        ----------
+        record
+            The record, whose message is the event's fields.
+
+        Returns
+        -------
+        str
+            The event as JSON.
+        """
+        return json.dumps(record.msg, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Queues events without blocking, dropping them if the queue is full.
+
+    Attributes
+    ----------
+    num_of_dropped_events : int
+        The number of events dropped because the queue was full.
+    """
+
+    def __init__(self, event_queue: queue.Queue):
+        """Initialises the object with the queue to add events to."""
+        super().__init__(event_queue)
+        self.num_of_dropped_events = 0
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        """Leaves events as they are, so they're formatted by the writer."""
+        return record
+
+    def enqueue(self, record: LogRecord):
+        """Adds an event to the queue, unless it's full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.num_of_dropped_events += 1
+
+
+class EventLogService():
+    """Class for logging what happens in each game as JSON lines.
+
+    Events are added to a bounded queue and written by a background
+    thread to a rotating file, so logging never blocks a game. Each event
+    has the monotonic clock time it happened at, so the time between events
+    can be worked out later, as well as the wall clock time.
+
+    Attributes
+    ----------
+    _logger : Logger
+        The logger for events, or None if events aren't logged.
+    _handler : _DroppingQueueHandler
+        The handler that adds events to the queue.
+    _listener : QueueListener
+        The listener whose thread writes the queued events to file.
+    _is_configured : bool
+        True once the environment variables have been checked.
+    _lock : Lock
+        The lock for configuring the service.
+
+    Methods
+    -------
+    log_event(game_id: str, event: str, **fields: Any):
+        Logs an event for a game.
+    stop():
+        Writes the events still queued and stops the writer.
+    """
+
+    _logger: Logger = None
+    _handler: _DroppingQueueHandler = None
+    _listener: QueueListener = None
+    _is_configured: bool = False
+    _lock: Lock = Lock()
+
+    @classmethod
+    def log_event(cls, game_id: str, event: str, **fields: Any):
+        """Logs an event for a game.
+
+        Does nothing if EVENT_LOG_FILE isn't set. The writer is started with
+        the first event, so that forked processes each start their own.
+
+        Parameters
+        ----------
+        game_id
+            The ID of the game the event happened in.
+        event
+            The name of the event, such as 'game_start' or 'answer'.
+        fields
+            The event's details.
+        """
+        if not cls._is_configured:
+            cls._configure()
+        if cls._logger is None:
+            return
+        cls._logger.info({
+            "monotonic": time.monotonic(),
+            "time": time.time(),
+            "pid": os.getpid(),
+            "game_id": game_id,
+            "event": event,
+            **fields
+        })
+
+    @classmethod
+    def stop(cls):
+        """Writes the events still queued and stops the writer.
+
+        Logs how many events were dropped, if any were.
+        """
+        with cls._lock:
+            if cls._listener is None:
+                return
+            if cls._handler.num_of_dropped_events:
+                cls._handler.queue.put(logging.makeLogRecord({"msg": {
+                    "monotonic": time.monotonic(),
+                    "time": time.time(),
+                    "pid": os.getpid(),
+                    "event": "events_dropped",
+                    "count": cls._handler.num_of_dropped_events
+                }}))
+            cls._listener.stop()
+            for handler in cls._listener.handlers:
+                handler.close()
+            cls._logger.removeHandler(cls._handler)
+            cls._logger = None
+            cls._listener = None
+
+    @classmethod
+    def _configure(cls):
+        """Starts the writer if EVENT_LOG_FILE is set."""
+        with cls._lock:
+            if cls._is_configured:
+                return
+            cls._is_configured = True
+            path = env.get("EVENT_LOG_FILE")
+            if not path:
+                return
+
+            path = path.replace("{pid}", str(os.getpid()))
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            file_handler = RotatingFileHandler(
+                path,
+                maxBytes=int(
+                    env.get("EVENT_LOG_MAX_BYTES", DEFAULT_MAX_BYTES)),
+                backupCount=int(
+                    env.get("EVENT_LOG_BACKUP_COUNT", DEFAULT_BACKUP_COUNT)),
+                encoding="utf-8")
+            file_handler.setFormatter(_JsonFormatter())
+
+            event_queue = queue.Queue(QUEUE_SIZE)
+            cls._handler = _DroppingQueueHandler(event_queue)
+            cls._listener = QueueListener(event_queue, file_handler)
+            cls._logger = logging.getLogger("guess_the_language.events")
+            cls._logger.setLevel(logging.INFO)
+            cls._logger.propagate = False
+            cls._logger.addHandler(cls._handler)
+            cls._listener.start()
+            atexit.register(cls.stop)
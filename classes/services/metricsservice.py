@@ -0,0 +1,397 @@
+"""Class for recording how long each stage of a question takes.
+
+Usage
+-----
+Timings are always recorded in memory. To export them when the process
+exits, set either or both of these environment variables:
+    METRICS_FILE=/tmp/guess-the-language-{pid}.prom
+    METRICS_SUMMARY_FILE=/tmp/guess-the-language-{pid}.json
+
+where '{pid}' is replaced with the process's ID, so that each game
+process writes its own file. The game server also serves the metrics at
+'/metrics'.
+"""
+from bisect import bisect_left
+from os import environ as env
+from threading import Lock
+from typing import Any, Dict, List, Tuple
+import atexit
+import json
+import os
+
+METRIC_NAME = "guess_the_language_question_stage_seconds"
+STAGES = [
+    "generation", "cache_lookup", "deepl_round_trip", "json_decode",
+    "render", "think_time"
+]
+LABEL_NAMES = ("stage", "difficulty", "input_mode", "language")
+# Upper bounds of the histogram buckets in seconds, from cache lookups of
+# a few microseconds to answers that take a long time to think about
+BUCKETS = [
+    0.00001, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+]
+
+
+class Histogram():
+    """Class for counting timings in buckets.
+
+    Attributes
+    ----------
+    _bucket_counts : List[int]
+        The number of timings in each bucket, with the last bucket holding
+        the timings greater than the largest bound.
+    _count : int
+        The number of timings.
+    _sum : float
+        The total of the timings.
+    _min : float
+        The smallest timing.
+    _max : float
+        The largest timing.
+
+    Properties
+    ----------
+    count : int
+        Getter method for count property.
+
+    Methods
+    -------
+    observe(seconds: float):
+        Adds a timing.
+    get_cumulative_counts() -> List[int]:
+        Gets the number of timings up to each bucket's bound.
+    get_percentile(percentile: float) -> float:
+        Estimates a percentile from the buckets.
+    get_summary() -> Dict[str, float]:
+        Summarises the timings.
+    merge(other: Histogram):
+        Adds the timings from another histogram.
+    get_prometheus_lines(labels: str) -> List[str]:
+        Formats the histogram in the Prometheus text format.
+    """
+
+    def __init__(self):
+        """Initialises the object with no timings."""
+        self._bucket_counts = [0] * (len(BUCKETS) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min = 0.0
+        self._max = 0.0
+
+    @property
+    def count(self) -> int:
+        """Getter method for count property"""
+        return self._count
+
+    def observe(self, seconds: float):
+        """Adds a timing.
+
+        Parameters
+        ----------
+        seconds
+            The timing in seconds.
+        """
+        self._bucket_counts[bisect_left(BUCKETS, seconds)] += 1
+        self._min = min(self._min, seconds) if self._count else seconds
+        self._count += 1
+        self._sum += seconds
+        self._max = max(self._max, seconds)
+
+    def get_cumulative_counts(self) -> List[int]:
+        """Gets the number of timings up to each bucket's bound.
+
+        Returns
+        -------
+        List[int]
+            The count for each bound in BUCKETS, followed by the count of
+            all timings.
+        """
+        counts = []
+        total = 0
+        for bucket_count in self._bucket_counts:
+            total += bucket_count
+            counts.append(total)
+        return counts
+
+    def get_percentile(self, percentile: float) -> float:
+        """Estimates a percentile from the buckets.
+
+        The estimate is interpolated within the bucket the percentile falls
+        in, in the same way as Prometheus' histogram_quantile(), and kept
+        within the smallest and largest timings.
+
+        Parameters
+        ----------
+        percentile
+            The percentile, from 0 to 100.
+
+        Returns
+        -------
+        float
+            The estimated timing in seconds, or 0.0 if there are no timings.
+        """
+        if not self._count:
+            return 0.0
+        rank = self._count * percentile / 100
+        lower_count = 0
+        for index, count in enumerate(self.get_cumulative_counts()):
+            if count >= rank:
+                if index == len(BUCKETS):
+                    return self._max
+                lower_bound = BUCKETS[index - 1] if index else 0.0
+                in_bucket = count - lower_count
+                fraction = (rank - lower_count) / in_bucket
+                estimate = lower_bound + (
+                    BUCKETS[index] - lower_bound) * fraction
+                return min(max(estimate, self._min), self._max)
+            lower_count = count
+        return self._max
+
+    def get_summary(self) -> Dict[str, float]:
+        """Summarises the timings.
+
+        Returns
+        -------
+        Dict[str, float]
+            The number of timings, their total, mean and maximum, and
+            estimates of their 50th, 90th and 99th percentiles.
+        """
+        return {
+            "count": self._count,
+            "sum": round(self._sum, 6),
+            "mean": round(self._sum / self._count, 6) if self._count else 0.0,
+            "p50": round(self.get_percentile(50), 6),
+            "p90": round(self.get_percentile(90), 6),
+            "p99": round(self.get_percentile(99), 6),
+            "max": round(self._max, 6)
+        }
+
+    def merge(self, other: "Histogram"):
+        """Adds the timings from another histogram.
+
+        Parameters
+        ----------
+        other
+            The histogram to add the timings from.
+        """
+        for index, bucket_count in enumerate(other._bucket_counts):
+            self._bucket_counts[index] += bucket_count
+        if other._count:
+            self._min = (min(self._min, other._min) if self._count
+                         else other._min)
+        self._count += other._count
+        self._sum += other._sum
+        self._max = max(self._max, other._max)
+
+    def get_prometheus_lines(self, labels: str) -> List[str]:
+        """Formats the histogram in the Prometheus text format.
+
+        Parameters
+        ----------
+        labels
+            The histogram's labels, formatted as 'name="value",...'.
+
+        Returns
+        -------
+        List[str]
+            The histogram's bucket, sum and count lines.
+        """
+        lines = []
+        for bound, count in zip(
+                BUCKETS + ["+Inf"], self.get_cumulative_counts()):
+            lines.append(
+                f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f"{METRIC_NAME}_sum{{{labels}}} {self._sum}")
+        lines.append(f"{METRIC_NAME}_count{{{labels}}} {self._count}")
+        return lines
+
+
+class MetricsService():
+    """Class for recording how long each stage of a question takes.
+
+    Timings are kept in a histogram for each stage, difficulty level, input
+    mode and target language, shared by every game in the process.
+
+    Attributes
+    ----------
+    _histograms : Dict[Tuple[str, str, str, str], Histogram]
+        The histograms by stage, difficulty, input mode and language.
+    _lock : Lock
+        The lock for the histograms, since timings are recorded from
+        several threads.
+    _are_exporters_installed : bool
+        True once the exporters set by environment variables have been
+        registered to run at exit.
+
+    Methods
+    -------
+    record(
+            stage: str, seconds: float, difficulty: str, input_mode: str,
+            language: str):
+        Records how long a stage of a question took.
+    get_prometheus_text() -> str:
+        Formats every histogram in the Prometheus text format.
+    get_summary() -> Dict[str, Any]:
+        Summarises every histogram.
+    write_prometheus_file(path: str):
+        Writes every histogram to a Prometheus text file.
+    write_summary_file(path: str):
+        Writes a JSON summary of every histogram.
+    export():
+        Writes the metrics to the files set by environment variables.
+    install_exporters():
+        Exports the metrics when the process exits.
+    reset():
+        Removes every timing.
+    """
+
+    _histograms: Dict[Tuple[str, str, str, str], Histogram] = {}
+    _lock: Lock = Lock()
+    _are_exporters_installed: bool = False
+
+    @classmethod
+    def record(
+            cls, stage: str, seconds: float, difficulty: str,
+            input_mode: str, language: str):
+        """Records how long a stage of a question took.
+
+        Parameters
+        ----------
+        stage
+            The stage, one of STAGES.
+        seconds
+            The number of seconds the stage took.
+        difficulty
+            The name of the game's difficulty level.
+        input_mode
+            The name of the game's input mode.
+        language
+            The name of the question's target language.
+        """
+        key = (stage, difficulty, input_mode, language)
+        with cls._lock:
+            histogram = cls._histograms.get(key)
+            if histogram is None:
+                histogram = cls._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @classmethod
+    def get_prometheus_text(cls) -> str:
+        """Formats every histogram in the Prometheus text format.
+
+        Returns
+        -------
+        str
+            The metrics, as served to or scraped by Prometheus.
+        """
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each stage of a question.",
+            f"# TYPE {METRIC_NAME} histogram"
+        ]
+        with cls._lock:
+            for key, histogram in sorted(cls._histograms.items()):
+                labels = ",".join(
+                    f'{name}="{value}"'
+                    for name, value in zip(LABEL_NAMES, key))
+                lines.extend(histogram.get_prometheus_lines(labels))
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def get_summary(cls) -> Dict[str, Any]:
+        """Summarises every histogram.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The summary of each stage over all games, and of each stage for
+            each combination of labels.
+        """
+        with cls._lock:
+            items = sorted(cls._histograms.items())
+            stages = {}
+            for stage in STAGES:
+                combined = Histogram()
+                for key, histogram in items:
+                    if key[0] == stage:
+                        combined.merge(histogram)
+                if combined.count:
+                    stages[stage] = combined.get_summary()
+            return {
+                "stages": stages,
+                "histograms": [
+                    dict(zip(LABEL_NAMES, key), **histogram.get_summary())
+                    for key, histogram in items
+                ]
+            }
+
+    @classmethod
+    def write_prometheus_file(cls, path: str):
+        """Writes every histogram to a Prometheus text file.
+
+        The file is replaced in one step, so a collector never reads it
+        half-written.
+
+        Parameters
+        ----------
+        path
+            The path of the file.
+        """
+        cls._write_file(path, cls.get_prometheus_text())
+
+    @classmethod
+    def write_summary_file(cls, path: str):
+        """Writes a JSON summary of every histogram.
+
+        Parameters
+        ----------
+        path
+            The path of the file.
+        """
+        cls._write_file(path, json.dumps(cls.get_summary(), indent=2) + "\n")
+
+    @classmethod
+    def export(cls):
+        """Writes the metrics to the files set by environment variables.
+
+        METRICS_FILE is the path of a Prometheus text file and
+        METRICS_SUMMARY_FILE the path of a JSON summary, with '{pid}' in
+        either replaced with the process's ID.
+        """
+        prometheus_path = env.get("METRICS_FILE")
+        summary_path = env.get("METRICS_SUMMARY_FILE")
+        if prometheus_path:
+            cls.write_prometheus_file(
+                prometheus_path.replace("{pid}", str(os.getpid())))
+        if summary_path:
+            cls.write_summary_file(
+                summary_path.replace("{pid}", str(os.getpid())))
+
+    @classmethod
+    def install_exporters(cls):
+        """Exports the metrics when the process exits."""
+        if not cls._are_exporters_installed:
+            cls._are_exporters_installed = True
+            atexit.register(cls.export)
+
+    @classmethod
+    def reset(cls):
+        """Removes every timing."""
+        with cls._lock:
+            cls._histograms.clear()
+
+    @staticmethod
+    def _write_file(path: str, text: str):
+        """Writes text to a file through a temporary file.
+
+        Parameters
+        ----------
+        path
+            The path of the file.
+        text
+            The text to write.
+        """
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(temporary_path, path)
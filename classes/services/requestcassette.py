@@ -0,0 +1,250 @@
+"""Class for recording responses to requests and replaying them.
+
+Usage
+-----
+To record the DeepL API's responses while playing, set REQUEST_CASSETTE
+to the path of the cassette and REQUEST_CASSETTE_MODE to 'record', e.g.:
+    REQUEST_CASSETTE=deepl.jsonl REQUEST_CASSETTE_MODE=record \\
+        python3 -m classes.headlessgame --games 10 --seed 1
+
+Running the same command with REQUEST_CASSETTE_MODE set to 'replay' (the
+default) then serves the recorded responses without a network or API key,
+each after the latency it was recorded with, or straight away if
+REQUEST_CASSETTE_LATENCY is set to 'zero'.
+"""
+from threading import Lock
+from typing import Any, Dict, List
+import json
+import time
+import requests
+from classes.services.requestservice import RequestService
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = [RECORD, REPLAY]
+# Parameters that are never written to a cassette, nor used to match
+# requests to their responses
+SECRET_PARAMS = ["auth_key"]
+
+
+class RequestCassette():
+    """Class for recording responses to requests and replaying them.
+
+    Can be set as the RequestService's handler. When recording, requests
+    are sent as normal and each response's status, body and latency is
+    added to the cassette as a line of JSON. When replaying, requests are
+    answered with the responses recorded for the same endpoint and
+    parameters, in the order they were recorded.
+
+    Attributes
+    ----------
+    _path : str
+        The path of the cassette.
+    _mode : str
+        'record' or 'replay'.
+    _use_recorded_latency : bool
+        True to wait for as long as each response took when it was
+        recorded before replaying it, otherwise False.
+    _recordings : Dict[str, List[Dict[str, Any]]]
+        The responses to replay, by request.
+    _num_of_replays : Dict[str, int]
+        The number of times each request has been replayed.
+    _lock : Lock
+        The lock for writing to and replaying from the cassette.
+
+    Properties
+    ----------
+    mode : str
+        Getter method for mode property.
+
+    Methods
+    -------
+    get_key(endpoint: str, params: Dict[str, Any] = None) -> str:
+        Gets the key requests are matched to their responses with.
+    handle_request(
+            endpoint: str, params: Dict[str, Any] = None) -> requests.Response:
+        Records the response to a request or replays it.
+    """
+
+    def __init__(
+            self, path: str, mode: str = REPLAY,
+            use_recorded_latency: bool = True):
+        """Initialises the object with the passed parameters.
+
+        Parameters
+        ----------
+        path
+            The path of the cassette. Recordings are added to the end of
+            it, so it should be deleted first to record it afresh.
+        mode
+            'record' or 'replay'.
+        use_recorded_latency
+            True to wait for as long as each response took when it was
+            recorded before replaying it, otherwise False.
+
+        Raises
+        ------
+        ValueError
+            If the mode isn't 'record' or 'replay'.
+        FileNotFoundError
+            If the cassette to replay doesn't exist.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self._path = path
+        self._mode = mode
+        self._use_recorded_latency = use_recorded_latency
+        self._recordings: Dict[str, List[Dict[str, Any]]] = {}
+        self._num_of_replays: Dict[str, int] = {}
+        self._lock = Lock()
+        if mode == REPLAY:
+            with open(path, encoding="utf-8") as cassette:
+                for line in cassette:
+                    if line.strip():
+                        recording = json.loads(line)
+                        self._recordings.setdefault(RequestCassette.get_key(
+                            recording["endpoint"], recording["params"]),
+                            []).append(recording)
+
+    @property
+    def mode(self) -> str:
+        """Getter method for mode property"""
+        return self._mode
+
+    @staticmethod
+    def get_key(endpoint: str, params: Dict[str, Any] = None) -> str:
+        """Gets the key requests are matched to their responses with.
+
+        Parameters
+        ----------
+        endpoint
+            The URL of the request.
+        params
+            The request's parameters.
+
+        Returns
+        -------
+        str
+            The endpoint and parameters, without any secrets, as JSON.
+        """
+        return json.dumps(
+            [endpoint, _remove_secrets(params)], ensure_ascii=False,
+            sort_keys=True, separators=(",", ":"))
+
+    def handle_request(
+            self, endpoint: str,
+            params: Dict[str, Any] = None) -> requests.Response:
+        """Records the response to a request or replays it.
+
+        Parameters
+        ----------
+        endpoint
+            The URL of the request.
+        params
+            The request's parameters.
+
+        Returns
+        -------
+        requests.Response
+            The response, as sent by the server or as recorded.
+
+        Raises
+        ------
+        requests.ConnectionError
+            If no response was recorded for the request, as it can't be
+            answered without a connection.
+        """
+        if self._mode == RECORD:
+            return self._record(endpoint, params)
+        return self._replay(
+            RequestCassette.get_key(endpoint, params), endpoint)
+
+    def _record(
+            self, endpoint: str,
+            params: Dict[str, Any]) -> requests.Response:
+        """Sends a request and adds its response to the cassette.
+
+        Parameters
+        ----------
+        endpoint
+            The URL of the request.
+        params
+            The request's parameters.
+
+        Returns
+        -------
+        requests.Response
+            The server's response.
+        """
+        start = time.perf_counter()
+        response = RequestService.send_get_request(endpoint, params)
+        latency = time.perf_counter() - start
+        line = json.dumps({
+            "endpoint": endpoint,
+            "params": _remove_secrets(params),
+            "status": response.status_code,
+            "latency": round(latency, 6),
+            "content_type": response.headers.get("Content-Type"),
+            "body": response.content.decode("utf-8", "replace")
+        }, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            with open(self._path, "a", encoding="utf-8") as cassette:
+                cassette.write(line + "\n")
+        return response
+
+    def _replay(self, key: str, endpoint: str) -> requests.Response:
+        """Replays the next response recorded for a request.
+
+        Once every response recorded for the request has been replayed,
+        they're replayed again from the first.
+
+        Parameters
+        ----------
+        key
+            The request's key.
+        endpoint
+            The URL of the request.
+
+        Returns
+        -------
+        requests.Response
+            The recorded response.
+        """
+        with self._lock:
+            recordings = self._recordings.get(key)
+            if not recordings:
+                raise requests.ConnectionError(
+                    f"No response was recorded in {self._path} for this "
+                    "request")
+            num_of_replays = self._num_of_replays.get(key, 0)
+            self._num_of_replays[key] = num_of_replays + 1
+        recording = recordings[num_of_replays % len(recordings)]
+        if self._use_recorded_latency:
+            time.sleep(recording["latency"])
+
+        response = requests.Response()
+        response.status_code = recording["status"]
+        response.url = endpoint
+        response.encoding = "utf-8"
+        if recording.get("content_type"):
+            response.headers["Content-Type"] = recording["content_type"]
+        response._content = recording["body"].encode("utf-8")
+        return response
+
+
+def _remove_secrets(params: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Removes the parameters that mustn't be written to a cassette.
+
+    Parameters
+    ----------
+    params
+        A request's parameters.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The parameters, without any secrets such as the API key.
+    """
+    return {
+        name: value for name, value in (params or {}).items()
+        if name not in SECRET_PARAMS}
@@ -1,11 +1,39 @@
-"""Class for making HTTP requests."""
-from typing import Dict
-import requests
+"""Class for making HTTP requests.
+
+Usage
+-----
+Responses can be recorded to a cassette and replayed from it, instead of
+being sent, by setting the REQUEST_CASSETTE environment variable. See
+classes/services/requestcassette.py for details.
+"""
+from os import environ as env
+from threading import Lock
+from typing import Callable, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import requests
 
 
 class RequestService():
     """Class for making HTTP requests.
 
+    Attributes
+    ----------
+    REQUEST_TIMEOUT: float
+        The number of seconds to wait for a server before giving up.
+    _session : requests.Session
+        The session shared by every request, so that connections to the
+        same host are pooled and reused, even across games. It's created
+        with the first request, so the requests library isn't imported
+        until it's needed.
+    _handler : Callable[[str, Dict[str, str]], requests.Response]
+        The function that handles requests instead of sending them, if one
+        has been set.
+    _is_configured : bool
+        True once the environment variables have been checked.
+    _lock : Lock
+        The lock for configuring the service.
+
     Methods
     -------
     make_get_request(
@@ -13,18 +41,94 @@ class RequestService():
             endpoint: str,
             params: Dict[str, str] = None) -> requests.Response:
         Makes HTTP request using the given parameters.
+    send_get_request(
+            endpoint: str,
+            params: Dict[str, str] = None) -> requests.Response:
+        Sends HTTP request, even if a handler has been set.
+    set_handler(
+            handler: Callable[[str, Dict[str, str]], requests.Response]):
+        Sets the function that handles requests instead of sending them.
     """
 
-    @staticmethod
+    REQUEST_TIMEOUT: float = 10.0
+    _session: "requests.Session" = None
+    _handler: Callable[[str, Dict[str, str]], "requests.Response"] = None
+    _is_configured: bool = False
+    _lock: Lock = Lock()
+
+    @classmethod
     def make_get_request(
-            endpoint: str, params: Dict[str, str] = None) -> requests.Response:
+            cls, endpoint: str,
+            params: Dict[str, str] = None) -> "requests.Response":
         """Makes HTTP request using given arguments and returns response.
 
+        The request is handled by the handler instead, if one has been set
+        or REQUEST_CASSETTE is set.
+
+        Returns
+        -------
+        requests.Response
+            The request's response object.
+        """
+        if not cls._is_configured:
+            cls._configure()
+        if cls._handler is not None:
+            return cls._handler(endpoint, params)
+        return cls.send_get_request(endpoint, params)
+
+    @classmethod
+    def send_get_request(
+            cls, endpoint: str,
+            params: Dict[str, str] = None) -> "requests.Response":
+        """Sends HTTP request using given arguments and returns response,
+        even if a handler has been set.
+
         Returns
         -------
         requests.Response
             The request's response object.
         """
+        if cls._session is None:
+            import requests
+            cls._session = requests.Session()
         if params:
-            return requests.get(endpoint, params)
-        return requests.get(endpoint)
+            return cls._session.get(
+                endpoint, params=params, timeout=cls.REQUEST_TIMEOUT)
+        return cls._session.get(endpoint, timeout=cls.REQUEST_TIMEOUT)
+
+    @classmethod
+    def set_handler(
+            cls,
+            handler: Callable[[str, Dict[str, str]], "requests.Response"]):
+        """Sets the function that handles requests instead of sending them.
+
+        Used to play games without a connection to the translation API,
+        such as when benchmarking.
+
+        Parameters
+        ----------
+        handler
+            The function to call with each request's endpoint and
+            parameters, or None to send requests again.
+        """
+        cls._handler = handler
+
+    @classmethod
+    def _configure(cls):
+        """Sets a cassette as the handler if REQUEST_CASSETTE is set and
+        no other handler has been."""
+        with cls._lock:
+            if cls._is_configured:
+                return
+            cls._is_configured = True
+            path = env.get("REQUEST_CASSETTE")
+            if not path or cls._handler is not None:
+                return
+
+            from classes.services.requestcassette import (
+                RequestCassette, REPLAY)
+            cassette = RequestCassette(
+                path, env.get("REQUEST_CASSETTE_MODE", REPLAY).lower(),
+                env.get("REQUEST_CASSETTE_LATENCY", "recorded").lower() !=
+                "zero")
+            cls._handler = cassette.handle_request
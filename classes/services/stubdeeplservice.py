@@ -0,0 +1,91 @@
+"""Class for answering translation requests without the DeepL API."""
+from typing import Dict
+import json
+import time
+import requests
+
+
+class StubDeepLService():
+    """Class for answering translation requests without the DeepL API.
+
+    Can be set as the RequestService's handler so games can be played
+    offline, with responses in the same format as the DeepL API's.
+
+    Attributes
+    ----------
+    _latency : float
+        The number of seconds to wait before each response, to stand in for
+        the time taken by the real API.
+    _num_of_requests : int
+        The number of requests answered.
+
+    Properties
+    ----------
+    num_of_requests : int
+        Getter method for num_of_requests property.
+
+    Methods
+    -------
+    handle_request(
+            endpoint: str, params: Dict[str, str] = None) -> requests.Response:
+        Returns a translation in the same format as the DeepL API.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        """Initialises the object with the passed parameters.
+
+        Parameters
+        ----------
+        latency
+            The number of seconds to wait before each response.
+        """
+        self._latency = latency
+        self._num_of_requests = 0
+
+    @property
+    def num_of_requests(self) -> int:
+        """Getter method for num_of_requests property"""
+        return self._num_of_requests
+
+    def handle_request(
+            self, endpoint: str,
+            params: Dict[str, str] = None) -> requests.Response:
+        """Returns a translation in the same format as the DeepL API.
+
+        The translation is the original text marked with the target
+        language's code, so it can be told apart from a real one.
+
+        Parameters
+        ----------
+        endpoint
+            The URL the request would have been sent to.
+        params
+            The request's parameters, including the text, or list of texts,
+            and the target language.
+
+        Returns
+        -------
+        requests.Response
+            The response, as if from the DeepL API.
+        """
+        self._num_of_requests += 1
+        if self._latency:
+            time.sleep(self._latency)
+
+        params = params or {}
+        texts = params.get("text", [])
+        if isinstance(texts, str):
+            texts = [texts]
+        body = {
+            "translations": [{
+                "detected_source_language": params.get("source_lang", "EN"),
+                "text": f"[{params.get('target_lang', '')}] {text}"
+            } for text in texts]
+        }
+        response = requests.Response()
+        response.status_code = 200
+        response.url = endpoint
+        response.encoding = "utf-8"
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(body).encode("utf-8")
+        return response
@@ -0,0 +1,286 @@
+"""Class for profiling games while they're played.
+
+Usage
+-----
+Profiling is off unless the PROFILE environment variable lists what to
+collect, e.g.:
+    PROFILE=cprofile,tracemalloc,watchdog PROFILE_SAMPLE_RATE=0.05 \\
+        python3 run.py
+
+which profiles 1 in 20 games and writes each one's files to the 'profiles'
+directory, or to PROFILE_DIR if it's set:
+    * cprofile - a '.prof' file of the game loop's calls, which can be read
+    with 'python3 -m pstats'.
+    * tracemalloc - a '.tracemalloc' snapshot of the memory allocated by
+    the end of the game, which can be read with tracemalloc.Snapshot.load().
+    * watchdog - a '.stacks.txt' file with the stack of every thread,
+    written whenever generating a sentence, translating or responding to
+    the player takes longer than PROFILE_STEP_THRESHOLD seconds (default 5).
+"""
+from contextlib import contextmanager
+from os import environ as env
+from threading import Lock, Thread
+from typing import Dict, Iterator, Set
+import asyncio
+import faulthandler
+import itertools
+import os
+import random
+import time
+
+PROFILERS = ["cprofile", "tracemalloc", "watchdog"]
+DEFAULT_PROFILE_DIRECTORY = "profiles"
+DEFAULT_STEP_THRESHOLD = 5.0
+
+
+class SessionProfiler():
+    """Class for profiling a single game while it's played.
+
+    Each game gets its own profiler, which does nothing unless profiling is
+    enabled and the game is picked by the sample rate. Only one game in a
+    process can be run under cProfile at a time, so other games played at
+    the same time aren't given cProfile files.
+
+    Attributes
+    ----------
+    _profilers : Set[str]
+        The profilers enabled for the game.
+    _threshold : float
+        The number of seconds a step can take before the stacks are dumped.
+    _path_prefix : str
+        The path of the game's files, without their extensions.
+    _profile : cProfile.Profile
+        The game's cProfile profiler, if it's running.
+    _steps : Dict[str, float]
+        The performance counter time each running step started at, by name.
+    _dumped_steps : Set[str]
+        The running steps the stacks have already been dumped for.
+    _last_tick : float
+        The performance counter time the event loop last responded at.
+    _heartbeat : asyncio.Task
+        The task that notes when the event loop responds.
+    _session_numbers : Iterator[int]
+        The numbers given to profiled games, in order.
+    _is_cprofile_in_use : bool
+        True if a game is being run under cProfile.
+    _num_tracing_memory : int
+        The number of games that need tracemalloc to be running.
+    _watched : Set[SessionProfiler]
+        The profilers being watched by the watchdog.
+    _watchdog : Thread
+        The thread that checks for steps taking too long, once started.
+    _lock : Lock
+        The lock for the class attributes and running steps.
+
+    Properties
+    ----------
+    is_enabled : bool
+        Getter method for is_enabled property.
+
+    Methods
+    -------
+    start():
+        Starts profiling the game.
+    step(name: str) -> Iterator[None]:
+        Watches a step of the game for taking too long.
+    stop():
+        Stops profiling the game and writes its files.
+    """
+
+    _session_numbers: Iterator[int] = itertools.count(1)
+    _is_cprofile_in_use: bool = False
+    _num_tracing_memory: int = 0
+    _watched: Set["SessionProfiler"] = set()
+    _watchdog: Thread = None
+    _lock: Lock = Lock()
+
+    def __init__(self):
+        """Initialises the object from the environment variables."""
+        profilers = {
+            name.strip().lower()
+            for name in env.get("PROFILE", "").split(",") if name.strip()}
+        sample_rate = float(env.get("PROFILE_SAMPLE_RATE", "1"))
+        if profilers and random.random() >= sample_rate:
+            profilers = set()
+        self._profilers = profilers & set(PROFILERS)
+        self._threshold = float(
+            env.get("PROFILE_STEP_THRESHOLD", DEFAULT_STEP_THRESHOLD))
+        self._path_prefix = None
+        self._profile = None
+        self._steps: Dict[str, float] = {}
+        self._dumped_steps: Set[str] = set()
+        self._last_tick = 0.0
+        self._heartbeat = None
+
+    @property
+    def is_enabled(self) -> bool:
+        """Getter method for is_enabled property"""
+        return bool(self._profilers)
+
+    def start(self):
+        """Starts profiling the game.
+
+        Must be called from the event loop the game is played on, so that
+        the watchdog can tell when the loop stops responding.
+        """
+        if not self.is_enabled:
+            return
+        directory = env.get("PROFILE_DIR", DEFAULT_PROFILE_DIRECTORY)
+        os.makedirs(directory, exist_ok=True)
+        self._path_prefix = os.path.join(
+            directory,
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+            f"-{next(SessionProfiler._session_numbers)}")
+
+        with SessionProfiler._lock:
+            if "tracemalloc" in self._profilers:
+                import tracemalloc
+                if not SessionProfiler._num_tracing_memory:
+                    tracemalloc.start()
+                SessionProfiler._num_tracing_memory += 1
+            if ("cprofile" in self._profilers and
+                    not SessionProfiler._is_cprofile_in_use):
+                import cProfile
+                SessionProfiler._is_cprofile_in_use = True
+                self._profile = cProfile.Profile()
+                self._profile.enable()
+
+        if "watchdog" in self._profilers:
+            self._last_tick = time.perf_counter()
+            self._heartbeat = asyncio.ensure_future(self._beat())
+            self._watch()
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Watches a step of the game for taking too long.
+
+        Parameters
+        ----------
+        name
+            The name of the step, such as 'generation' or 'translation'.
+        """
+        if self._heartbeat is None:
+            yield
+            return
+        with SessionProfiler._lock:
+            self._steps[name] = time.perf_counter()
+        try:
+            yield
+        finally:
+            with SessionProfiler._lock:
+                del self._steps[name]
+                self._dumped_steps.discard(name)
+
+    def stop(self):
+        """Stops profiling the game and writes its files."""
+        if not self.is_enabled or self._path_prefix is None:
+            return
+        path_prefix = self._path_prefix
+
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+            with SessionProfiler._lock:
+                SessionProfiler._watched.discard(self)
+
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(f"{path_prefix}.prof")
+            self._profile = None
+            with SessionProfiler._lock:
+                SessionProfiler._is_cprofile_in_use = False
+
+        if "tracemalloc" in self._profilers:
+            import tracemalloc
+            tracemalloc.take_snapshot().dump(f"{path_prefix}.tracemalloc")
+            with SessionProfiler._lock:
+                SessionProfiler._num_tracing_memory -= 1
+                if not SessionProfiler._num_tracing_memory:
+                    tracemalloc.stop()
+        self._path_prefix = None
+
+    async def _beat(self):
+        """Notes when the event loop responds, until cancelled."""
+        while True:
+            self._last_tick = time.perf_counter()
+            await asyncio.sleep(self._threshold / 4)
+
+    def _watch(self):
+        """Adds the profiler to those checked by the watchdog, starting the
+        watchdog if it isn't running."""
+        with SessionProfiler._lock:
+            SessionProfiler._watched.add(self)
+            if SessionProfiler._watchdog is None:
+                SessionProfiler._watchdog = Thread(
+                    target=SessionProfiler._run_watchdog,
+                    name="profiling-watchdog", daemon=True)
+                SessionProfiler._watchdog.start()
+
+    def _get_slow_steps(self, now: float) -> Dict[str, float]:
+        """Gets the steps that have taken too long and not been dumped.
+
+        Responding to the player counts as the 'prompt' step, which is
+        taking too long if the event loop hasn't responded in time.
+
+        Parameters
+        ----------
+        now
+            The current performance counter time.
+
+        Returns
+        -------
+        Dict[str, float]
+            The number of seconds each slow step has taken, by name.
+        """
+        steps = dict(self._steps)
+        # The heartbeat wakes every quarter of the threshold, so allow for
+        # that before deciding the loop has stopped responding
+        steps["prompt"] = self._last_tick + self._threshold / 4
+        slow_steps = {
+            name: now - started_at for name, started_at in steps.items()
+            if now - started_at > self._threshold and
+            name not in self._dumped_steps}
+        if now - steps["prompt"] <= self._threshold:
+            self._dumped_steps.discard("prompt")
+        return slow_steps
+
+    @staticmethod
+    def _dump_stacks(path_prefix: str, slow_steps: Dict[str, float]):
+        """Writes the stack of every thread to a game's stacks file.
+
+        Parameters
+        ----------
+        path_prefix
+            The path of the game's files, without their extensions.
+        slow_steps
+            The number of seconds each slow step has taken, by name.
+        """
+        with open(f"{path_prefix}.stacks.txt", "a") as file:
+            for name, seconds in slow_steps.items():
+                file.write(
+                    f"{time.strftime('%Y-%m-%d %H:%M:%S')} '{name}' has "
+                    f"taken {seconds:.1f}s\n")
+            file.flush()
+            faulthandler.dump_traceback(file, all_threads=True)
+            file.write("\n")
+
+    @staticmethod
+    def _run_watchdog():
+        """Checks every watched game for slow steps, forever."""
+        while True:
+            with SessionProfiler._lock:
+                watched = list(SessionProfiler._watched)
+                interval = min(
+                    (profiler._threshold for profiler in watched),
+                    default=DEFAULT_STEP_THRESHOLD) / 4
+            time.sleep(interval)
+            now = time.perf_counter()
+            for profiler in watched:
+                with SessionProfiler._lock:
+                    if profiler not in SessionProfiler._watched:
+                        continue
+                    slow_steps = profiler._get_slow_steps(now)
+                    profiler._dumped_steps.update(slow_steps)
+                    path_prefix = profiler._path_prefix
+                if slow_steps:
+                    SessionProfiler._dump_stacks(path_prefix, slow_steps)
@@ -0,0 +1,137 @@
+"""Class used to write a game's translations to file as they're made."""
+import os
+from classes.translation import Translation
+
+
+class TranslationWriter():
+    """Class used to write a game's translations to file as they're made.
+
+    Each translation is appended to a partial file as soon as it's made, so
+    nothing is kept in memory and no more than the current question is lost
+    if the game is stopped. The partial file is renamed to the output file
+    once the game is over, which either happens in full or not at all. The
+    file the sentences were read from is never changed. Each writer has
+    its own partial file, so games on the same file at once don't write
+    over each other's translations.
+
+    Attributes
+    ----------
+    PARTIAL_SUFFIX: str
+        The suffix added to the output path for the partial file.
+    _output_path : str
+        The path of the file to write the translations to.
+    _writer_id : str
+        The ID added to the output path for the partial file.
+    _file : TextIO
+        The partial file, once it has been opened.
+
+    Properties
+    ----------
+    output_path : str
+        Getter method for output_path property.
+    partial_path : str
+        Getter method for partial_path property.
+
+    Methods
+    -------
+    get_output_path(input_path: str) -> str:
+        Gets the path to write the translations of a sentence file to.
+    write_translation(
+            sentence: str, translation: Translation, note: str = None):
+        Appends a translation to the partial file.
+    save():
+        Replaces the output file with the partial file.
+    close():
+        Closes the partial file, leaving it in place.
+    """
+
+    PARTIAL_SUFFIX: str = ".partial"
+
+    def __init__(self, output_path: str, writer_id: str = None):
+        """Initialises the object with the passed parameters.
+
+        Parameters
+        ----------
+        output_path
+            The path of the file to write the translations to.
+        writer_id
+            The ID added to the output path for the partial file, such as
+            the game's ID. Defaults to the process ID.
+        """
+        self._output_path = output_path
+        self._writer_id = writer_id or str(os.getpid())
+        self._file = None
+
+    @property
+    def output_path(self) -> str:
+        """Getter method for output_path property"""
+        return self._output_path
+
+    @property
+    def partial_path(self) -> str:
+        """Getter method for partial_path property"""
+        return f"{self._output_path}.{self._writer_id}{self.PARTIAL_SUFFIX}"
+
+    @staticmethod
+    def get_output_path(input_path: str) -> str:
+        """Gets the path to write the translations of a sentence file to.
+
+        Parameters
+        ----------
+        input_path
+            The path of the file the sentences were read from.
+
+        Returns
+        -------
+        str
+            The input path with '.translations' before its extension, e.g:
+            sentences.txt --> sentences.translations.txt
+        """
+        root, extension = os.path.splitext(input_path)
+        return f"{root}.translations{extension or '.txt'}"
+
+    def write_translation(
+            self, sentence: str, translation: Translation, note: str = None):
+        """Appends a translation to the partial file.
+
+        The record is flushed straight away, so it's kept even if the process
+        is killed.
+
+        Parameters
+        ----------
+        sentence
+            The sentence that was translated.
+        translation
+            The translation.
+        note
+            A note to write after the translation, if any.
+        """
+        if self._file is None:
+            self._file = open(self.partial_path, mode="w", encoding="utf-8")
+        record = (
+            f"{sentence}\n"
+            f"Translation: {translation}\n"
+            f"Language: {translation.lang.get_user_friendly_name()}"
+        )
+        if note:
+            record += f"\n{note}"
+        self._file.write(f"{record}\n\n")
+        self._file.flush()
+
+    def save(self):
+        """Replaces the output file with the partial file.
+
+        The partial file is synced to disk first, so the output file is
+        never left half-written.
+        """
+        if self._file is None:
+            self._file = open(self.partial_path, mode="w", encoding="utf-8")
+        os.fsync(self._file.fileno())
+        self.close()
+        os.replace(self.partial_path, self._output_path)
+
+    def close(self):
+        """Closes the partial file, leaving it in place."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -1,5 +1,28 @@
 """Class used to represent a word"""
-from classes.enums.partofspeech import PartOfSpeech
+from classes.enums.partofspeech import (
+    PartOfSpeech, ADJECTIVE_FLAG, ADVERB_FLAG, AMOUNT_FLAG,
+    ARTICLE_OR_AMOUNT_FLAG, INDEFINITE_ARTICLE_FLAG, NOUN_FLAG,
+    PERSONAL_PRONOUN_FLAG, VERB_FLAG
+)
+
+# region Word bit flags
+# (these follow on from the part of speech category flags)
+BEING_FLAG = 1 << 9
+NAME_FLAG = 1 << 10
+PLACE_FLAG = 1 << 11
+POSSESSIVE_FLAG = 1 << 12
+PERSON_NOUN_FLAG = 1 << 13
+INTRANSITIVE_VERB_FLAG = 1 << 14
+IRREGULAR_VERB_FLAG = 1 << 15
+THIRD_PERSON_FLAG = 1 << 16
+# endregion
+
+_SPECIFICITY_FLAGS = {
+    "being": BEING_FLAG,
+    "name": NAME_FLAG,
+    "place": PLACE_FLAG,
+    "possessive": POSSESSIVE_FLAG
+}
 
 
 class Word():
@@ -15,6 +38,9 @@ class Word():
         The part of speech that the word falls under.
     _specificity : str
         The type of part of speech that the word falls under.
+    _flags : int
+        The bit flags for the word's part of speech and specificity,
+        precomputed so that each is_* check is a single bit operation.
 
     Methods
     -------
@@ -75,6 +101,18 @@ class Word():
         self._part_of_speech = part_of_speech
         self._specificity = specificity
 
+        flags = part_of_speech.flags | _SPECIFICITY_FLAGS.get(specificity, 0)
+        if flags & NOUN_FLAG and specificity in ("people", "name"):
+            flags |= PERSON_NOUN_FLAG
+        if flags & VERB_FLAG:
+            if specificity == "intransitive":
+                flags |= INTRANSITIVE_VERB_FLAG
+            if flags & (BEING_FLAG | POSSESSIVE_FLAG):
+                flags |= IRREGULAR_VERB_FLAG
+        if self._value in ("he", "she", "it"):
+            flags |= THIRD_PERSON_FLAG
+        self._flags = flags
+
     def __str__(self):
         """Modifies object string representation using when printing."""
         return self._value
@@ -111,7 +149,7 @@ class Word():
         bool
             Returns True if the given word is an adjective.
         """
-        return self._part_of_speech.is_an_adjective()
+        return bool(self._flags & ADJECTIVE_FLAG)
 
     def is_an_adverb(self) -> bool:
         """Checks if the given word is an adverb.
@@ -121,7 +159,7 @@ class Word():
         bool
             Returns True if the given word is an adverb.
         """
-        return self._part_of_speech.is_an_adverb()
+        return bool(self._flags & ADVERB_FLAG)
 
     def is_an_amount(self) -> bool:
         """Checks if the given word is an amount.
@@ -131,7 +169,7 @@ class Word():
         bool
             Returns True if the given word is an amount.
         """
-        return self._part_of_speech.is_an_amount()
+        return bool(self._flags & AMOUNT_FLAG)
 
     def is_an_article_or_amount(self) -> bool:
         """Checks if the given word is an article or amount.
@@ -141,7 +179,7 @@ class Word():
         bool
             Returns True if the given word is an article or amount.
         """
-        return self._part_of_speech.is_an_article_or_amount()
+        return bool(self._flags & ARTICLE_OR_AMOUNT_FLAG)
 
     def is_an_indefinte_article(self) -> bool:
         """Checks if the given word is an indefinite article.
@@ -151,7 +189,7 @@ class Word():
         bool
             Returns True if the given word is an indefinite article.
         """
-        return self._part_of_speech.is_an_article_or_amount()
+        return bool(self._flags & INDEFINITE_ARTICLE_FLAG)
 
     def is_a_being_verb(self) -> bool:
         """Checks if the given word is a 'being' verb (i.e. 'is').
@@ -161,7 +199,7 @@ class Word():
         bool
             Returns True if the given word is a 'being' verb.
         """
-        return self._specificity == "being"
+        return bool(self._flags & BEING_FLAG)
 
     def is_a_name(self) -> bool:
         """Checks if the given word is a name.
@@ -171,7 +209,7 @@ class Word():
         bool
             Returns True if the given word is a name.
         """
-        return self._specificity == "name"
+        return bool(self._flags & NAME_FLAG)
 
     def is_a_noun(self) -> bool:
         """Checks if the given word is a noun.
@@ -181,7 +219,7 @@ class Word():
         bool
             Returns True if the given word is a noun.
         """
-        return self._part_of_speech.is_a_noun()
+        return bool(self._flags & NOUN_FLAG)
 
     def is_a_person_noun(self) -> bool:
         """Checks if the given word is a noun representing a person.
@@ -191,8 +229,7 @@ class Word():
         bool
             Returns True if the given word is a noun.
         """
-        return (self._part_of_speech.is_a_noun() and
-                self._specificity in ("people", "name"))
+        return bool(self._flags & PERSON_NOUN_FLAG)
 
     def is_a_personal_pronoun(self) -> bool:
         """Checks if the given word is a personal pronoun.
@@ -202,8 +239,7 @@ class Word():
         bool
             Returns True if the given word is a personal pronoun.
         """
-        return (self._part_of_speech.is_a_personal_pronoun() or
-                (self.is_a_person_noun() and self._specificity == 'personal'))
+        return bool(self._flags & PERSONAL_PRONOUN_FLAG)
 
     def is_a_place(self) -> bool:
         """Checks if the given word is a place.
@@ -213,7 +249,7 @@ class Word():
         bool
             Returns True if the given word is a place.
         """
-        return self._specificity == "place"
+        return bool(self._flags & PLACE_FLAG)
 
     def is_a_verb(self) -> bool:
         """Checks if the given word is a verb.
@@ -223,7 +259,7 @@ class Word():
         bool
             Returns True if the given word is a verb.
         """
-        return self._part_of_speech.is_a_verb()
+        return bool(self._flags & VERB_FLAG)
 
     def is_an_intransitive_verb(self) -> bool:
         """Checks if the given word is an intransitive verb.
@@ -233,7 +269,7 @@ class Word():
         bool
             Returns True if the given word is an intransitive verb.
         """
-        return self.is_a_verb() and self._specificity == "intransitive"
+        return bool(self._flags & INTRANSITIVE_VERB_FLAG)
 
     def is_an_irregular_verb(self) -> bool:
         """Checks if the given word is an irregular verb.
@@ -243,8 +279,7 @@ class Word():
         bool
             Returns True if the given word is an irregular verb.
         """
-        return self.is_a_verb() and (
-            self.is_a_being_verb() or self.is_a_possessive_verb())
+        return bool(self._flags & IRREGULAR_VERB_FLAG)
 
     def is_a_possessive_verb(self) -> bool:
         """Checks if the given word is a possessive verb (i.e. 'have').
@@ -254,7 +289,7 @@ class Word():
         bool
             Returns True if the given word is a possessive verb.
         """
-        return self._specificity == "possessive"
+        return bool(self._flags & POSSESSIVE_FLAG)
 
     def is_in_the_third_person(self) -> bool:
         """Checks if the given word is a 3rd person pronoun.
@@ -264,7 +299,7 @@ class Word():
         bool
             Returns True if the given word is a 3rd person pronoun.
         """
-        return self._value in ("he", "she", "it")
+        return bool(self._flags & THIRD_PERSON_FLAG)
 
     def is_possessive(self) -> bool:
         """Checks if the given word is a possessive part of speech.
@@ -274,4 +309,4 @@ class Word():
         bool
             Returns True if the given word is a possessive part of speech.
         """
-        return self._specificity == "possessive"
+        return bool(self._flags & POSSESSIVE_FLAG)
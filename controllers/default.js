@@ -15,8 +15,11 @@ function socket() {
 
     this.on('open', function (client) {
 
-        // Spawn terminal
-        client.tty = Pty.spawn('python3', ['run.py'], {
+        // Spawn terminal, using a warm process from the fork server if
+        // one is running (see classes/forkserver.py)
+        var args = process.env.FORK_SERVER_SOCKET ?
+            ['-m', 'classes.forkclient'] : ['run.py'];
+        client.tty = Pty.spawn('python3', args, {
             name: 'xterm-color',
             cols: 80,
             rows: 24,